@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Заменитель adb для бенчмарков.
+
+Устройство — это каталог на компьютере: shell-команды выполняются локальным sh,
+поэтому пути устройства совпадают с путями синтетической файловой системы.
+
+Переменные окружения:
+    FAKE_ADB_SERIAL     серийный номер устройства (по умолчанию bench-device)
+    FAKE_ADB_LATENCY_MS задержка на каждый вызов, имитирует USB/Wi-Fi
+    FAKE_ADB_BANDWIDTH  ограничение скорости push/pull в байтах/с (0 — без ограничения)
+    FAKE_ADB_LOG        файл, куда дописывается строка на каждый запуск процесса
+"""
+import os
+import shutil
+import sys
+import time
+
+SERIAL = os.environ.get("FAKE_ADB_SERIAL", "bench-device")
+PROPERTIES = {
+    "ro.product.model": "Bench Phone",
+    "ro.build.version.release": "14",
+}
+
+
+def log_spawn(argv):
+    path = os.environ.get("FAKE_ADB_LOG")
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(" ".join(argv) + "\n")
+
+
+def delay(size: int = 0):
+    latency = float(os.environ.get("FAKE_ADB_LATENCY_MS", "0")) / 1000
+    bandwidth = float(os.environ.get("FAKE_ADB_BANDWIDTH", "0"))
+    if bandwidth > 0:
+        latency += size / bandwidth
+    if latency > 0:
+        time.sleep(latency)
+
+
+def getprop_function() -> str:
+    listing = "".join(f"echo '[{name}]: [{value}]'; " for name, value in PROPERTIES.items())
+    lookup = "".join(f"{name}) echo '{value}';; " for name, value in PROPERTIES.items())
+    return f'getprop() {{ if [ -z "$1" ]; then {listing}else case "$1" in {lookup}esac; fi; }}; '
+
+
+def run_shell(command: str):
+    # Формат даты как у toybox ls на Android
+    os.environ["TIME_STYLE"] = "long-iso"
+    os.execvp("sh", ["sh", "-c", getprop_function() + command])
+
+
+def copy(source: str, target: str):
+    if os.path.isdir(target):
+        target = os.path.join(target, os.path.basename(source.rstrip("/")))
+    try:
+        if os.path.isdir(source):
+            shutil.copytree(source, target, dirs_exist_ok=True)
+            size = sum(os.path.getsize(os.path.join(d, n)) for d, _, names in os.walk(target) for n in names)
+        else:
+            shutil.copyfile(source, target)
+            size = os.path.getsize(target)
+    except OSError as e:
+        print(f"adb: error: {e}", file=sys.stderr)
+        sys.exit(1)
+    delay(size)
+    print(f"{source}: 1 file pushed. ({size} bytes)")
+
+
+def main(argv):
+    log_spawn(argv)
+    args = argv[1:]
+    if args[:1] == ["-s"]:
+        if args[1] != SERIAL:
+            print(f"adb: device '{args[1]}' not found", file=sys.stderr)
+            sys.exit(1)
+        args = args[2:]
+    if not args:
+        sys.exit(1)
+
+    command, rest = args[0], args[1:]
+    if command == "version":
+        print("Android Debug Bridge version 1.0.41 (fake)")
+    elif command == "start-server":
+        pass
+    elif command == "devices":
+        print("List of devices attached")
+        if "-l" in rest:
+            print(f"{SERIAL}\tdevice product:bench model:Bench_Phone device:bench transport_id:1")
+        else:
+            print(f"{SERIAL}\tdevice")
+    elif command in ("shell", "exec-out", "exec-in"):
+        delay()
+        run_shell(" ".join(rest))
+    elif command in ("push", "pull"):
+        copy(rest[0], rest[1])
+    else:
+        print(f"adb: unsupported command in fake adb: {command}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Бенчмарки ADBHelper на поддельном adb и синтетической файловой системе.
+
+Пример:
+    python3 bench/run_bench.py --entries 5000 --file-size-mb 32 --latency-ms 5 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from adb_helper import ADBHelper  # noqa: E402
+
+
+class SpawnCounter:
+    def __init__(self, path: str):
+        self.path = path
+        open(path, "w").close()
+
+    def count(self) -> int:
+        with open(self.path, encoding="utf-8") as f:
+            return sum(1 for _ in f)
+
+
+def build_filesystem(root: str, entries: int, dirs: int, file_size_mb: int) -> dict:
+    listing = os.path.join(root, "sdcard", "listing")
+    tree = os.path.join(root, "sdcard", "tree")
+    upload = os.path.join(root, "sdcard", "upload")
+    for path in (listing, tree, upload):
+        os.makedirs(path)
+    for i in range(entries):
+        with open(os.path.join(listing, f"file_{i:06d} name.txt"), "wb") as f:
+            f.write(b"x" * (i % 4096))
+    for d in range(dirs):
+        sub = os.path.join(tree, f"dir_{d:03d}")
+        os.makedirs(sub)
+        for i in range(max(entries // max(dirs, 1), 1)):
+            with open(os.path.join(sub, f"f{i}.bin"), "wb") as f:
+                f.write(os.urandom(256))
+
+    big = os.path.join(root, "host", "big.bin")
+    os.makedirs(os.path.dirname(big))
+    with open(big, "wb") as f:
+        for _ in range(file_size_mb):
+            f.write(os.urandom(1024 * 1024))
+    return {"listing": listing, "tree": tree, "upload": upload, "big": big, "host": os.path.dirname(big)}
+
+
+def install_fake_adb(root: str, latency_ms: float, bandwidth: float, log_path: str):
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(bin_dir)
+    wrapper = os.path.join(bin_dir, "adb")
+    with open(wrapper, "w") as f:
+        f.write(f'#!/bin/sh\nexec "{sys.executable}" "{os.path.join(BENCH_DIR, "fake_adb.py")}" "$@"\n')
+    os.chmod(wrapper, 0o755)
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ["PATH"]
+    os.environ["FAKE_ADB_LATENCY_MS"] = str(latency_ms)
+    os.environ["FAKE_ADB_BANDWIDTH"] = str(bandwidth)
+    os.environ["FAKE_ADB_LOG"] = log_path
+
+
+def summarize(samples, spawns: int = None, **extra) -> dict:
+    result = {
+        "runs": len(samples),
+        "min_ms": round(min(samples) * 1000, 3),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+    if spawns is not None:
+        result["spawns_per_op"] = round(spawns / len(samples), 2)
+    result.update(extra)
+    return result
+
+
+def measure(func, repeat: int, spawns: SpawnCounter = None, **extra) -> dict:
+    before = spawns.count() if spawns else 0
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return summarize(samples, spawns.count() - before if spawns else None, **extra)
+
+
+def bench_parse(adb: ADBHelper, entries: int, repeat: int) -> dict:
+    lines = ["total 0"] + [
+        f"-rw-rw---- 1 u0_a1 media_rw {i * 37} 2024-01-01 10:{i % 60:02d} file_{i:06d} name.txt"
+        for i in range(entries)
+    ]
+    output = "\n".join(lines)
+    result = measure(lambda: adb._parse_ls_output(output), repeat)
+    result["entries_per_s"] = round(entries / (result["p50_ms"] / 1000)) if result["p50_ms"] else None
+    return result
+
+
+def bench_first_entry(adb: ADBHelper, path: str, repeat: int, spawns: SpawnCounter) -> dict:
+    first_samples, total_samples = [], []
+    before = spawns.count()
+    for _ in range(repeat):
+        first = threading.Event()
+        done = threading.Event()
+        started = time.perf_counter()
+        marks = {}
+
+        def on_line(line, is_error):
+            if not first.is_set() and not is_error and not line.startswith("total"):
+                marks["first"] = time.perf_counter()
+                first.set()
+
+        adb.start_command(f"shell ls -la '{path}'", on_line, lambda handle, rc: done.set())
+        done.wait()
+        total_samples.append(time.perf_counter() - started)
+        first_samples.append(marks.get("first", time.perf_counter()) - started)
+    result = summarize(first_samples, spawns.count() - before)
+    result["complete_p50_ms"] = round(statistics.median(total_samples) * 1000, 3)
+    return result
+
+
+def bench_transfer(adb: ADBHelper, paths: dict, size: int, repeat: int, spawns: SpawnCounter) -> dict:
+    push = measure(lambda: adb.push_file(paths["big"], paths["upload"]), repeat, spawns)
+    remote = os.path.join(paths["upload"], os.path.basename(paths["big"]))
+    pulled = os.path.join(paths["host"], "pulled.bin")
+    pull = measure(lambda: adb.pull_file(remote, pulled), repeat, spawns)
+    for result in (push, pull):
+        result["mb_per_s"] = round(size / (1024 * 1024) / (result["p50_ms"] / 1000), 2)
+    return {"push": push, "pull": pull}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки ADBHelper на поддельном adb")
+    parser.add_argument("--entries", type=int, default=2000, help="файлов в тестовой папке")
+    parser.add_argument("--dirs", type=int, default=20, help="подпапок для обхода дерева")
+    parser.add_argument("--file-size-mb", type=int, default=16, help="размер файла для передачи")
+    parser.add_argument("--latency-ms", type=float, default=0, help="задержка на каждый вызов adb")
+    parser.add_argument("--bandwidth-mb", type=float, default=0, help="скорость канала, МБ/с (0 — без ограничения)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="adb-fm-bench-") as root:
+        paths = build_filesystem(root, args.entries, args.dirs, args.file_size_mb)
+        spawns = SpawnCounter(os.path.join(root, "spawns.log"))
+        install_fake_adb(root, args.latency_ms, args.bandwidth_mb * 1024 * 1024, spawns.path)
+
+        adb = ADBHelper()
+        adb.device = adb.get_devices()[0]
+        adb.compression_enabled = False
+
+        results = {
+            "parse_ls_output": bench_parse(adb, args.entries, args.repeat),
+            "list_files": measure(lambda: adb.list_files(paths["listing"]), args.repeat, spawns,
+                                  entries=len(adb.list_files(paths["listing"]))),
+            "first_entry": bench_first_entry(adb, paths["listing"], args.repeat, spawns),
+            "stat_tree": measure(lambda: adb.stat_tree(paths["tree"]), args.repeat, spawns),
+            "transfer": bench_transfer(adb, paths, args.file_size_mb * 1024 * 1024, args.repeat, spawns),
+        }
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": vars(args),
+        },
+        "results": results,
+    }
+    data = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import os
+import socket
+import subprocess
+from typing import List, Tuple
+
+
+class AdbServerError(Exception):
+    pass
+
+
+class AdbServerClient:
+    """Минимальный клиент протокола adb-сервера (тот же, что у `adb` поверх порта 5037)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = None, timeout: float = 10):
+        self.host = host
+        self.port = port or int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037"))
+        self.timeout = timeout
+
+    def query(self, service: str) -> str:
+        with self._open() as sock:
+            self._send(sock, service)
+            self._read_status(sock)
+            return self._read_string(sock)
+
+    def devices(self) -> List[Tuple[str, str]]:
+        result = []
+        for line in self.query("host:devices").splitlines():
+            parts = line.split("\t")
+            if len(parts) == 2:
+                result.append((parts[0], parts[1]))
+        return result
+
+    def open_device_service(self, serial: str, service: str) -> socket.socket:
+        sock = self._open()
+        try:
+            self._send(sock, f"host:transport:{serial}")
+            self._read_status(sock)
+            self._send(sock, service)
+            self._read_status(sock)
+            return sock
+        except (OSError, AdbServerError):
+            sock.close()
+            raise
+
+    def _open(self) -> socket.socket:
+        try:
+            return socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except ConnectionRefusedError:
+            # Сервер не запущен: поднимаем его штатным способом и пробуем ещё раз
+            try:
+                subprocess.run(["adb", "start-server"], capture_output=True, timeout=10)
+            except (subprocess.SubprocessError, FileNotFoundError):
+                raise AdbServerError("adb-сервер недоступен")
+            return socket.create_connection((self.host, self.port), timeout=self.timeout)
+
+    @staticmethod
+    def _send(sock: socket.socket, payload: str):
+        data = payload.encode("utf-8")
+        sock.sendall(f"{len(data):04x}".encode("ascii") + data)
+
+    def _read_status(self, sock: socket.socket):
+        status = self._read_exact(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            raise AdbServerError(self._read_string(sock))
+        raise AdbServerError(f"Неожиданный ответ сервера: {status!r}")
+
+    def _read_string(self, sock: socket.socket) -> str:
+        length = int(self._read_exact(sock, 4), 16)
+        return self._read_exact(sock, length).decode("utf-8", errors="ignore")
+
+    @staticmethod
+    def _read_exact(sock: socket.socket, size: int) -> bytes:
+        data = b""
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise AdbServerError("Соединение с adb-сервером закрыто")
+            data += chunk
+        return data
@@ -1,48 +1,257 @@
+import copy
 import subprocess
 import re
-from typing import List, Optional, Tuple
+import os
+import shlex
+import shutil
+import sqlite3
+import tarfile
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
 
-from models import FileInfo, DeviceInfo
-from utils import format_size_from_str
+from compression import (COMPRESSIBLE_EXTENSIONS, StreamCodec, compressible_share,
+                         is_compressible, pick_codec)
+from config import Config
+from device_store import DeviceStore
+from models import FileInfo, DeviceInfo, LinkProfile
+from packages import (LIST_COMMAND, PackageInfo, action_script, parse_action_output, parse_packages,
+                      parse_path_output, path_script)
+from shell_session import SuSession
+from tracing import TRACER
+from utils import format_size_from_str, parse_key_values
+
+TRANSFER_CHUNK = 256 * 1024
+GETPROP_RE = re.compile(r'^\[([^\]]+)\]: \[(.*)\]\s*$')
+BOOT_ID = "/proc/sys/kernel/random/boot_id"
+# Первый su может ждать, пока пользователь подтвердит доступ на экране устройства
+ROOT_GRANT_TIMEOUT = 30
+QUOTES = "'\""
+
+
+def shell_quote(path: str) -> str:
+    return "'" + path.replace("'", "'\\''") + "'"
+
+
+def run_adb(args: List[str], attempt: int = 0, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run для adb; при включённой трассировке вызов попадает в TRACER."""
+    if not TRACER.enabled:
+        return subprocess.run(["adb", *args], **kwargs)
+    started = time.perf_counter()
+    result = None
+    try:
+        result = subprocess.run(["adb", *args], **kwargs)
+        return result
+    finally:
+        TRACER.record(
+            args, started,
+            result.returncode if result else None,
+            bytes_in=len(kwargs.get("input") or b""),
+            bytes_out=len(result.stdout or b"") + len(result.stderr or b"") if result else 0,
+            attempt=attempt
+        )
+
+
+def _local_tree(path: str) -> Tuple[int, int]:
+    """(число файлов, общий размер) так, как их упакует tar: ссылки не считаются файлами."""
+    count = total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            if os.path.islink(full) or not os.path.isfile(full):
+                continue
+            try:
+                total += os.path.getsize(full)
+            except OSError:
+                continue
+            count += 1
+    return count, total
+
+
+def _local_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                continue
+    return total
+
+
+class _CompressingWriter:
+    def __init__(self, stream, compressor):
+        self._stream = stream
+        self._compressor = compressor
+        self.written = 0
+
+    def write(self, data: bytes) -> int:
+        out = self._compressor.compress(data)
+        if out:
+            self._stream.write(out)
+            self.written += len(out)
+        return len(data)
+
+    def close(self):
+        out = self._compressor.flush()
+        self._stream.write(out)
+        self.written += len(out)
+        self._stream.close()
+
+
+class CommandHandle:
+    def __init__(self, proc: subprocess.Popen):
+        self.proc = proc
+        self.cancelled = False
+
+    @property
+    def running(self) -> bool:
+        return self.proc.poll() is None
+
+    def cancel(self):
+        if not self.running:
+            return
+        self.cancelled = True
+        self.proc.terminate()
+        # Не ждём в GUI-потоке: если процесс не завершился сам, добиваем позже
+        timer = threading.Timer(2, lambda: self.proc.poll() is None and self.proc.kill())
+        timer.daemon = True
+        timer.start()
 
 
 class ADBHelper:
 
     def __init__(self):
         self.device: Optional[str] = None
+        self.compression_enabled = Config.COMPRESSION_ENABLED
+        self._link_speed: Dict[str, float] = {}
+        self._binaries: Dict[str, set] = {}
+        self.chunk_size = TRANSFER_CHUNK
+        self._model_cache: Dict[str, str] = {}
+        self._properties: Dict[str, Dict[str, str]] = {}
+        self._boot_ids: Dict[str, str] = {}
+        self.store: Optional[DeviceStore] = None
+        self._root_sessions: Dict[str, SuSession] = {}
+        # Вызывается из рабочего потока, когда su после перезапуска сессии больше не выдаёт root
+        self.on_root_lost: Optional[Callable[[str], None]] = None
+
+    def for_device(self, serial: Optional[str]) -> "ADBHelper":
+        """Копия, привязанная к одному устройству: кэши, база и su-сессии общие.
+        Задачи из очереди работают через неё, а не через текущее устройство окна."""
+        helper = copy.copy(self)
+        helper.device = serial
+        return helper
 
     @staticmethod
     def check_adb() -> bool:
         try:
-            subprocess.run(["adb", "version"], capture_output=True, check=True, timeout=5)
+            run_adb(["version"], capture_output=True, check=True, timeout=5)
             return True
         except (subprocess.SubprocessError, FileNotFoundError):
             return False
 
     def get_devices(self) -> List[str]:
         try:
-            result = subprocess.run(
-                ["adb", "devices"],
+            result = run_adb(
+                ["devices"],
                 capture_output=True,
                 text=True,
                 timeout=5
             )
             devices = result.stdout.split("\n")[1:]
-            return [line.split("\t")[0] for line in devices if "device" in line]
+            serials = [line.split("\t")[0] for line in devices if "device" in line]
         except subprocess.SubprocessError:
             return []
+        self._forget_offline(serials)
+        return serials
 
-    def get_device_model(self, serial: str) -> str:
+    def get_device_states(self) -> List[Tuple[str, str, str]]:
         try:
-            result = subprocess.run(
-                ["adb", "-s", serial, "shell", "getprop", "ro.product.model"],
+            result = run_adb(
+                ["devices", "-l"],
                 capture_output=True,
                 text=True,
                 timeout=5
             )
-            return result.stdout.strip() or serial
         except subprocess.SubprocessError:
-            return serial
+            return []
+        states = []
+        for line in result.stdout.split("\n")[1:]:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            model = ""
+            for token in parts[2:]:
+                if token.startswith("model:"):
+                    model = token[len("model:"):].replace("_", " ")
+            if model:
+                self._model_cache.setdefault(parts[0], model)
+            states.append((parts[0], parts[1], model))
+        self._forget_offline([serial for serial, state, _ in states if state == "device"])
+        return states
+
+    def _forget_offline(self, online: List[str]):
+        # Пропавшее устройство могло перезагрузиться: при возвращении свойства читаются заново
+        for serial in set(self._properties) - set(online):
+            self.invalidate_properties(serial)
+
+    def invalidate_properties(self, serial: Optional[str] = None):
+        serial = serial or self.device
+        self._properties.pop(serial, None)
+        self._boot_ids.pop(serial, None)
+
+    def get_properties(self, serial: Optional[str] = None) -> Dict[str, str]:
+        """Все свойства устройства одним вызовом getprop; результат кэшируется до переподключения."""
+        serial = serial or self.device
+        if not serial:
+            return {}
+        if serial in self._properties:
+            return self._properties[serial]
+        try:
+            result = run_adb(
+                ["-s", serial, "shell", f"cat {BOOT_ID}; getprop"],
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='ignore',
+                timeout=10
+            )
+        except subprocess.SubprocessError:
+            return {}
+        if result.returncode != 0:
+            return {}
+        lines = result.stdout.split("\n")
+        properties = {}
+        for line in lines[1:]:
+            match = GETPROP_RE.match(line)
+            if match:
+                properties[match.group(1)] = match.group(2)
+        if not properties:
+            return {}
+        self._boot_ids[serial] = lines[0].strip()
+        self._properties[serial] = properties
+        if properties.get("ro.product.model"):
+            self._model_cache[serial] = properties["ro.product.model"]
+        return properties
+
+    def get_property(self, name: str, serial: Optional[str] = None) -> str:
+        return self.get_properties(serial).get(name, "")
+
+    def _check_boot_id(self, boot_id: str):
+        known = self._boot_ids.get(self.device)
+        if known and boot_id and known != boot_id:
+            self.invalidate_properties()
+
+    def cached_device_model(self, serial: str) -> str:
+        return self._model_cache.get(serial, "")
+
+    def get_device_model(self, serial: str) -> str:
+        if serial in self._model_cache:
+            return self._model_cache[serial]
+        return self.get_property("ro.product.model", serial) or serial
 
     def get_device_info(self) -> DeviceInfo:
         info = DeviceInfo(serial=self.device)
@@ -50,28 +259,32 @@ class ADBHelper:
             return info
 
         try:
-            info.model = self._get_property("ro.product.model")
-            info.android_version = self._get_property("ro.build.version.release")
+            # boot_id в том же вызове, что и dumpsys, подскажет о перезагрузке без отдельного процесса
+            battery_out = self._run_shell(f"cat {BOOT_ID}; dumpsys battery")
+            boot_id, _, battery_out = battery_out.partition("\n")
+            self._check_boot_id(boot_id.strip())
+
+            cached = self.device in self._properties
+            properties = self.get_properties()
+            info.model = properties.get("ro.product.model", "")
+            info.android_version = properties.get("ro.build.version.release", "")
+            if not cached and properties:
+                self._remember("touch_device", self.device, info.model)
+                self._remember("save_properties", self.device, properties)
 
-            battery_out = self._run_shell("dumpsys battery")
             if battery_out:
-                level_match = re.search(r'level:\s*(\d+)', battery_out, re.IGNORECASE)
-                if level_match:
-                    info.battery_level = int(level_match.group(1))
-                temp_match = re.search(r'temperature:\s*(\d+)', battery_out, re.IGNORECASE)
-                if temp_match:
-                    info.battery_temperature = int(temp_match.group(1)) / 10
-                status_match = re.search(r'status:\s*(\d+)', battery_out, re.IGNORECASE)
-                if status_match:
-                    status_codes = {1: "неизвестно", 2: "зарядка", 3: "разрядка",
-                                    4: "не заряжается", 5: "полный"}
-                    info.battery_status = status_codes.get(int(status_match.group(1)), "")
-                health_match = re.search(r'health:\s*(\d+)', battery_out, re.IGNORECASE)
-                if health_match:
-                    health_codes = {1: "неизвестно", 2: "хорошее", 3: "перегрев",
-                                    4: "мёртв", 5: "перенапряжение", 6: "не указано",
-                                    7: "холод"}
-                    info.battery_health = health_codes.get(int(health_match.group(1)), "")
+                battery = parse_key_values(battery_out)
+                if battery.get("level", "").isdigit():
+                    info.battery_level = int(battery["level"])
+                if battery.get("temperature", "").isdigit():
+                    info.battery_temperature = int(battery["temperature"]) / 10
+                status_codes = {"1": "неизвестно", "2": "зарядка", "3": "разрядка",
+                                "4": "не заряжается", "5": "полный"}
+                info.battery_status = status_codes.get(battery.get("status"), "")
+                health_codes = {"1": "неизвестно", "2": "хорошее", "3": "перегрев",
+                                "4": "мёртв", "5": "перенапряжение", "6": "не указано",
+                                "7": "холод"}
+                info.battery_health = health_codes.get(battery.get("health"), "")
 
             # Память
             storage_out = self._run_shell("df -h /storage/emulated/0")
@@ -89,69 +302,176 @@ class ADBHelper:
 
         return info
 
-    def _get_property(self, prop: str) -> str:
-        try:
-            result = subprocess.run(
-                ["adb", "-s", self.device, "shell", "getprop", prop],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.stdout.strip()
-        except subprocess.SubprocessError:
-            return ""
+    @property
+    def root_mode(self) -> bool:
+        return self.device in self._root_sessions
+
+    def enable_root(self) -> bool:
+        """Открывает одну долгоживущую su-сессию на устройство; False, если su нет или доступ не выдан."""
+        if not self.device:
+            return False
+        if self.root_mode:
+            return True
+        serial = self.device
+        session = SuSession(serial, ROOT_GRANT_TIMEOUT)
+        if not session.open():
+            return False
+        session.on_revoked = lambda: self._root_revoked(serial, session)
+        self._root_sessions[serial] = session
+        return True
+
+    def _root_revoked(self, serial: str, session: SuSession):
+        if self._root_sessions.get(serial) is session:
+            del self._root_sessions[serial]
+            if self.on_root_lost:
+                self.on_root_lost(serial)
+
+    def disable_root(self):
+        session = self._root_sessions.pop(self.device, None)
+        if session:
+            session.close()
 
-    def _run_shell(self, command: str) -> str:
+    def _root_run(self, command: str, timeout: float = 10) -> Tuple[int, str]:
+        # Сессию могли закрыть между проверкой root_mode и вызовом
+        session = self._root_sessions.get(self.device)
+        if session is None:
+            return -1, ""
+        return session.run(command, timeout)
+
+    @staticmethod
+    def _root_wrap(command: str) -> str:
+        # Для потоковых exec-out/exec-in: двоичные данные через текстовую сессию не передать
+        return f"su -c {shell_quote(command)}"
+
+    def _file_shell(self, command: str, timeout: int = 10) -> str:
+        """Короткие запросы к файлам (stat, du) идут через su-сессию, чтобы видеть /data.
+        Всё остальное остаётся на обычном adb shell и не ждёт очереди к su."""
+        if self.root_mode:
+            return self._root_run(command, timeout)[1]
+        return self._run_shell(command, timeout)
+
+    def _run_shell(self, command: str, timeout: int = 10) -> str:
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device, "shell", command],
+            result = run_adb(
+                ["-s", self.device, "shell", command],
                 capture_output=True,
                 text=True,
-                timeout=10
+                encoding='utf-8',
+                errors='ignore',
+                timeout=timeout
             )
             return result.stdout
         except subprocess.SubprocessError:
             return ""
 
-    def run_command(self, command: str) -> Tuple[str, str]:
+    def start_command(self, command: str, on_line: Callable[[str, bool], None],
+                      on_exit: Callable[["CommandHandle", int], None]) -> Optional["CommandHandle"]:
+        """Запуск adb-команды без host shell; строки stdout/stderr отдаются по мере появления."""
         if not self.device:
-            return "", "Нет подключенного устройства"
-        try:
-            full_cmd = f"adb -s {self.device} {command}"
-            result = subprocess.run(
-                full_cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',
-                timeout=30
-            )
-            return result.stdout, result.stderr
-        except subprocess.TimeoutExpired:
-            return "", "Ошибка: команда выполнялась слишком долго (таймаут 30 сек)"
-        except Exception as e:
-            return "", str(e)
+            return None
+        args = shlex.split(command)
+        if "reboot" in args:
+            self.invalidate_properties()
+        started = time.perf_counter()
+        proc = subprocess.Popen(
+            ["adb", "-s", self.device, *args],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='ignore',
+            bufsize=1
+        )
+        handle = CommandHandle(proc)
+
+        def pump(stream, is_error: bool):
+            for line in stream:
+                on_line(line.rstrip("\r\n"), is_error)
+            stream.close()
+
+        readers = [
+            threading.Thread(target=pump, args=(proc.stdout, False), daemon=True),
+            threading.Thread(target=pump, args=(proc.stderr, True), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        def wait():
+            for reader in readers:
+                reader.join()
+            returncode = proc.wait()
+            if TRACER.enabled:
+                TRACER.record(["-s", self.device, *args], started, returncode, op="start_command")
+            on_exit(handle, returncode)
+
+        threading.Thread(target=wait, daemon=True).start()
+        return handle
 
     def list_files(self, path: str) -> List[FileInfo]:
+        files = self._fetch_listing(path)
+        if files:
+            self._remember("save_listing", self.device, path, files)
+        return files
+
+    def cached_listing(self, path: str) -> Optional[List[FileInfo]]:
+        if not self.device or not self.store:
+            return None
+        try:
+            return self.store.get_listing(self.device, path)
+        except sqlite3.Error:
+            return None
+
+    def search_cached(self, pattern: str, limit: int = 500) -> List[Tuple[str, FileInfo]]:
+        """Поиск по именам во всех когда-либо открытых папках, без обращения к устройству."""
+        if not self.device or not self.store:
+            return []
+        try:
+            return self.store.search(self.device, pattern, limit)
+        except sqlite3.Error:
+            return []
+
+    def transfer_history(self, limit: int = 100) -> List[tuple]:
+        if not self.device or not self.store:
+            return []
+        try:
+            return self.store.transfer_history(self.device, limit)
+        except sqlite3.Error:
+            return []
+
+    def _remember(self, method: str, *args):
+        # База только ускоряет работу, её ошибки не должны ломать операции с устройством
+        if not self.store or not self.device:
+            return
+        try:
+            getattr(self.store, method)(*args)
+        except sqlite3.Error as e:
+            print(f"Ошибка записи в базу устройств: {e}")
+
+    def _fetch_listing(self, path: str) -> List[FileInfo]:
         if not self.device:
             return []
 
+        if self.root_mode:
+            returncode, output = self._root_run(f"ls -la {shell_quote(path.strip(QUOTES))}")
+            return self._parse_ls_output(output) if returncode == 0 else []
+
         try:
-            clean_path = path.strip('\'"')
+            clean_path = path.strip(QUOTES)
             escaped_path = clean_path.replace("'", "'\\''")
 
             commands = [
-                ["adb", "-s", self.device, "shell", "ls", "-la", escaped_path],
-                ["adb", "-s", self.device, "shell", "ls", "-l", escaped_path],
-                ["adb", "-s", self.device, "shell", "ls", "-a", escaped_path],
-                ["adb", "-s", self.device, "shell", "ls", escaped_path]
+                ["-s", self.device, "shell", "ls", "-la", escaped_path],
+                ["-s", self.device, "shell", "ls", "-l", escaped_path],
+                ["-s", self.device, "shell", "ls", "-a", escaped_path],
+                ["-s", self.device, "shell", "ls", escaped_path]
             ]
 
-            for cmd in commands:
+            for attempt, cmd in enumerate(commands):
                 try:
-                    result = subprocess.run(
+                    result = run_adb(
                         cmd,
+                        attempt=attempt,
                         capture_output=True,
                         text=True,
                         encoding='utf-8',
@@ -165,8 +485,9 @@ class ADBHelper:
                 except:
                     continue
 
-            result = subprocess.run(
-                ["adb", "-s", self.device, "shell", "ls", "-1", escaped_path],
+            result = run_adb(
+                ["-s", self.device, "shell", "ls", "-1", escaped_path],
+                attempt=len(commands),
                 capture_output=True,
                 text=True,
                 encoding='utf-8',
@@ -178,9 +499,9 @@ class ADBHelper:
                          if n.strip() and n.strip() not in ['.', '..']]
                 files = []
                 for name in names:
-                    check_cmd = ["adb", "-s", self.device, "shell", "ls", "-ld", f"'{escaped_path}/{name}'"]
+                    check_cmd = ["-s", self.device, "shell", "ls", "-ld", f"'{escaped_path}/{name}'"]
                     try:
-                        check_res = subprocess.run(check_cmd, capture_output=True, text=True, timeout=5)
+                        check_res = run_adb(check_cmd, attempt=len(commands) + 1, capture_output=True, text=True, timeout=5)
                         is_dir = check_res.stdout.startswith('d') if check_res.stdout else False
                     except:
                         is_dir = False
@@ -218,11 +539,14 @@ class ADBHelper:
                         size_index = i
                         break
 
+            modified = ""
             if size_index < len(parts) and parts[size_index].isdigit():
                 size = parts[size_index]
                 name_start = size_index + 3
                 if name_start >= len(parts):
                     name_start = size_index + 1
+                else:
+                    modified = f"{parts[size_index + 1]} {parts[size_index + 2]}"
                 name_parts = parts[name_start:]
                 name = ' '.join(name_parts)
             else:
@@ -238,17 +562,72 @@ class ADBHelper:
                 path=name,
                 size=format_size_from_str(size) if size and size.isdigit() else "",
                 permissions=permissions,
-                is_dir=is_dir
+                modified=modified,
+                is_dir=is_dir,
+                size_bytes=int(size) if size and size.isdigit() else 0
             ))
 
         return files
 
+    def read_head(self, path: str, length: int) -> bytes:
+        return self._exec_out(f"head -c {int(length)} {shell_quote(path)}")
+
+    def read_range(self, path: str, offset: int, length: int) -> bytes:
+        # dd пропускает начало через lseek, поэтому чтение с середины большого файла не читает его целиком
+        data = self._exec_out(
+            f"dd if={shell_quote(path)} iflag=skip_bytes,count_bytes skip={int(offset)} "
+            f"count={int(length)} bs=65536 2>/dev/null"
+        )
+        if data:
+            return data
+        if offset == 0:
+            return self.read_head(path, length)
+        return self._exec_out(f"tail -c +{int(offset) + 1} {shell_quote(path)} | head -c {int(length)}")
+
+    def read_tail(self, path: str, length: int) -> bytes:
+        return self._exec_out(f"tail -c {int(length)} {shell_quote(path)}")
+
+    def get_file_size(self, path: str) -> int:
+        out = self._file_shell(f"stat -c %s {shell_quote(path)}").strip()
+        return int(out) if out.isdigit() else -1
+
+    def read_file(self, path: str) -> bytes:
+        return self._exec_out(f"cat {shell_quote(path)}")
+
+    def media_thumbnail(self, path: str, video: bool = False) -> bytes:
+        """Миниатюра, уже построенная MediaStore на устройстве."""
+        collection = "video" if video else "images"
+        uri = f"content://media/external/{collection}/media"
+        where = "_data='" + path.replace("'", "''") + "'"
+        out = self._run_shell(f"content query --uri {uri} --projection _id --where {shell_quote(where)}")
+        match = re.search(r'_id=(\d+)', out)
+        if not match:
+            return b""
+        return self._exec_out(f"content read --uri {uri}/{match.group(1)}/thumbnail")
+
+    def _exec_out(self, command: str, timeout: int = 60) -> bytes:
+        if not self.device:
+            return b""
+        if self.root_mode:
+            command = self._root_wrap(command)
+        try:
+            result = run_adb(
+                ["-s", self.device, "exec-out", command],
+                capture_output=True,
+                timeout=timeout
+            )
+            return result.stdout if result.returncode == 0 else b""
+        except subprocess.SubprocessError:
+            return b""
+
     def check_directory_access(self, path: str) -> bool:
         if not self.device:
             return False
+        if self.root_mode:
+            return self._root_run(f"ls {shell_quote(path)} >/dev/null")[0] == 0
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device, "shell", "ls", path],
+            result = run_adb(
+                ["-s", self.device, "shell", "ls", path],
                 capture_output=True,
                 text=True,
                 timeout=5
@@ -260,13 +639,30 @@ class ADBHelper:
     def push_file(self, local_path: str, remote_dir: str) -> bool:
         if not self.device:
             return False
+        started = time.monotonic()
+        success = self._push(local_path, remote_dir)
+        if not success:
+            self._record_transfer("push", local_path, remote_dir, _local_size(local_path),
+                                  time.monotonic() - started, success=False)
+        return success
+
+    def _push(self, local_path: str, remote_dir: str) -> bool:
+        if self.root_mode:
+            return self._push_root(local_path, remote_dir)
+        codec = self._pick_codec(local_path)
+        if codec and self._push_compressed(local_path, remote_dir, codec):
+            return True
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device, "push", local_path, remote_dir],
+            started = time.monotonic()
+            result = run_adb(
+                ["-s", self.device, "push", local_path, remote_dir],
                 capture_output=True,
                 text=True,
                 timeout=60
             )
+            if result.returncode == 0:
+                self._record_transfer("push", local_path, remote_dir,
+                                      _local_size(local_path), time.monotonic() - started)
             return result.returncode == 0
         except subprocess.SubprocessError:
             return False
@@ -274,20 +670,287 @@ class ADBHelper:
     def pull_file(self, remote_path: str, local_dir: str) -> bool:
         if not self.device:
             return False
+        started = time.monotonic()
+        success = self._pull(remote_path, local_dir)
+        if not success:
+            # Размер недокачанного неизвестен, в истории остаётся только сам факт сбоя
+            self._record_transfer("pull", remote_path, local_dir, 0, time.monotonic() - started, success=False)
+        return success
+
+    def _pull(self, remote_path: str, local_dir: str) -> bool:
+        if self.root_mode:
+            return self._pull_root(remote_path, local_dir)
+        codec = self._pick_codec(remote_path, remote=True)
+        if codec:
+            local_path = local_dir
+            if os.path.isdir(local_dir):
+                local_path = os.path.join(local_dir, os.path.basename(remote_path.rstrip('/')))
+            if self._pull_compressed(remote_path, local_path, codec):
+                return True
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device, "pull", remote_path, local_dir],
+            started = time.monotonic()
+            result = run_adb(
+                ["-s", self.device, "pull", remote_path, local_dir],
                 capture_output=True,
                 text=True,
                 timeout=60
             )
+            if result.returncode == 0:
+                target = local_dir
+                if os.path.isdir(local_dir):
+                    target = os.path.join(local_dir, os.path.basename(remote_path.rstrip('/')))
+                self._record_transfer("pull", remote_path, target, _local_size(target), time.monotonic() - started)
             return result.returncode == 0
         except subprocess.SubprocessError:
             return False
 
+    def get_link_speed(self, serial: Optional[str] = None) -> Optional[float]:
+        serial = serial or self.device
+        if serial not in self._link_speed and self.store:
+            # Скорость прошлых сессий — лучшая оценка до первой передачи
+            try:
+                speed = self.store.average_throughput(serial)
+            except sqlite3.Error:
+                speed = None
+            if speed:
+                self._link_speed[serial] = speed
+        return self._link_speed.get(serial)
+
+    def apply_link_profile(self, profile: LinkProfile):
+        self.chunk_size = profile.chunk_size
+        if profile.measured:
+            self._link_speed[profile.serial] = profile.throughput
+
+    def _record_transfer(self, direction: str, source: str, target: str, size: int, duration: float,
+                         success: bool = True):
+        self._remember("record_transfer", self.device, direction, source, target, size, duration, success)
+        # Мелкие передачи меряют в основном задержку, а не пропускную способность
+        if not success or size < 256 * 1024 or duration <= 0:
+            return
+        speed = size / duration
+        previous = self.get_link_speed()
+        self._link_speed[self.device] = speed if previous is None else previous * 0.7 + speed * 0.3
+
+    def _device_binaries(self) -> set:
+        if self.device not in self._binaries:
+            out = self._run_shell("for b in gzip zstd tar; do command -v $b >/dev/null && echo $b; done")
+            self._binaries[self.device] = set(out.split())
+        return self._binaries[self.device]
+
+    def _pick_codec(self, path: str, remote: bool = False) -> Optional[StreamCodec]:
+        if not self.compression_enabled:
+            return None
+        speed = self.get_link_speed()
+        if speed is None:
+            # Скорость ещё не измерена: сжимаем только при подключении по сети
+            if ":" not in self.device:
+                return None
+        elif speed > Config.COMPRESSION_MAX_LINK_SPEED:
+            return None
+        if remote:
+            ext = os.path.splitext(path)[1].lower()
+            if ext not in COMPRESSIBLE_EXTENSIONS:
+                return None
+        elif os.path.isdir(path):
+            if compressible_share(path) < 0.5 or "tar" not in self._device_binaries():
+                return None
+        elif not is_compressible(path):
+            return None
+        return pick_codec(self._device_binaries())
+
+    def _push_compressed(self, local_path: str, remote_dir: str, codec: StreamCodec) -> bool:
+        """False — передать не удалось, недописанная цель удалена; push_file повторит без сжатия."""
+        name = os.path.basename(local_path.rstrip(os.sep))
+        target = remote_dir.rstrip('/') + '/' + name
+        is_dir = os.path.isdir(local_path)
+        if is_dir:
+            device_cmd = f"{codec.device_decompress} | tar -xf - -C {shell_quote(remote_dir)}"
+        else:
+            device_cmd = f"{codec.device_decompress} > {shell_quote(target)}"
+        merged = is_dir and self.remote_exists(target)
+        try:
+            started = time.monotonic()
+            proc = subprocess.Popen(
+                ["adb", "-s", self.device, "exec-in", device_cmd],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            writer = _CompressingWriter(proc.stdin, codec.compressor())
+            if os.path.isdir(local_path):
+                with tarfile.open(fileobj=writer, mode="w|") as tar:
+                    tar.add(local_path, arcname=name)
+            else:
+                with open(local_path, 'rb') as f:
+                    shutil.copyfileobj(f, writer, self.chunk_size)
+            writer.close()
+            proc.wait()
+            if TRACER.enabled:
+                TRACER.record(["-s", self.device, "exec-in", device_cmd], started, proc.returncode,
+                              bytes_in=writer.written)
+            if proc.returncode != 0 or not self._verify_push(local_path, target, merged):
+                return False
+            # Скорость канала считаем по исходным данным, как и для обычного push
+            self._record_transfer("push", local_path, remote_dir, _local_size(local_path), time.monotonic() - started)
+            return True
+        except (subprocess.SubprocessError, OSError):
+            if not merged:
+                self.delete_file(target)
+            return False
+
+    def _verify_push(self, local_path: str, target: str, merged: bool) -> bool:
+        """exec-in не передаёт код возврата команды на устройстве, поэтому сверяем результат.
+        Недописанную цель удаляем; папку, которая уже была на устройстве, — нет: в ней могли быть чужие файлы."""
+        if os.path.isdir(local_path):
+            (remote_count, remote_total), (count, total) = self._remote_tree(target), _local_tree(local_path)
+            if merged:
+                success = remote_count >= count and remote_total >= total
+            else:
+                success = (remote_count, remote_total) == (count, total)
+        else:
+            success = self._file_shell(f"stat -c %s {shell_quote(target)}").strip() == str(os.path.getsize(local_path))
+        if not success and not merged:
+            self.delete_file(target)
+        return success
+
+    def _remote_tree(self, path: str) -> Tuple[int, int]:
+        """(число файлов, общий размер) под path на устройстве."""
+        out = self._file_shell(f"find {shell_quote(path)} -type f -exec stat -c %s {{}} + 2>/dev/null", timeout=120)
+        sizes = [int(line) for line in out.split("\n") if line.strip().isdigit()]
+        return len(sizes), sum(sizes)
+
+    def _pull_compressed(self, remote_path: str, local_path: str, codec: StreamCodec) -> bool:
+        """False — поток оборван или не сошёлся размер; файл удалён, pull_file повторит без сжатия."""
+        try:
+            started = time.monotonic()
+            proc = subprocess.Popen(
+                ["adb", "-s", self.device, "exec-out", f"{codec.device_compress} {shell_quote(remote_path)}"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            decompressor = codec.decompressor()
+            received = 0
+            with open(local_path, 'wb') as f:
+                for chunk in iter(lambda: proc.stdout.read(self.chunk_size), b""):
+                    received += len(chunk)
+                    f.write(decompressor.decompress(chunk))
+                f.write(decompressor.flush())
+            proc.wait()
+            if TRACER.enabled:
+                TRACER.record(proc.args[1:], started, proc.returncode, bytes_out=received)
+            # exec-out не передаёт код возврата gzip/zstd: обрыв виден только по концу потока и размеру
+            remote_size = self._file_shell(f"stat -c %s {shell_quote(remote_path)}").strip()
+            if (proc.returncode != 0 or received == 0 or not decompressor.eof
+                    or (remote_size.isdigit() and int(remote_size) != os.path.getsize(local_path))):
+                os.remove(local_path)
+                return False
+            self._record_transfer("pull", remote_path, local_path, _local_size(local_path),
+                                  time.monotonic() - started)
+            return True
+        except (subprocess.SubprocessError, OSError, zlib.error):
+            try:
+                os.remove(local_path)
+            except OSError:
+                pass
+            return False
+
+    def _push_root(self, local_path: str, remote_dir: str) -> bool:
+        """exec-in su -c: файл пишется через cat, папка распаковывается tar прямо на месте."""
+        name = os.path.basename(local_path.rstrip(os.sep))
+        target = remote_dir.rstrip('/') + '/' + name
+        is_dir = os.path.isdir(local_path)
+        if is_dir:
+            device_cmd = f"tar -xf - -C {shell_quote(remote_dir)}"
+        else:
+            device_cmd = f"cat > {shell_quote(target)}"
+        merged = is_dir and self.remote_exists(target)
+        try:
+            started = time.monotonic()
+            proc = subprocess.Popen(
+                ["adb", "-s", self.device, "exec-in", self._root_wrap(device_cmd)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            if is_dir:
+                with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                    tar.add(local_path, arcname=name)
+            else:
+                with open(local_path, 'rb') as f:
+                    shutil.copyfileobj(f, proc.stdin, self.chunk_size)
+            proc.stdin.close()
+            proc.wait()
+            size = _local_size(local_path)
+            if TRACER.enabled:
+                TRACER.record(["-s", self.device, "exec-in", self._root_wrap(device_cmd)], started,
+                              proc.returncode, bytes_in=size)
+            # exec-in не передаёт код возврата su на старых adbd
+            success = self._verify_push(local_path, target, merged)
+            if success:
+                self._record_transfer("push", local_path, remote_dir, size, time.monotonic() - started)
+            return success
+        except (subprocess.SubprocessError, OSError, tarfile.TarError):
+            if not merged:
+                self.delete_file(target)
+            return False
+
+    def _pull_root(self, remote_path: str, local_dir: str) -> bool:
+        """exec-out su -c cat (или tar для папки) прямо в локальный файл, без копии в /sdcard."""
+        remote_path = remote_path.rstrip('/') or "/"
+        name = os.path.basename(remote_path)
+        quoted = shell_quote(remote_path)
+        returncode, kind = self._root_run(f"if [ -d {quoted} ]; then echo dir; else stat -c %s {quoted}; fi")
+        kind = kind.strip()
+        if returncode != 0 or not (kind == "dir" or kind.isdigit()):
+            return False
+        local_path = os.path.join(local_dir, name) if os.path.isdir(local_dir) else local_dir
+        if kind == "dir":
+            device_cmd = f"tar -cf - -C {shell_quote(os.path.dirname(remote_path) or '/')} {shell_quote(name)}"
+        else:
+            device_cmd = f"cat {quoted}"
+        try:
+            started = time.monotonic()
+            proc = subprocess.Popen(
+                ["adb", "-s", self.device, "exec-out", self._root_wrap(device_cmd)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+            if kind == "dir":
+                self._extract_tar_stream(proc.stdout, os.path.dirname(local_path))
+            else:
+                with open(local_path, 'wb') as f:
+                    shutil.copyfileobj(proc.stdout, f, self.chunk_size)
+            proc.wait()
+            received = _local_size(local_path)
+            if TRACER.enabled:
+                TRACER.record(["-s", self.device, "exec-out", self._root_wrap(device_cmd)], started,
+                              proc.returncode, bytes_out=received)
+            # Файлы /proc и /sys показывают размер 0, для них сверять нечего
+            if kind != "dir" and kind != "0" and str(received) != kind:
+                os.remove(local_path)
+                return False
+            self._record_transfer("pull", remote_path, local_path, received, time.monotonic() - started)
+            return True
+        except (subprocess.SubprocessError, OSError, tarfile.TarError):
+            return False
+
+    @staticmethod
+    def _extract_tar_stream(stream, target_dir: str):
+        with tarfile.open(fileobj=stream, mode="r|") as tar:
+            for member in tar:
+                # Только обычные файлы и папки внутри target_dir: без ссылок, устройств и сокетов из /data
+                if member.name.startswith("/") or ".." in member.name.split("/"):
+                    continue
+                if member.isfile() or member.isdir():
+                    tar.extract(member, target_dir, set_attrs=False)
+
     def delete_file(self, remote_path: str) -> bool:
         if not self.device:
             return False
+        if self.root_mode:
+            quoted = shell_quote(remote_path)
+            self._root_run(f"rm -rf {quoted}", timeout=30)
+            return self._root_run(f"ls -d {quoted}")[0] != 0
         try:
             escaped_path = remote_path.replace("'", "'\\''")
             commands = [
@@ -295,23 +958,24 @@ class ADBHelper:
                 f"rm -r '{escaped_path}'",
                 f"rm -f '{escaped_path}'"
             ]
-            for cmd in commands:
-                subprocess.run(
-                    ["adb", "-s", self.device, "shell", cmd],
+            for attempt, cmd in enumerate(commands):
+                run_adb(
+                    ["-s", self.device, "shell", cmd],
+                    attempt=attempt,
                     capture_output=True,
                     text=True,
                     timeout=30
                 )
-                check = subprocess.run(
-                    ["adb", "-s", self.device, "shell", "ls", "-d", f"'{escaped_path}'"],
+                check = run_adb(
+                    ["-s", self.device, "shell", "ls", "-d", f"'{escaped_path}'"],
                     capture_output=True,
                     text=True,
                     timeout=5
                 )
                 if check.returncode != 0:
                     return True
-            check = subprocess.run(
-                ["adb", "-s", self.device, "shell", "ls", "-d", f"'{escaped_path}'"],
+            check = run_adb(
+                ["-s", self.device, "shell", "ls", "-d", f"'{escaped_path}'"],
                 capture_output=True,
                 text=True,
                 timeout=5
@@ -323,11 +987,13 @@ class ADBHelper:
     def rename_file(self, old_path: str, new_path: str) -> bool:
         if not self.device:
             return False
+        if self.root_mode:
+            return self._root_run(f"mv {shell_quote(old_path)} {shell_quote(new_path)}", timeout=30)[0] == 0
         try:
             escaped_old = old_path.replace("'", "'\\''")
             escaped_new = new_path.replace("'", "'\\''")
-            result = subprocess.run(
-                ["adb", "-s", self.device, "shell", "mv", escaped_old, escaped_new],
+            result = run_adb(
+                ["-s", self.device, "shell", "mv", escaped_old, escaped_new],
                 capture_output=True,
                 text=True,
                 timeout=30
@@ -336,12 +1002,97 @@ class ADBHelper:
         except subprocess.SubprocessError:
             return False
 
+    def get_remote_size(self, paths: List[str]) -> int:
+        if not self.device or not paths:
+            return 0
+        quoted = " ".join(shell_quote(p) for p in paths)
+        out = self._file_shell(f"du -sk {quoted} 2>/dev/null")
+        total = 0
+        for line in out.strip().split("\n"):
+            parts = line.split()
+            if parts and parts[0].isdigit():
+                total += int(parts[0]) * 1024
+        return total
+
+    def copy_on_device(self, source: str, target: str, move: bool = False,
+                       on_progress: Optional[Callable[[int], None]] = None) -> bool:
+        if not self.device:
+            return False
+        tool = "mv" if move else "cp -a"
+        command = f"{tool} {shell_quote(source)} {shell_quote(target)}"
+        if self.root_mode:
+            # Долгое копирование не занимает su-сессию, нужную листингу
+            command = self._root_wrap(command)
+        try:
+            started = time.perf_counter()
+            proc = subprocess.Popen(
+                ["adb", "-s", self.device, "shell", command],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            # Прогресс оцениваем по размеру цели на устройстве, данные через USB не идут
+            while proc.poll() is None:
+                time.sleep(1)
+                if on_progress and proc.poll() is None:
+                    on_progress(self.get_remote_size([target]))
+            if TRACER.enabled:
+                TRACER.record(proc.args[1:], started, proc.returncode)
+            return proc.returncode == 0
+        except (subprocess.SubprocessError, OSError):
+            return False
+
+    def stat_tree(self, path: str) -> Dict[str, Tuple[int, int]]:
+        """Размер и mtime всех файлов под path одним вызовом find."""
+        if not self.device:
+            return {}
+        root = path.rstrip('/') or "/"
+        out = self._run_shell(f"find {shell_quote(root)} -type f -exec stat -c '%s %Y %n' {{}} + 2>/dev/null", timeout=120)
+        result = {}
+        prefix = root.rstrip('/') + "/"
+        for line in out.split("\n"):
+            parts = line.rstrip("\r").split(" ", 2)
+            if len(parts) == 3 and parts[0].isdigit() and parts[1].isdigit() and parts[2].startswith(prefix):
+                result[parts[2][len(prefix):]] = (int(parts[0]), int(parts[1]))
+        return result
+
+    def hash_remote_files(self, paths: List[str], tool: str = "md5sum") -> Dict[str, str]:
+        """Хэши сразу пачки файлов одним вызовом md5sum/sha1sum на устройстве."""
+        if not self.device or not paths:
+            return {}
+        quoted = " ".join(shell_quote(p) for p in paths)
+        out = self._run_shell(f"{tool} -- {quoted} 2>/dev/null", timeout=600)
+        wanted = set(paths)
+        result = {}
+        for line in out.split("\n"):
+            parts = line.rstrip("\r").split("  ", 1)
+            if len(parts) == 2 and parts[1] in wanted:
+                result[parts[1]] = parts[0].lower()
+        return result
+
+    def remote_exists(self, path: str) -> bool:
+        if not self.device:
+            return False
+        if self.root_mode:
+            return self._root_run(f"ls -d {shell_quote(path)}")[0] == 0
+        try:
+            result = run_adb(
+                ["-s", self.device, "shell", f"ls -d {shell_quote(path)}"],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+            return result.returncode == 0
+        except subprocess.SubprocessError:
+            return False
+
     def create_folder(self, path: str) -> bool:
         if not self.device:
             return False
+        if self.root_mode:
+            return self._root_run(f"mkdir -p {shell_quote(path)}")[0] == 0
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device, "shell", "mkdir", "-p", path],
+            result = run_adb(
+                ["-s", self.device, "shell", "mkdir", "-p", path],
                 capture_output=True,
                 text=True,
                 timeout=10
@@ -350,12 +1101,47 @@ class ADBHelper:
         except subprocess.SubprocessError:
             return False
 
+    def create_folders(self, paths: List[str]) -> bool:
+        if not self.device or not paths:
+            return bool(self.device)
+        quoted = " ".join(shell_quote(p) for p in paths)
+        if self.root_mode:
+            return self._root_run(f"mkdir -p {quoted}", timeout=30)[0] == 0
+        try:
+            result = run_adb(
+                ["-s", self.device, "shell", f"mkdir -p {quoted}"],
+                capture_output=True,
+                text=True,
+                timeout=30
+            )
+            return result.returncode == 0
+        except subprocess.SubprocessError:
+            return False
+
+    def list_packages(self) -> List[PackageInfo]:
+        if not self.device:
+            return []
+        return parse_packages(self._run_shell(LIST_COMMAND, timeout=120))
+
+    def package_action(self, action: str, names: List[str]) -> Dict[str, str]:
+        """uninstall/clear/disable/enable для списка пакетов одним вызовом adb; имя -> ответ pm."""
+        if not self.device or not names:
+            return {}
+        out = self._run_shell(action_script(action, names), timeout=60 + 10 * len(names))
+        return parse_action_output(out, names)
+
+    def package_paths(self, names: List[str]) -> Dict[str, List[str]]:
+        """Пути base.apk и всех split APK выбранных пакетов одним вызовом adb."""
+        if not self.device or not names:
+            return {}
+        return parse_path_output(self._run_shell(path_script(names), timeout=30 + 2 * len(names)))
+
     def install_apk(self, apk_path: str) -> Tuple[bool, str]:
         if not self.device:
             return False, "Нет подключенного устройства"
         try:
-            result = subprocess.run(
-                ["adb", "-s", self.device, "install", "-r", apk_path],
+            result = run_adb(
+                ["-s", self.device, "install", "-r", apk_path],
                 capture_output=True,
                 text=True,
                 timeout=120
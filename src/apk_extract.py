@@ -0,0 +1,74 @@
+import os
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from dedupe import HASH_BATCH, hash_local_file
+from job_queue import CancelToken
+from transfer import TransferEngine, TransferJob
+
+
+@dataclass
+class ExtractReport:
+    pulled: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+
+
+class ApkExtractor:
+    """Копирует base.apk и split APK выбранных пакетов в папки destination/<пакет>."""
+
+    def __init__(self, adb, transfers: TransferEngine):
+        self.adb = adb
+        self.transfers = transfers
+
+    def extract(self, names: List[str], destination: str, token: Optional[CancelToken] = None,
+                on_done: Optional[Callable[[TransferJob], None]] = None,
+                on_planned: Optional[Callable[[int], None]] = None) -> ExtractReport:
+        report = ExtractReport()
+        paths = self.adb.package_paths(names)
+        report.missing = [name for name in names if not paths.get(name)]
+
+        # На устройстве хэшируем только пакеты, которым есть с чем сравниться: иначе каждый APK
+        # читался бы дважды — для хэша и для pull
+        local_hashes = {name: self._local_hashes(os.path.join(destination, name)) for name in names if paths.get(name)}
+        to_hash = [path for name, hashes in local_hashes.items() if hashes for path in paths[name]]
+        remote_hashes = {}
+        for i in range(0, len(to_hash), HASH_BATCH):
+            remote_hashes.update(self.adb.hash_remote_files(to_hash[i:i + HASH_BATCH]))
+
+        jobs = []
+        for name in names:
+            apks = paths.get(name)
+            if not apks:
+                continue
+            folder = os.path.join(destination, name)
+            wanted = {remote_hashes.get(path) for path in apks}
+            if local_hashes[name] and None not in wanted and wanted <= local_hashes[name]:
+                report.skipped.append(name)
+                continue
+            os.makedirs(folder, exist_ok=True)
+            jobs.extend(TransferJob("pull", path, folder) for path in apks)
+
+        if on_planned:
+            on_planned(len(jobs))
+        self.transfers.run(jobs, on_done, token, self.adb)
+        for name in names:
+            folder = os.path.join(destination, name)
+            results = [job.success for job in jobs if job.target == folder]
+            if not results:
+                continue
+            (report.pulled if all(results) else report.failed).append(name)
+        return report
+
+    @staticmethod
+    def _local_hashes(folder: str) -> set:
+        if not os.path.isdir(folder):
+            return set()
+        hashes = set()
+        for entry in os.listdir(folder):
+            if entry.endswith(".apk"):
+                _, digest = hash_local_file(os.path.join(folder, entry))
+                if digest:
+                    hashes.add(digest)
+        return hashes
@@ -0,0 +1,202 @@
+import io
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Optional
+
+from adb_client import AdbServerClient, AdbServerError
+from job_queue import CancelToken
+from tracing import TRACER
+
+CAPTURE_CHUNK = 256 * 1024
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+SCREENCAP_COMMAND = "screencap -p"
+# mp4 требует перемотки файла, поэтому в поток пишем сырой H.264
+RECORD_COMMAND = "screenrecord --output-format=h264 --bit-rate {bitrate} --time-limit {limit} -"
+RECORD_MAX_SECONDS = 180
+RECORD_STOP_TIMEOUT = 3
+BURST_MAX_RATE = 10
+# screencap нередко идёт дольше 100 мс, поэтому кадры серии снимаются внахлёст
+BURST_INFLIGHT = 3
+CLIPBOARD_COMMANDS = (
+    ["xclip", "-selection", "clipboard", "-t", "image/png", "-i"],
+    ["wl-copy", "--type", "image/png"],
+)
+
+
+def copy_png_to_clipboard(data: bytes) -> bool:
+    """Tk кладёт в буфер только текст, поэтому картинку отдаём xclip или wl-copy."""
+    for command in CLIPBOARD_COMMANDS:
+        if not shutil.which(command[0]):
+            continue
+        # xclip и wl-copy остаются в фоне владельцем буфера и держат унаследованные stdout/stderr,
+        # поэтому их не перехватываем: иначе чтение ждало бы до таймаута
+        try:
+            return subprocess.run(command, input=data, stdout=subprocess.DEVNULL,
+                                  stderr=subprocess.DEVNULL, timeout=5).returncode == 0
+        except (subprocess.SubprocessError, OSError):
+            continue
+    return False
+
+
+@dataclass
+class BurstReport:
+    serial: str
+    captured: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+
+class ScreenCapture:
+    """Снимки и запись экрана через exec-сервис adb-сервера: данные идут сразу в локальный файл,
+    без временных файлов на устройстве и без отдельного pull."""
+
+    def __init__(self, client: Optional[AdbServerClient] = None):
+        self.client = client or AdbServerClient()
+
+    def open(self, serial: str, command: str, timeout: Optional[float] = 30) -> socket.socket:
+        sock = self.client.open_device_service(serial, f"exec:{command}")
+        sock.settimeout(timeout)
+        return sock
+
+    @staticmethod
+    def pump(sock: socket.socket, sink: BinaryIO) -> int:
+        received = 0
+        with sock:
+            while True:
+                chunk = sock.recv(CAPTURE_CHUNK)
+                if not chunk:
+                    return received
+                sink.write(chunk)
+                received += len(chunk)
+
+    def stream(self, serial: str, command: str, sink: BinaryIO, timeout: Optional[float] = 30) -> int:
+        started = time.perf_counter()
+        received = None
+        try:
+            received = self.pump(self.open(serial, command, timeout), sink)
+            return received
+        finally:
+            if TRACER.enabled:
+                TRACER.record(["-s", serial, "exec-out", command], started,
+                              0 if received is not None else None, bytes_out=received or 0)
+
+    def screenshot_bytes(self, serial: str) -> bytes:
+        buffer = io.BytesIO()
+        try:
+            self.stream(serial, SCREENCAP_COMMAND, buffer)
+        except (OSError, AdbServerError):
+            return b""
+        data = buffer.getvalue()
+        return data if data.startswith(PNG_SIGNATURE) else b""
+
+    def save_screenshot(self, serial: str, path: str) -> bool:
+        try:
+            with open(path, "wb") as f:
+                self.stream(serial, SCREENCAP_COMMAND, f)
+            with open(path, "rb") as f:
+                if f.read(len(PNG_SIGNATURE)) == PNG_SIGNATURE:
+                    return True
+        except (OSError, AdbServerError):
+            pass
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return False
+
+    def start_recording(self, serial: str, path: str, bitrate: str = "8M",
+                        limit: int = RECORD_MAX_SECONDS) -> "ScreenRecording":
+        command = RECORD_COMMAND.format(bitrate=bitrate, limit=min(max(limit, 1), RECORD_MAX_SECONDS))
+        return ScreenRecording(self, serial, path, self.open(serial, command, timeout=None))
+
+    def burst(self, serial: str, folder: str, rate: float, count: int,
+              token: Optional[CancelToken] = None,
+              on_slot: Optional[Callable[[], None]] = None) -> BurstReport:
+        """count кадров с частотой rate в секунду; кадр, для которого нет свободного слота, пропускается."""
+        rate = min(max(rate, 0.1), BURST_MAX_RATE)
+        os.makedirs(folder, exist_ok=True)
+        prefix = serial.replace(":", "_").replace("/", "_")
+        report = BurstReport(serial)
+        lock = threading.Lock()
+        slots = threading.Semaphore(BURST_INFLIGHT)
+
+        def shoot(index: int):
+            try:
+                ok = self.save_screenshot(serial, os.path.join(folder, f"{prefix}_{index + 1:04d}.png"))
+                with lock:
+                    if ok:
+                        report.captured += 1
+                    else:
+                        report.failed += 1
+            finally:
+                slots.release()
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=BURST_INFLIGHT) as pool:
+            for index in range(count):
+                if token is not None and not token.proceed():
+                    break
+                delay = started + index / rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                if slots.acquire(blocking=False):
+                    pool.submit(shoot, index)
+                else:
+                    with lock:
+                        report.dropped += 1
+                if on_slot:
+                    on_slot()
+        return report
+
+
+class ScreenRecording:
+    """screenrecord, пишущий H.264 в локальный файл до остановки или лимита времени."""
+
+    def __init__(self, capture: ScreenCapture, serial: str, path: str, sock: socket.socket):
+        self.capture = capture
+        self.serial = serial
+        self.path = path
+        self.received = 0
+        self.on_exit: Optional[Callable[["ScreenRecording"], None]] = None
+        self._sock = sock
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def _read(self):
+        started = time.perf_counter()
+        try:
+            with open(self.path, "wb") as f:
+                self.received = self.capture.pump(self._sock, f)
+        except OSError:
+            pass
+        if TRACER.enabled:
+            TRACER.record(["-s", self.serial, "exec-out", "screenrecord"], started, 0,
+                          bytes_out=self.received, op="screenrecord")
+        if self.on_exit:
+            self.on_exit(self)
+
+    def stop(self):
+        if not self.running:
+            return
+        # SIGINT даёт screenrecord дописать буфер кодека; если не помогло — рвём поток
+        try:
+            self.capture.stream(self.serial, "pkill -INT screenrecord", io.BytesIO(), timeout=5)
+        except (OSError, AdbServerError):
+            pass
+        self._thread.join(RECORD_STOP_TIMEOUT)
+        if self.running:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._thread.join(RECORD_STOP_TIMEOUT)
@@ -0,0 +1,218 @@
+import os
+import threading
+import time
+import tkinter as tk
+from tkinter import filedialog, ttk
+from typing import Callable, Dict, List
+
+from adb_client import AdbServerError
+from capture import BURST_MAX_RATE, RECORD_MAX_SECONDS, BurstReport, ScreenCapture, ScreenRecording, \
+    copy_png_to_clipboard
+from job_queue import INTERACTIVE, NORMAL, JobQueue
+from progress import ProgressModel
+
+
+def _safe_name(serial: str) -> str:
+    return serial.replace(":", "_").replace("/", "_")
+
+
+class CaptureWindow:
+    def __init__(self, parent, capture: ScreenCapture, current: str, jobs: JobQueue,
+                 log: Callable, progress: ProgressModel):
+        self.parent = parent
+        self.capture = capture
+        self.current = current
+        self.jobs = jobs
+        self.log = log
+        self.progress = progress
+        self.recordings: Dict[str, ScreenRecording] = {}
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Снимки и запись экрана")
+        self.window.geometry("520x480")
+        self.window.protocol("WM_DELETE_WINDOW", self._close)
+
+        self._setup_ui()
+        self._load_devices()
+
+    def _setup_ui(self):
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        devices_frame = ttk.LabelFrame(main_frame, text="Устройства", padding="5")
+        devices_frame.pack(fill=tk.BOTH, expand=True)
+        self.devices = tk.Listbox(devices_frame, selectmode=tk.EXTENDED, height=5, exportselection=False)
+        self.devices.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        ttk.Button(devices_frame, text="🔄", width=3, command=self._load_devices).pack(side=tk.LEFT, padx=5)
+
+        folder_frame = ttk.Frame(main_frame)
+        folder_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(folder_frame, text="Папка:").pack(side=tk.LEFT)
+        self.folder = ttk.Entry(folder_frame)
+        self.folder.insert(0, os.path.expanduser("~"))
+        self.folder.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        ttk.Button(folder_frame, text="Обзор", command=self._choose_folder).pack(side=tk.LEFT)
+
+        shot_frame = ttk.LabelFrame(main_frame, text="Снимок экрана", padding="5")
+        shot_frame.pack(fill=tk.X, pady=5)
+        ttk.Button(shot_frame, text="📷 Сохранить", command=self._screenshot).pack(side=tk.LEFT, padx=2)
+        ttk.Button(shot_frame, text="📋 В буфер обмена", command=self._screenshot_to_clipboard).pack(side=tk.LEFT, padx=2)
+
+        record_frame = ttk.LabelFrame(main_frame, text="Запись экрана", padding="5")
+        record_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(record_frame, text="Битрейт:").pack(side=tk.LEFT)
+        self.bitrate = ttk.Combobox(record_frame, values=["2M", "4M", "8M", "16M"], state="readonly", width=5)
+        self.bitrate.current(2)
+        self.bitrate.pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(record_frame, text="Лимит, с:").pack(side=tk.LEFT)
+        self.limit = ttk.Spinbox(record_frame, from_=1, to=RECORD_MAX_SECONDS, width=5)
+        self.limit.set(RECORD_MAX_SECONDS)
+        self.limit.pack(side=tk.LEFT, padx=(2, 8))
+        self.record_button = ttk.Button(record_frame, text="⏺ Начать", command=self._toggle_recording)
+        self.record_button.pack(side=tk.LEFT, padx=2)
+
+        burst_frame = ttk.LabelFrame(main_frame, text="Серия снимков", padding="5")
+        burst_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(burst_frame, text="Кадров/с:").pack(side=tk.LEFT)
+        self.rate = ttk.Spinbox(burst_frame, from_=1, to=BURST_MAX_RATE, width=4)
+        self.rate.set(2)
+        self.rate.pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Label(burst_frame, text="Всего:").pack(side=tk.LEFT)
+        self.count = ttk.Spinbox(burst_frame, from_=1, to=10000, width=6)
+        self.count.set(20)
+        self.count.pack(side=tk.LEFT, padx=(2, 8))
+        ttk.Button(burst_frame, text="▶ Запустить", command=self._burst).pack(side=tk.LEFT, padx=2)
+
+        self.status = ttk.Label(self.window, text="", padding="2")
+        self.status.pack(fill=tk.X)
+
+    def _load_devices(self):
+        def worker():
+            try:
+                serials = [serial for serial, state in self.capture.client.devices() if state == "device"]
+            except (OSError, AdbServerError):
+                serials = []
+            self.parent.after(0, lambda: self._on_devices(serials))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_devices(self, serials: List[str]):
+        if not self.window.winfo_exists():
+            return
+        self.devices.delete(0, tk.END)
+        for index, serial in enumerate(serials):
+            self.devices.insert(tk.END, serial)
+            if serial == self.current:
+                self.devices.selection_set(index)
+        if serials and not self.devices.curselection():
+            self.devices.selection_set(0)
+        self.status.config(text=f"Устройств: {len(serials)}")
+
+    def _choose_folder(self):
+        folder = filedialog.askdirectory(parent=self.window, initialdir=self.folder.get())
+        if folder:
+            self.folder.delete(0, tk.END)
+            self.folder.insert(0, folder)
+
+    def selected_devices(self) -> List[str]:
+        return [self.devices.get(index) for index in self.devices.curselection()]
+
+    def _target(self, serial: str, suffix: str) -> str:
+        folder = self.folder.get()
+        os.makedirs(folder, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        return os.path.join(folder, f"{_safe_name(serial)}_{stamp}{suffix}")
+
+    def _screenshot(self):
+        for serial in self.selected_devices():
+            path = self._target(serial, ".png")
+
+            def run(token, serial=serial, path=path):
+                if self.capture.save_screenshot(serial, path):
+                    self.parent.after(0, lambda: self.log(f"✓ Снимок экрана {serial}: {path}", "success"))
+                else:
+                    self.parent.after(0, lambda: self.log(f"✗ Не удалось снять экран {serial}", "error"))
+
+            self.jobs.submit(serial, "Снимок экрана", run, INTERACTIVE)
+
+    def _screenshot_to_clipboard(self):
+        devices = self.selected_devices()
+        if not devices:
+            return
+        serial = devices[0]
+
+        def run(token):
+            data = self.capture.screenshot_bytes(serial)
+            if not data:
+                self.parent.after(0, lambda: self.log(f"✗ Не удалось снять экран {serial}", "error"))
+            elif copy_png_to_clipboard(data):
+                self.parent.after(0, lambda: self.log(f"✓ Снимок экрана {serial} скопирован в буфер обмена", "success"))
+            else:
+                self.parent.after(0, lambda: self.log("✗ Для копирования изображений нужен xclip или wl-copy", "error"))
+
+        self.jobs.submit(serial, "Снимок в буфер обмена", run, INTERACTIVE)
+
+    def _toggle_recording(self):
+        if self.recordings:
+            recordings = list(self.recordings.values())
+            threading.Thread(target=lambda: [r.stop() for r in recordings], daemon=True).start()
+            return
+        try:
+            limit = int(self.limit.get())
+        except ValueError:
+            limit = RECORD_MAX_SECONDS
+        for serial in self.selected_devices():
+            try:
+                recording = self.capture.start_recording(serial, self._target(serial, ".h264"),
+                                                         self.bitrate.get(), limit)
+            except (OSError, AdbServerError) as e:
+                self.log(f"✗ Не удалось начать запись {serial}: {e}", "error")
+                continue
+            recording.on_exit = lambda r: self.parent.after(0, lambda: self._on_recording_done(r))
+            self.recordings[serial] = recording
+            self.log(f"⏺ Запись экрана {serial}: {recording.path}", "info")
+        if self.recordings:
+            self.record_button.config(text="⏹ Остановить")
+
+    def _on_recording_done(self, recording: ScreenRecording):
+        self.recordings.pop(recording.serial, None)
+        if recording.received:
+            self.log(f"✓ Запись экрана {recording.serial} сохранена: {recording.path}", "success")
+        else:
+            self.log(f"✗ Запись экрана {recording.serial} не получена", "error")
+        if not self.recordings and self.window.winfo_exists():
+            self.record_button.config(text="⏺ Начать")
+
+    def _burst(self):
+        devices = self.selected_devices()
+        try:
+            rate = float(self.rate.get())
+            count = int(self.count.get())
+        except ValueError:
+            return
+        if not devices or count < 1:
+            return
+        folder = os.path.join(self.folder.get(), time.strftime("burst_%Y%m%d_%H%M%S"))
+
+        for serial in devices:
+            def run(token, serial=serial):
+                # Задача прогресса живёт столько же, сколько сама серия: отменённая в очереди её не оставляет
+                task = self.progress.start(f"Серия снимков {serial}", count)
+                try:
+                    report = self.capture.burst(serial, folder, rate, count, token, on_slot=task.advance)
+                finally:
+                    task.finish()
+                self.parent.after(0, lambda: self._on_burst_done(report, folder))
+
+            self.jobs.submit(serial, f"Серия снимков: {count}", run, NORMAL)
+
+    def _on_burst_done(self, report: BurstReport, folder: str):
+        level = "success" if not report.failed else "warning"
+        self.log(f"✓ Серия {report.serial}: снято {report.captured}, пропущено {report.dropped}, "
+                 f"ошибок {report.failed} ({folder})", level)
+
+    def _close(self):
+        recordings = list(self.recordings.values())
+        if recordings:
+            threading.Thread(target=lambda: [r.stop() for r in recordings], daemon=True).start()
+        self.window.destroy()
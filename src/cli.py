@@ -0,0 +1,218 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Callable, Dict, List, Tuple
+
+from adb_helper import ADBHelper
+from connection_manager import ConnectionManager
+from device_store import DeviceStore
+from transfer import TransferEngine, TransferJob
+
+
+def _transfer_result(jobs: List[TransferJob]) -> dict:
+    failed = [job.source for job in jobs if not job.success]
+    return {"ok": not failed, "transferred": len(jobs) - len(failed), "failed": failed}
+
+
+def cmd_ls(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    files = adb.list_files(args.path)
+    # Пустой список — это и пустая папка, и ошибка доступа
+    if not files and not adb.check_directory_access(args.path):
+        return {"ok": False, "path": args.path, "error": "Папка не найдена или нет доступа"}
+    return {"ok": True, "path": args.path, "files": [asdict(f) for f in files]}
+
+
+def cmd_pull(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    # Как у adb pull: один файл в несуществующий путь — это имя файла, иначе путь — папка
+    to_file = len(args.remote) == 1 and not args.local.endswith(("/", os.sep)) and not os.path.isdir(args.local)
+    folder, name = os.path.split(args.local) if to_file else (args.local, "")
+    if len(args.targets) > 1:
+        # Несколько устройств не должны перезаписывать файлы друг друга
+        folder = os.path.join(folder, adb.device.replace(":", "_"))
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    target = os.path.join(folder, name) if to_file else folder
+    jobs = [TransferJob("pull", remote, target) for remote in args.remote]
+    return _transfer_result(engine.run(jobs))
+
+
+def cmd_push(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    jobs = [TransferJob("push", local, args.remote) for local in args.local]
+    return _transfer_result(engine.run(jobs))
+
+
+def cmd_rm(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    failed = [path for path in args.path if not adb.delete_file(path)]
+    return {"ok": not failed, "failed": failed}
+
+
+def cmd_mkdir(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    return {"ok": adb.create_folders(args.path)}
+
+
+def cmd_install(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    results = {}
+    for apk in args.apk:
+        success, message = adb.install_apk(apk)
+        results[apk] = {"ok": success, "message": message.strip()}
+    return {"ok": all(r["ok"] for r in results.values()), "packages": results}
+
+
+def cmd_info(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    return {"ok": True, "info": asdict(adb.get_device_info())}
+
+
+def cmd_sync(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    local_root = os.path.abspath(args.local)
+    remote_root = args.remote.rstrip('/') or "/"
+    remote = adb.stat_tree(remote_root)
+    local = {}
+    for dirpath, _, filenames in os.walk(local_root):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            try:
+                stat = os.stat(full)
+            except OSError:
+                continue
+            rel = os.path.relpath(full, local_root).replace(os.sep, "/")
+            local[rel] = (stat.st_size, int(stat.st_mtime))
+
+    jobs = []
+    if args.direction == "push":
+        changed = [rel for rel, (size, mtime) in local.items()
+                   if rel not in remote or remote[rel][0] != size or remote[rel][1] < mtime]
+        dirs = sorted({os.path.dirname(f"{remote_root}/{rel}") for rel in changed})
+        if not adb.create_folders(dirs):
+            return {"ok": False, "error": "Не удалось создать папки на устройстве"}
+        jobs = [TransferJob("push", os.path.join(local_root, rel), os.path.dirname(f"{remote_root}/{rel}"))
+                for rel in changed]
+    else:
+        changed = [rel for rel, (size, mtime) in remote.items()
+                   if rel not in local or local[rel][0] != size or local[rel][1] < mtime]
+        for rel in changed:
+            os.makedirs(os.path.dirname(os.path.join(local_root, rel)), exist_ok=True)
+        jobs = [TransferJob("pull", f"{remote_root}/{rel}", os.path.dirname(os.path.join(local_root, rel)))
+                for rel in changed]
+
+    result = _transfer_result(engine.run(jobs))
+    result["unchanged"] = len(local if args.direction == "push" else remote) - len(changed)
+    return result
+
+
+def cmd_search(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    # Ищет только в папках, которые уже открывались: устройство не опрашивается
+    found = adb.search_cached(args.pattern, args.limit)
+    return {"ok": True, "pattern": args.pattern,
+            "files": [dict(asdict(f), path=f"{directory.rstrip('/')}/{f.name}") for directory, f in found]}
+
+
+def cmd_history(adb: ADBHelper, engine: TransferEngine, args) -> dict:
+    columns = ("direction", "source", "target", "bytes", "duration", "success", "ts")
+    transfers = [dict(zip(columns, row)) for row in adb.transfer_history(args.limit)]
+    for transfer in transfers:
+        transfer["success"] = bool(transfer["success"])
+    return {"ok": True, "transfers": transfers}
+
+
+COMMANDS: Dict[str, Callable] = {
+    "ls": cmd_ls,
+    "pull": cmd_pull,
+    "push": cmd_push,
+    "rm": cmd_rm,
+    "mkdir": cmd_mkdir,
+    "install": cmd_install,
+    "info": cmd_info,
+    "sync": cmd_sync,
+    "search": cmd_search,
+    "history": cmd_history,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="adb-file-manager-cli", description="ADB File Manager без GUI")
+    parser.add_argument("-s", "--serial", action="append", default=[],
+                        help="серийный номер устройства (можно указать несколько раз)")
+    parser.add_argument("--all", action="store_true", help="все подключенные устройства")
+    parser.add_argument("--no-compress", action="store_true", help="не сжимать передачи")
+    parser.add_argument("--indent", type=int, default=None, help="отступ JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("ls")
+    p.add_argument("path")
+    p = sub.add_parser("pull")
+    p.add_argument("remote", nargs="+")
+    p.add_argument("local")
+    p = sub.add_parser("push")
+    p.add_argument("local", nargs="+")
+    p.add_argument("remote")
+    p = sub.add_parser("rm")
+    p.add_argument("path", nargs="+")
+    p = sub.add_parser("mkdir")
+    p.add_argument("path", nargs="+")
+    p = sub.add_parser("install")
+    p.add_argument("apk", nargs="+")
+    sub.add_parser("info")
+    p = sub.add_parser("sync")
+    p.add_argument("local")
+    p.add_argument("remote")
+    p.add_argument("--direction", choices=["push", "pull"], default="push")
+    p = sub.add_parser("search")
+    p.add_argument("pattern")
+    p.add_argument("--limit", type=int, default=500)
+    p = sub.add_parser("history")
+    p.add_argument("--limit", type=int, default=100)
+    return parser
+
+
+def run_for_device(serial: str, args, connections: ConnectionManager, store: DeviceStore) -> dict:
+    adb = ADBHelper()
+    adb.device = serial
+    adb.store = store
+    adb.compression_enabled = adb.compression_enabled and not args.no_compress
+    engine = TransferEngine(adb, connections)
+    try:
+        return COMMANDS[args.command](adb, engine, args)
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    # stdout принадлежит JSON-результату: диагностика модулей уходит в stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        payload, code = run(args)
+    print(json.dumps(payload, ensure_ascii=False, indent=args.indent), file=out)
+    return code
+
+
+def run(args) -> Tuple[dict, int]:
+    if not ADBHelper.check_adb():
+        return {"ok": False, "error": "adb не найден"}, 2
+
+    serials = args.serial
+    if args.all or not serials:
+        serials = ADBHelper().get_devices()
+        if not args.all and len(serials) > 1:
+            return {"ok": False, "error": "Подключено несколько устройств, укажите -s или --all",
+                    "devices": serials}, 2
+    if not serials:
+        return {"ok": False, "error": "Нет подключенного устройства"}, 2
+    args.targets = serials
+
+    connections = ConnectionManager()
+    store = DeviceStore()
+    with ThreadPoolExecutor(max_workers=len(serials)) as pool:
+        futures = {serial: pool.submit(run_for_device, serial, args, connections, store) for serial in serials}
+        results = {serial: future.result() for serial, future in futures.items()}
+
+    ok = all(r.get("ok") for r in results.values())
+    return {"ok": ok, "command": args.command, "devices": results}, 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import os
+import zlib
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Уже сжатые форматы: повторное сжатие только тратит CPU
+INCOMPRESSIBLE_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.heif', '.avif',
+    '.mp4', '.mkv', '.webm', '.3gp', '.mov', '.avi', '.m4v',
+    '.mp3', '.m4a', '.aac', '.ogg', '.opus', '.flac', '.amr',
+    '.zip', '.apk', '.apks', '.xapk', '.aab', '.jar', '.gz', '.tgz', '.xz', '.bz2',
+    '.zst', '.7z', '.rar', '.br', '.lz4', '.obb', '.pdf', '.docx', '.xlsx', '.pptx',
+}
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.txt', '.log', '.csv', '.json', '.xml', '.html', '.htm', '.md', '.ini', '.conf',
+    '.cfg', '.yaml', '.yml', '.sql', '.db', '.sqlite', '.js', '.css', '.py', '.java',
+    '.kt', '.c', '.h', '.cpp', '.sh', '.prop', '.trace', '.hprof', '.tar', '.bmp', '.wav',
+}
+
+SAMPLE_SIZE = 64 * 1024
+MIN_COMPRESS_SIZE = 16 * 1024
+
+
+def is_compressible(path: str) -> bool:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in INCOMPRESSIBLE_EXTENSIONS:
+        return False
+    if ext in COMPRESSIBLE_EXTENSIONS:
+        return True
+    try:
+        with open(path, 'rb') as f:
+            sample = f.read(SAMPLE_SIZE)
+    except OSError:
+        return False
+    if len(sample) < MIN_COMPRESS_SIZE:
+        return False
+    return len(zlib.compress(sample, 1)) < len(sample) * 0.7
+
+
+def compressible_share(path: str) -> float:
+    """Доля байт каталога, приходящаяся на сжимаемые файлы."""
+    total = compressible = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            try:
+                size = os.path.getsize(full)
+            except OSError:
+                continue
+            total += size
+            ext = os.path.splitext(name)[1].lower()
+            if ext not in INCOMPRESSIBLE_EXTENSIONS:
+                compressible += size
+    return compressible / total if total else 0.0
+
+
+class StreamCodec:
+    def __init__(self, name: str):
+        self.name = name
+
+    @property
+    def device_decompress(self) -> str:
+        return "zstd -d -c" if self.name == "zstd" else "gzip -d -c"
+
+    @property
+    def device_compress(self) -> str:
+        return "zstd -c" if self.name == "zstd" else "gzip -c"
+
+    def compressor(self):
+        if self.name == "zstd":
+            return _ZstdCompressor()
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def decompressor(self):
+        if self.name == "zstd":
+            return _ZstdDecompressor()
+        return zlib.decompressobj(31)
+
+
+class _ZstdCompressor:
+    def __init__(self):
+        self._obj = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _ZstdDecompressor:
+    def __init__(self):
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return b""
+
+    @property
+    def eof(self) -> bool:
+        # Конец кадра zstd, как eof у zlib; старые zstandard его не сообщают
+        return getattr(self._obj, "eof", True)
+
+
+def pick_codec(device_binaries: set) -> Optional[StreamCodec]:
+    if zstandard is not None and "zstd" in device_binaries:
+        return StreamCodec("zstd")
+    if "gzip" in device_binaries:
+        return StreamCodec("gzip")
+    return None
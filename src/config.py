@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass
 
 @dataclass(frozen=True)
@@ -5,9 +6,30 @@ class Config:
     ANDROID_HOME = "/storage/emulated/0"
     WINDOW_SIZE = "1200x800"
     LOG_HEIGHT = 8
+    LOG_MAX_LINES = 5000
+    LOG_FLUSH_MS = 50
+    LOGCAT_MAX_ENTRIES = 50000
+    LOGCAT_VISIBLE_LINES = 3000
+    THUMBNAIL_SIZE = 64
+    THUMBNAIL_CACHE_BYTES = 200 * 1024 * 1024
+    THUMBNAIL_FULL_READ_LIMIT = 8 * 1024 * 1024
+    PREVIEW_PAGE_SIZE = 64 * 1024
+    PREVIEW_IMAGE_LIMIT = 16 * 1024 * 1024
     PROGRESS_LENGTH = 400
+    PROGRESS_POLL_MS = 100
+    TRACE_MAX_EVENTS = 5000
+    TELEMETRY_INTERVAL = 60
+    TELEMETRY_HISTORY = 7 * 24 * 60
+    PREFETCH_PER_MINUTE = 20
+    PREFETCH_FRESH_SECONDS = 30
+    PREFETCH_IDLE_MS = 1500
+    PREFETCH_MAX_LISTINGS = 200
     GITHUB_REPO = "itsegork/adb-file-manager"
     CURRENT_VERSION = "2.0.2"
+    CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".config", "adb-file-manager")
+    DEVICE_DB_PATH = os.path.join(CONFIG_DIR, "devices.db")
+    COMPRESSION_ENABLED = True
+    COMPRESSION_MAX_LINK_SPEED = 8 * 1024 * 1024
 
     class Messages:
         NO_DEVICE = "Нет подключенного устройства"
@@ -0,0 +1,142 @@
+import json
+import os
+import statistics
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+from adb_client import AdbServerClient, AdbServerError
+from config import Config
+from models import LinkProfile, SavedDevice
+
+PROBE_SIZE = 2 * 1024 * 1024
+LATENCY_PROBES = 3
+
+
+class ConnectionManager:
+    def __init__(self, client: Optional[AdbServerClient] = None, storage_path: Optional[str] = None):
+        self.client = client or AdbServerClient()
+        self.storage_path = storage_path or os.path.join(Config.CONFIG_DIR, "devices.json")
+        self.saved: List[SavedDevice] = self._load()
+        self.profiles: Dict[str, LinkProfile] = {}
+        self._lock = threading.Lock()
+
+    def connect(self, address: str) -> Tuple[bool, str]:
+        address = self.normalize_address(address)
+        try:
+            message = self.client.query(f"host:connect:{address}")
+        except (OSError, AdbServerError) as e:
+            return False, str(e)
+        success = "connected to" in message
+        if success:
+            self._remember(address)
+        return success, message.strip()
+
+    def pair(self, address: str, code: str) -> Tuple[bool, str]:
+        try:
+            message = self.client.query(f"host:pair:{code.strip()}:{address.strip()}")
+        except (OSError, AdbServerError) as e:
+            return False, str(e)
+        return "Successfully paired" in message, message.strip()
+
+    def disconnect(self, address: str) -> Tuple[bool, str]:
+        try:
+            message = self.client.query(f"host:disconnect:{self.normalize_address(address)}")
+        except (OSError, AdbServerError) as e:
+            return False, str(e)
+        return True, message.strip()
+
+    def forget(self, address: str):
+        with self._lock:
+            self.saved = [d for d in self.saved if d.address != address]
+            self._save()
+
+    def reconnect_saved(self) -> List[str]:
+        connected = []
+        online = {serial for serial, state in self._devices() if state == "device"}
+        for device in list(self.saved):
+            if device.address in online or self.connect(device.address)[0]:
+                connected.append(device.address)
+        return connected
+
+    def profile_for(self, serial: str) -> LinkProfile:
+        profile = self.profiles.get(serial)
+        if profile is None:
+            profile = LinkProfile(serial=serial, transport=self.transport_of(serial))
+        return profile
+
+    def measure(self, serial: str) -> LinkProfile:
+        profile = LinkProfile(serial=serial, transport=self.transport_of(serial))
+        try:
+            samples = []
+            for _ in range(LATENCY_PROBES):
+                started = time.monotonic()
+                self._drain(self.client.open_device_service(serial, "shell:echo"))
+                samples.append((time.monotonic() - started) * 1000)
+            profile.latency_ms = statistics.median(samples)
+
+            started = time.monotonic()
+            received = self._drain(
+                self.client.open_device_service(serial, f"exec:head -c {PROBE_SIZE} /dev/urandom")
+            )
+            duration = time.monotonic() - started
+            if received and duration > 0:
+                profile.throughput = received / duration
+                profile.measured = True
+        except (OSError, AdbServerError):
+            return self.profile_for(serial)
+        self.profiles[serial] = profile
+        return profile
+
+    @staticmethod
+    def transport_of(serial: str) -> str:
+        if ":" in serial or (serial.startswith("adb-") and "._adb-tls-connect._tcp" in serial):
+            return "tcp"
+        return "usb"
+
+    def _devices(self) -> List[Tuple[str, str]]:
+        try:
+            return self.client.devices()
+        except (OSError, AdbServerError):
+            return []
+
+    @staticmethod
+    def _drain(sock) -> int:
+        received = 0
+        with sock:
+            while True:
+                chunk = sock.recv(256 * 1024)
+                if not chunk:
+                    return received
+                received += len(chunk)
+
+    @staticmethod
+    def normalize_address(address: str) -> str:
+        address = address.strip()
+        return address if ":" in address else f"{address}:5555"
+
+    def _remember(self, address: str):
+        with self._lock:
+            for device in self.saved:
+                if device.address == address:
+                    device.last_connected = time.time()
+                    break
+            else:
+                self.saved.append(SavedDevice(address=address, last_connected=time.time()))
+            self._save()
+
+    def _load(self) -> List[SavedDevice]:
+        try:
+            with open(self.storage_path, encoding="utf-8") as f:
+                return [SavedDevice(**item) for item in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return []
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
+            with open(self.storage_path, "w", encoding="utf-8") as f:
+                json.dump([asdict(d) for d in self.saved], f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"Ошибка сохранения списка устройств: {e}")
@@ -0,0 +1,131 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+from connection_manager import ConnectionManager
+
+
+class ConnectionWindow:
+    def __init__(self, parent, connections: ConnectionManager, log: Callable, on_connected: Callable[[str], None]):
+        self.parent = parent
+        self.connections = connections
+        self.log = log
+        self.on_connected = on_connected
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Подключение по Wi-Fi")
+        self.window.geometry("480x420")
+        self.window.transient(parent)
+
+        self._setup_ui()
+        self._refresh_saved()
+
+        self.window.update_idletasks()
+        x = parent.winfo_x() + (parent.winfo_width() - self.window.winfo_width()) // 2
+        y = parent.winfo_y() + (parent.winfo_height() - self.window.winfo_height()) // 2
+        self.window.geometry(f"+{x}+{y}")
+
+    def _setup_ui(self):
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        connect_frame = ttk.LabelFrame(main_frame, text="Новое устройство", padding="10")
+        connect_frame.pack(fill=tk.X, pady=(0, 10))
+
+        ttk.Label(connect_frame, text="Адрес (IP:порт):").grid(row=0, column=0, sticky=tk.W, pady=2)
+        self.address_entry = ttk.Entry(connect_frame, width=28)
+        self.address_entry.grid(row=0, column=1, padx=5, pady=2)
+
+        ttk.Label(connect_frame, text="Код сопряжения:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.code_entry = ttk.Entry(connect_frame, width=28)
+        self.code_entry.grid(row=1, column=1, padx=5, pady=2)
+
+        buttons = ttk.Frame(connect_frame)
+        buttons.grid(row=2, column=0, columnspan=2, pady=(5, 0))
+        ttk.Button(buttons, text="🔗 Подключить", command=self._connect).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="🤝 Сопрячь", command=self._pair).pack(side=tk.LEFT, padx=5)
+
+        saved_frame = ttk.LabelFrame(main_frame, text="Сохранённые устройства", padding="10")
+        saved_frame.pack(fill=tk.BOTH, expand=True)
+
+        self.saved_list = tk.Listbox(saved_frame, height=8)
+        self.saved_list.pack(fill=tk.BOTH, expand=True)
+        self.saved_list.bind("<Double-1>", lambda e: self._connect_saved())
+
+        saved_buttons = ttk.Frame(saved_frame)
+        saved_buttons.pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(saved_buttons, text="🔗 Подключить", command=self._connect_saved).pack(side=tk.LEFT, padx=5)
+        ttk.Button(saved_buttons, text="⛔ Отключить", command=self._disconnect_saved).pack(side=tk.LEFT, padx=5)
+        ttk.Button(saved_buttons, text="🗑️ Забыть", command=self._forget_saved).pack(side=tk.LEFT, padx=5)
+        ttk.Button(saved_buttons, text="🔄 Все", command=self._reconnect_all).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(main_frame, text="Закрыть", command=self.window.destroy, width=15).pack(pady=(10, 0))
+
+    def _refresh_saved(self):
+        self.saved_list.delete(0, tk.END)
+        for device in self.connections.saved:
+            profile = self.connections.profiles.get(device.address)
+            suffix = ""
+            if profile and profile.measured:
+                suffix = f"  ({profile.throughput / 1024 / 1024:.1f} МБ/с, {profile.latency_ms:.0f} мс)"
+            self.saved_list.insert(tk.END, f"{device.name or device.address}{suffix}")
+
+    def _selected_address(self):
+        selection = self.saved_list.curselection()
+        if not selection:
+            return None
+        return self.connections.saved[selection[0]].address
+
+    def _connect(self):
+        address = self.address_entry.get().strip()
+        if address:
+            self._run(lambda: self.connections.connect(address), address)
+
+    def _pair(self):
+        address = self.address_entry.get().strip()
+        code = self.code_entry.get().strip()
+        if address and code:
+            self._run(lambda: self.connections.pair(address, code))
+
+    def _connect_saved(self):
+        address = self._selected_address()
+        if address:
+            self._run(lambda: self.connections.connect(address), address)
+
+    def _disconnect_saved(self):
+        address = self._selected_address()
+        if address:
+            self._run(lambda: self.connections.disconnect(address))
+
+    def _forget_saved(self):
+        address = self._selected_address()
+        if address:
+            self.connections.forget(address)
+            self._refresh_saved()
+
+    def _reconnect_all(self):
+        def worker():
+            connected = self.connections.reconnect_saved()
+            self.parent.after(0, lambda: self.log(f"✓ Переподключено устройств: {len(connected)}", "success"))
+            for address in connected:
+                self.parent.after(0, lambda a=address: self.on_connected(a))
+            self.parent.after(0, self._refresh_if_open)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _run(self, action: Callable, connected_address: str = None):
+        def worker():
+            success, message = action()
+            tag = "success" if success else "error"
+            mark = "✓" if success else "✗"
+            self.parent.after(0, lambda: self.log(f"{mark} {message}", tag))
+            if success and connected_address:
+                self.parent.after(0, lambda: self.on_connected(self.connections.normalize_address(connected_address)))
+            self.parent.after(0, self._refresh_if_open)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _refresh_if_open(self):
+        if self.window.winfo_exists():
+            self._refresh_saved()
@@ -0,0 +1,135 @@
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from device_store import DeviceStore
+
+HASH_BATCH = 100
+# hashlib отпускает GIL на больших блоках, поэтому потоков хватает; fork внутри
+# многопоточного процесса Tk, как у ProcessPoolExecutor, небезопасен
+LOCAL_HASH_WORKERS = min(os.cpu_count() or 1, 8)
+
+
+def hash_local_file(path: str) -> Tuple[str, str]:
+    digest = hashlib.md5()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return path, ""
+    return path, digest.hexdigest()
+
+
+@dataclass
+class DuplicateMatch:
+    digest: str
+    size: int
+    remote_paths: List[str] = field(default_factory=list)
+    local_paths: List[str] = field(default_factory=list)
+
+
+@dataclass
+class DedupeReport:
+    matches: List[DuplicateMatch] = field(default_factory=list)
+    remote_total: int = 0
+    local_total: int = 0
+    remote_hashed: int = 0
+    local_hashed: int = 0
+
+    @property
+    def remote_only(self) -> int:
+        return self.remote_total - sum(len(m.remote_paths) for m in self.matches)
+
+
+class DuplicateFinder:
+    def __init__(self, adb, store: DeviceStore):
+        self.adb = adb
+        self.store = store
+
+    def find(self, remote_root: str, local_root: str,
+             on_status: Callable[[str], None] = lambda message: None) -> DedupeReport:
+        remote_root = remote_root.rstrip('/') or "/"
+        serial = self.adb.device
+
+        on_status("📂 Получение списка файлов на устройстве...")
+        tree = self.adb.for_device(serial).stat_tree(remote_root)
+        remote = {f"{remote_root}/{rel}": meta for rel, meta in tree.items()}
+        local = self._walk_local(local_root)
+        report = DedupeReport(remote_total=len(remote), local_total=len(local))
+
+        # Хэшируем только файлы, размер которых встречается на обеих сторонах
+        common_sizes = {size for size, _ in remote.values()} & {size for size, _ in local.values()}
+        remote_candidates = {p: m for p, m in remote.items() if m[0] in common_sizes}
+        local_candidates = {p: m for p, m in local.items() if m[0] in common_sizes}
+        on_status(f"🔍 Кандидатов: {len(remote_candidates)} на устройстве, {len(local_candidates)} на компьютере")
+
+        with ThreadPoolExecutor(max_workers=1) as device_worker:
+            remote_future = device_worker.submit(self._hash_remote, serial, remote_candidates)
+            local_hashes = self._hash_local(local_candidates)
+            remote_hashes = remote_future.result()
+
+        report.remote_hashed = len(remote_hashes)
+        report.local_hashed = len(local_hashes)
+        by_digest: Dict[str, DuplicateMatch] = {}
+        local_by_digest = defaultdict(list)
+        for path, digest in local_hashes.items():
+            local_by_digest[digest].append(path)
+        for path, digest in remote_hashes.items():
+            if digest in local_by_digest:
+                match = by_digest.setdefault(
+                    digest, DuplicateMatch(digest, remote[path][0], local_paths=local_by_digest[digest])
+                )
+                match.remote_paths.append(path)
+        report.matches = sorted(by_digest.values(), key=lambda m: m.remote_paths[0])
+        return report
+
+    @staticmethod
+    def _walk_local(root: str) -> Dict[str, Tuple[int, int]]:
+        result = {}
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                result[full] = (stat.st_size, int(stat.st_mtime))
+        return result
+
+    def _hash_remote(self, serial: str, files: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+        adb = self.adb.for_device(serial)
+        hashes, pending = {}, []
+        for path, (size, mtime) in files.items():
+            digest = self.store.get_hash(serial, path, size, mtime)
+            if digest:
+                hashes[path] = digest
+            else:
+                pending.append(path)
+        for i in range(0, len(pending), HASH_BATCH):
+            batch = pending[i:i + HASH_BATCH]
+            batch_hashes = adb.hash_remote_files(batch)
+            hashes.update(batch_hashes)
+            self.store.put_hashes(serial, [(path, *files[path], digest) for path, digest in batch_hashes.items()])
+        return hashes
+
+    def _hash_local(self, files: Dict[str, Tuple[int, int]]) -> Dict[str, str]:
+        hashes, pending = {}, []
+        for path, (size, mtime) in files.items():
+            digest = self.store.get_hash("local", path, size, mtime)
+            if digest:
+                hashes[path] = digest
+            else:
+                pending.append(path)
+        if pending:
+            computed = []
+            with ThreadPoolExecutor(max_workers=LOCAL_HASH_WORKERS) as pool:
+                for path, digest in pool.map(hash_local_file, pending):
+                    if digest:
+                        hashes[path] = digest
+                        computed.append((path, *files[path], digest))
+            self.store.put_hashes("local", computed)
+        return hashes
@@ -0,0 +1,72 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+from dedupe import DedupeReport, DuplicateFinder
+from utils import format_size
+
+
+class DedupeWindow:
+    def __init__(self, parent, finder: DuplicateFinder, remote_root: str, local_root: str, log: Callable):
+        self.parent = parent
+        self.finder = finder
+        self.log = log
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Поиск дубликатов")
+        self.window.geometry("900x500")
+
+        ttk.Label(
+            self.window,
+            text=f"Устройство: {remote_root}\nКомпьютер: {local_root}",
+            padding="10"
+        ).pack(fill=tk.X)
+
+        frame = ttk.Frame(self.window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        scrollbar = ttk.Scrollbar(frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(frame, columns=("local", "size"), yscrollcommand=scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree.yview)
+        self.tree.heading("#0", text="На устройстве")
+        self.tree.heading("local", text="На компьютере")
+        self.tree.heading("size", text="Размер")
+        self.tree.column("#0", width=380)
+        self.tree.column("local", width=380)
+        self.tree.column("size", width=90, anchor="e")
+
+        self.status = ttk.Label(self.window, text="🔍 Поиск...", padding="10")
+        self.status.pack(fill=tk.X)
+
+        threading.Thread(target=self._run, args=(remote_root, local_root), daemon=True).start()
+
+    def _run(self, remote_root: str, local_root: str):
+        def status(message: str):
+            self.parent.after(0, lambda: self._set_status(message))
+
+        try:
+            report = self.finder.find(remote_root, local_root, status)
+        except Exception as e:
+            self.parent.after(0, lambda: self.log(f"✗ Ошибка поиска дубликатов: {e}", "error"))
+            return
+        self.parent.after(0, lambda: self._show(report))
+
+    def _set_status(self, message: str):
+        if self.window.winfo_exists():
+            self.status.config(text=message)
+
+    def _show(self, report: DedupeReport):
+        backed_up = sum(len(m.remote_paths) for m in report.matches)
+        summary = (f"✓ Уже есть на компьютере: {backed_up} из {report.remote_total}, "
+                   f"нет копии: {report.remote_only} "
+                   f"(хэшировано: устройство {report.remote_hashed}, компьютер {report.local_hashed})")
+        self.log(summary, "success")
+        if not self.window.winfo_exists():
+            return
+        self.status.config(text=summary)
+        for match in report.matches:
+            for remote_path in match.remote_paths:
+                self.tree.insert("", tk.END, text=remote_path,
+                                 values=("; ".join(match.local_paths), format_size(match.size)))
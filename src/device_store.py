@@ -0,0 +1,187 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from models import FileInfo
+from utils import format_size
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    serial TEXT PRIMARY KEY,
+    model TEXT NOT NULL DEFAULT '',
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS properties (
+    serial TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (serial, name)
+);
+CREATE TABLE IF NOT EXISTS listings (
+    serial TEXT NOT NULL,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime TEXT NOT NULL,
+    permissions TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (serial, dir, name)
+);
+CREATE INDEX IF NOT EXISTS idx_listings_name ON listings (serial, name);
+CREATE INDEX IF NOT EXISTS idx_listings_mtime ON listings (serial, mtime);
+CREATE TABLE IF NOT EXISTS hashes (
+    side TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (side, path)
+);
+CREATE INDEX IF NOT EXISTS idx_hashes_digest ON hashes (digest);
+CREATE TABLE IF NOT EXISTS transfers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    serial TEXT NOT NULL,
+    direction TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    bytes INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    success INTEGER NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transfers_serial ON transfers (serial, ts);
+"""
+
+
+class DeviceStore:
+    """Локальная SQLite-база всего, что известно об устройствах.
+
+    Каждый поток работает через своё соединение; WAL и busy_timeout позволяют
+    писать из нескольких рабочих потоков одновременно.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.DEVICE_DB_PATH
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def touch_device(self, serial: str, model: str = ""):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO devices (serial, model, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(serial) DO UPDATE SET last_seen = excluded.last_seen, "
+                "model = CASE WHEN excluded.model != '' THEN excluded.model ELSE devices.model END",
+                (serial, model, time.time())
+            )
+
+    def save_properties(self, serial: str, properties: Dict[str, str]):
+        now = time.time()
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO properties (serial, name, value, updated) VALUES (?, ?, ?, ?)",
+                [(serial, name, value, now) for name, value in properties.items()]
+            )
+
+    def get_properties(self, serial: str) -> Dict[str, str]:
+        rows = self._conn().execute("SELECT name, value FROM properties WHERE serial = ?", (serial,))
+        return dict(rows.fetchall())
+
+    def save_listing(self, serial: str, directory: str, files: List[FileInfo]):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute("DELETE FROM listings WHERE serial = ? AND dir = ?", (serial, directory))
+            conn.executemany(
+                "INSERT OR REPLACE INTO listings "
+                "(serial, dir, name, is_dir, size, mtime, permissions, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(serial, directory, f.name, int(f.is_dir), f.size_bytes, f.modified, f.permissions, now)
+                 for f in files]
+            )
+
+    def get_listing(self, serial: str, directory: str) -> Optional[List[FileInfo]]:
+        rows = self._conn().execute(
+            "SELECT name, is_dir, size, mtime, permissions FROM listings WHERE serial = ? AND dir = ?",
+            (serial, directory)
+        ).fetchall()
+        if not rows:
+            return None
+        return [self._file_info(*row) for row in rows]
+
+    def search(self, serial: str, pattern: str, limit: int = 500) -> List[Tuple[str, FileInfo]]:
+        # % и _ в имени ищутся буквально
+        escaped = pattern.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        rows = self._conn().execute(
+            "SELECT dir, name, is_dir, size, mtime, permissions FROM listings "
+            "WHERE serial = ? AND name LIKE ? ESCAPE '\\' ORDER BY mtime DESC LIMIT ?",
+            (serial, f"%{escaped}%", limit)
+        ).fetchall()
+        return [(row[0], self._file_info(*row[1:])) for row in rows]
+
+    def get_hash(self, side: str, path: str, size: int, mtime: int) -> str:
+        row = self._conn().execute(
+            "SELECT digest FROM hashes WHERE side = ? AND path = ? AND size = ? AND mtime = ?",
+            (side, path, size, mtime)
+        ).fetchone()
+        return row[0] if row else ""
+
+    def put_hashes(self, side: str, entries: List[Tuple[str, int, int, str]]):
+        with self._conn() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO hashes (side, path, size, mtime, digest) VALUES (?, ?, ?, ?, ?)",
+                [(side, path, size, mtime, digest) for path, size, mtime, digest in entries]
+            )
+
+    def record_transfer(self, serial: str, direction: str, source: str, target: str,
+                        size: int, duration: float, success: bool):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO transfers (serial, direction, source, target, bytes, duration, success, ts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (serial, direction, source, target, size, duration, int(success), time.time())
+            )
+
+    def transfer_history(self, serial: str, limit: int = 100) -> List[tuple]:
+        return self._conn().execute(
+            "SELECT direction, source, target, bytes, duration, success, ts FROM transfers "
+            "WHERE serial = ? ORDER BY ts DESC LIMIT ?",
+            (serial, limit)
+        ).fetchall()
+
+    def average_throughput(self, serial: str, samples: int = 20) -> Optional[float]:
+        row = self._conn().execute(
+            "SELECT SUM(bytes), SUM(duration) FROM (SELECT bytes, duration FROM transfers "
+            "WHERE serial = ? AND success = 1 AND bytes >= 262144 AND duration > 0 "
+            "ORDER BY ts DESC LIMIT ?)",
+            (serial, samples)
+        ).fetchone()
+        if not row or not row[0] or not row[1]:
+            return None
+        return row[0] / row[1]
+
+    @staticmethod
+    def _file_info(name: str, is_dir: int, size: int, mtime: str, permissions: str) -> FileInfo:
+        return FileInfo(
+            name=name,
+            path=name,
+            size=format_size(size) if not is_dir or size else "",
+            permissions=permissions,
+            modified=mtime,
+            is_dir=bool(is_dir),
+            size_bytes=size
+        )
+
@@ -0,0 +1,98 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+
+from tracing import CommandTracer
+from utils import format_size
+
+POLL_MS = 1000
+RECENT_LIMIT = 200
+
+
+class DiagnosticsWindow:
+    def __init__(self, parent, tracer: CommandTracer):
+        self.tracer = tracer
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Диагностика adb")
+        self.window.geometry("950x600")
+
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+        self.enabled = tk.BooleanVar(value=tracer.enabled)
+        ttk.Checkbutton(controls, text="Записывать вызовы adb", variable=self.enabled,
+                        command=self._toggle).pack(side=tk.LEFT)
+        ttk.Button(controls, text="💾 Экспорт (Chrome trace)", command=self._export).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(controls, text="🗑️ Очистить", command=self._clear).pack(side=tk.RIGHT, padx=2)
+
+        paned = ttk.PanedWindow(self.window, orient=tk.VERTICAL)
+        paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+
+        self.stats = ttk.Treeview(paned, columns=("count", "p50", "p95", "max", "fallbacks", "errors", "bytes"),
+                                  height=8)
+        self.stats.heading("#0", text="Операция")
+        for column, title, width in (("count", "Вызовов", 70), ("p50", "p50, мс", 80), ("p95", "p95, мс", 80),
+                                     ("max", "Макс., мс", 80), ("fallbacks", "Повторы", 70),
+                                     ("errors", "Ошибки", 70), ("bytes", "Данные", 90)):
+            self.stats.heading(column, text=title)
+            self.stats.column(column, width=width, anchor="e")
+        self.stats.column("#0", width=200)
+        paned.add(self.stats, weight=1)
+
+        self.recent = ttk.Treeview(paned, columns=("device", "duration", "code"))
+        self.recent.heading("#0", text="Команда")
+        self.recent.heading("device", text="Устройство")
+        self.recent.heading("duration", text="мс")
+        self.recent.heading("code", text="Код")
+        self.recent.column("#0", width=550)
+        self.recent.column("device", width=150)
+        self.recent.column("duration", width=80, anchor="e")
+        self.recent.column("code", width=50, anchor="e")
+        paned.add(self.recent, weight=2)
+
+        self._refresh()
+
+    def _toggle(self):
+        self.tracer.enabled = self.enabled.get()
+
+    def _clear(self):
+        self.tracer.clear()
+        self._render()
+
+    def _export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.window,
+            defaultextension=".json",
+            initialfile="adb-trace.json",
+            filetypes=[("Trace JSON", "*.json")]
+        )
+        if not path:
+            return
+        try:
+            self.tracer.export_chrome(path)
+        except OSError as e:
+            messagebox.showerror("Ошибка", f"Не удалось сохранить трассу: {e}", parent=self.window)
+
+    def _refresh(self):
+        if not self.window.winfo_exists():
+            return
+        self._render()
+        self.window.after(POLL_MS, self._refresh)
+
+    def _render(self):
+        self.stats.delete(*self.stats.get_children())
+        for row in self.tracer.stats():
+            self.stats.insert("", tk.END, text=row["op"], values=(
+                row["count"],
+                f"{row['p50_ms']:.1f}",
+                f"{row['p95_ms']:.1f}",
+                f"{row['max_ms']:.1f}",
+                row["fallbacks"],
+                row["errors"],
+                format_size(row["bytes_in"] + row["bytes_out"])
+            ))
+
+        self.recent.delete(*self.recent.get_children())
+        for event in reversed(self.tracer.events()[-RECENT_LIMIT:]):
+            code = "" if event.returncode is None else event.returncode
+            self.recent.insert("", tk.END, text=event.command,
+                               values=(event.device, f"{event.duration * 1000:.1f}", code))
@@ -4,6 +4,8 @@ from typing import Callable, List, Tuple, Optional
 
 from models import FileInfo
 
+PLACEHOLDER_TAG = "placeholder"
+
 
 class FileTreeView:
     def __init__(
@@ -15,11 +17,15 @@ class FileTreeView:
     ):
         self.tree: Optional[ttk.Treeview] = None
         self.path_label: Optional[ttk.Label] = None
+        self.header: Optional[ttk.Frame] = None
+        self.thumbnail_mode = False
+        self._images = {}
         self._setup_ui(parent, title, on_double_click, on_context_menu)
 
     def _setup_ui(self, parent, title, on_double_click, on_context_menu):
         header = ttk.Frame(parent)
         header.pack(fill=tk.X, pady=(0, 5))
+        self.header = header
         ttk.Label(header, text=title, font=('Arial', 10, 'bold')).pack(side=tk.LEFT)
         ttk.Button(
             header,
@@ -71,19 +77,31 @@ class FileTreeView:
     def clear(self):
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self._images.clear()
 
     def add_parent_item(self):
         self.tree.insert("", 0, text="📁 ..", values=("", ""), tags=("parent", "dir"))
 
-    def add_file(self, file_info: FileInfo, tag_data: str):
-        self.tree.insert(
-            "",
+    def add_file(self, file_info: FileInfo, tag_data: str, parent: str = "") -> str:
+        return self.tree.insert(
+            parent,
             tk.END,
             text=file_info.display_name,
             values=(file_info.size, file_info.permissions or file_info.modified),
             tags=("dir" if file_info.is_dir else "file", tag_data)
         )
 
+    def add_placeholder(self, item: str):
+        """Заглушка, чтобы у папки появилась стрелка раскрытия до загрузки содержимого."""
+        self.tree.insert(item, tk.END, text="⏳ Загрузка...", tags=(PLACEHOLDER_TAG,))
+
+    def is_unloaded(self, item: str) -> bool:
+        children = self.tree.get_children(item)
+        return len(children) == 1 and PLACEHOLDER_TAG in self.tree.item(children[0], "tags")
+
+    def clear_children(self, item: str):
+        self.tree.delete(*self.tree.get_children(item))
+
     def get_selection(self) -> List[Tuple[str, str]]:
         items = []
         for item in self.tree.selection():
@@ -93,4 +111,36 @@ class FileTreeView:
         return items
 
     def get_item_text(self, item) -> str:
-        return self.tree.item(item)['text']
\ No newline at end of file
+        return self.tree.item(item)['text']
+
+    def set_thumbnail_mode(self, enabled: bool, size: int):
+        self.thumbnail_mode = enabled
+        style = ttk.Style()
+        if enabled:
+            style.configure("Thumbnails.Treeview", rowheight=size + 4)
+            self.tree.configure(style="Thumbnails.Treeview")
+        else:
+            self.tree.configure(style="Treeview")
+
+    def visible_items(self) -> List[str]:
+        items = []
+        height = self.tree.winfo_height()
+        y = 1
+        last = None
+        while y < height:
+            item = self.tree.identify_row(y)
+            if not item:
+                break
+            if item != last:
+                items.append(item)
+                last = item
+            bbox = self.tree.bbox(item)
+            y += bbox[3] if bbox else 20
+        return items
+
+    def set_item_image(self, item: str, png_data: bytes):
+        if not self.tree.exists(item):
+            return
+        image = tk.PhotoImage(data=png_data)
+        self._images[item] = image
+        self.tree.item(item, image=image)
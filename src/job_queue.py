@@ -0,0 +1,205 @@
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+INTERACTIVE, NORMAL, BULK = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: "интерактивная", NORMAL: "обычная", BULK: "фоновая"}
+STATE_NAMES = {
+    "queued": "в очереди",
+    "running": "выполняется",
+    "paused": "пауза",
+    "done": "готово",
+    "failed": "ошибка",
+    "cancelled": "отменено",
+}
+HISTORY_LIMIT = 200
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    """Флаги отмены и паузы, которые задача проверяет в своих контрольных точках."""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def proceed(self) -> bool:
+        """Ждёт снятия паузы; False, если задачу отменили."""
+        self._running.wait()
+        return not self.cancelled
+
+    def checkpoint(self):
+        if not self.proceed():
+            raise JobCancelled()
+
+
+@dataclass
+class Job:
+    id: int
+    serial: str
+    title: str
+    priority: int
+    func: Callable[[CancelToken], None]
+    token: CancelToken = field(default_factory=CancelToken)
+    state: str = "queued"
+    error: str = ""
+    created: float = field(default_factory=time.time)
+    started: float = 0.0
+    finished: float = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.state in ("queued", "running", "paused")
+
+
+class JobQueue:
+    """Очереди задач по устройствам.
+
+    У каждого устройства три полосы, по одной на приоритет: интерактивная (списки
+    файлов, переименование), обычная (удаление, действия с приложениями, информация
+    об устройстве) и фоновая (передачи). Поэтому ни навигация, ни короткие действия
+    не ждут, пока закончится большая передача.
+    """
+
+    def __init__(self):
+        self._lock = threading.Condition()
+        self._ids = itertools.count(1)
+        self._pending: Dict[Tuple[str, str], List[tuple]] = {}
+        self._workers: Dict[Tuple[str, str], threading.Thread] = {}
+        self._jobs: List[Job] = []
+
+    @staticmethod
+    def _lane(priority: int) -> str:
+        return {INTERACTIVE: "interactive", NORMAL: "normal"}.get(priority, "bulk")
+
+    def submit(self, serial: str, title: str, func: Callable[[CancelToken], None],
+               priority: int = NORMAL) -> Job:
+        with self._lock:
+            job = Job(next(self._ids), serial or "", title, priority, func)
+            key = (job.serial, self._lane(priority))
+            heapq.heappush(self._pending.setdefault(key, []), (priority, job.id, job))
+            self._jobs.append(job)
+            self._trim_history()
+            if key not in self._workers:
+                worker = threading.Thread(target=self._work, args=(key,), daemon=True)
+                self._workers[key] = worker
+                worker.start()
+            self._lock.notify_all()
+        return job
+
+    def cancel(self, job: Job):
+        with self._lock:
+            job.token.cancel()
+            if not job.started and not job.finished:
+                self._finish(job, "cancelled")
+            self._lock.notify_all()
+
+    def pause(self, job: Job):
+        with self._lock:
+            if job.active:
+                job.token.pause()
+                job.state = "paused"
+
+    def resume(self, job: Job):
+        with self._lock:
+            if job.state == "paused":
+                job.token.resume()
+                job.state = "running" if job.started else "queued"
+                self._lock.notify_all()
+
+    def cancel_device(self, serial: str):
+        for job in self.jobs():
+            if job.serial == serial and job.active:
+                self.cancel(job)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs)
+
+    def find(self, job_id: int) -> Optional[Job]:
+        with self._lock:
+            for job in self._jobs:
+                if job.id == job_id:
+                    return job
+        return None
+
+    def clear_finished(self):
+        with self._lock:
+            self._jobs = [job for job in self._jobs if job.active]
+
+    def _trim_history(self):
+        finished = [job for job in self._jobs if not job.active]
+        excess = len(finished) - HISTORY_LIMIT
+        if excess > 0:
+            drop = set(id(job) for job in finished[:excess])
+            self._jobs = [job for job in self._jobs if id(job) not in drop]
+
+    def _finish(self, job: Job, state: str, error: str = ""):
+        job.state = state
+        job.error = error
+        job.finished = time.time()
+
+    def _next(self, key: Tuple[str, str]) -> Job:
+        with self._lock:
+            while True:
+                heap = self._pending.get(key, [])
+                # Отменённые выбрасываем, приостановленные в очереди пропускаем
+                ready = None
+                for entry in sorted(heap):
+                    job = entry[2]
+                    if job.token.cancelled:
+                        heap.remove(entry)
+                        if not job.finished:
+                            self._finish(job, "cancelled")
+                    elif not job.token.paused:
+                        ready = entry
+                        break
+                if ready:
+                    heap.remove(ready)
+                    heapq.heapify(heap)
+                    job = ready[2]
+                    job.state = "running"
+                    job.started = time.time()
+                    return job
+                heapq.heapify(heap)
+                self._lock.wait()
+
+    def _work(self, key: Tuple[str, str]):
+        while True:
+            job = self._next(key)
+            try:
+                job.func(job.token)
+            except JobCancelled:
+                state, error = "cancelled", ""
+            except Exception as e:
+                state, error = "failed", str(e)
+            else:
+                state, error = ("cancelled" if job.token.cancelled else "done"), ""
+            with self._lock:
+                self._finish(job, state, error)
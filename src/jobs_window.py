@@ -0,0 +1,86 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Optional
+
+from job_queue import PRIORITY_NAMES, STATE_NAMES, Job, JobQueue
+
+POLL_MS = 500
+
+
+class JobsWindow:
+    def __init__(self, parent, queue: JobQueue):
+        self.queue = queue
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Задачи")
+        self.window.geometry("800x400")
+
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+        ttk.Button(controls, text="⏸ Пауза", command=lambda: self._act(self.queue.pause)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="▶ Продолжить", command=lambda: self._act(self.queue.resume)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="⏹ Отменить", command=lambda: self._act(self.queue.cancel)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="🧹 Убрать завершённые", command=self._clear).pack(side=tk.RIGHT, padx=2)
+
+        frame = ttk.Frame(self.window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        scrollbar = ttk.Scrollbar(frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(frame, columns=("device", "priority", "state", "time"),
+                                 yscrollcommand=scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree.yview)
+        self.tree.heading("#0", text="Задача")
+        self.tree.heading("device", text="Устройство")
+        self.tree.heading("priority", text="Приоритет")
+        self.tree.heading("state", text="Состояние")
+        self.tree.heading("time", text="Время")
+        self.tree.column("#0", width=330)
+        self.tree.column("device", width=150)
+        self.tree.column("priority", width=110)
+        self.tree.column("state", width=110)
+        self.tree.column("time", width=70, anchor="e")
+
+        self._refresh()
+
+    def _selected(self) -> Optional[Job]:
+        selection = self.tree.selection()
+        return self.queue.find(int(selection[0])) if selection else None
+
+    def _act(self, action):
+        job = self._selected()
+        if job:
+            action(job)
+            self._render()
+
+    def _clear(self):
+        self.queue.clear_finished()
+        self._render()
+
+    def _refresh(self):
+        if not self.window.winfo_exists():
+            return
+        self._render()
+        self.window.after(POLL_MS, self._refresh)
+
+    def _render(self):
+        now = time.time()
+        jobs = self.queue.jobs()
+        known = set(self.tree.get_children())
+        for job in jobs:
+            item = str(job.id)
+            elapsed = ""
+            if job.started:
+                elapsed = f"{(job.finished or now) - job.started:.0f} с"
+            state = STATE_NAMES.get(job.state, job.state)
+            if job.error:
+                state = f"{state}: {job.error}"
+            values = (job.serial, PRIORITY_NAMES.get(job.priority, ""), state, elapsed)
+            if item in known:
+                self.tree.item(item, values=values)
+                known.discard(item)
+            else:
+                self.tree.insert("", 0, iid=item, text=job.title, values=values)
+        for item in known:
+            self.tree.delete(item)
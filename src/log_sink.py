@@ -0,0 +1,73 @@
+import threading
+import tkinter as tk
+from collections import deque
+from typing import Optional
+
+from config import Config
+
+
+class LogSink:
+    """Буфер лога: пишут любые потоки, в Text попадает пачками раз в кадр."""
+
+    def __init__(self, root: tk.Misc, widget: tk.Text,
+                 max_lines: int = Config.LOG_MAX_LINES, interval_ms: int = Config.LOG_FLUSH_MS):
+        self.root = root
+        self.widget = widget
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self._pending = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._lines = 0
+        self.root.after(self.interval_ms, self._drain)
+
+    def write(self, message: str, tag: Optional[str] = None):
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                # Всё равно было бы обрезано кольцевым буфером виджета
+                self._dropped += 1
+            self._pending.append((message, tag))
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._dropped = 0
+        self.widget.delete(1.0, tk.END)
+        self._lines = 0
+
+    def _drain(self):
+        try:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+                dropped, self._dropped = self._dropped, 0
+            if batch or dropped:
+                self._insert(batch, dropped)
+        finally:
+            self.root.after(self.interval_ms, self._drain)
+
+    def _insert(self, batch, dropped: int):
+        at_bottom = self.widget.yview()[1] >= 0.999
+        args = []
+        if dropped:
+            args.extend((f"… пропущено строк: {dropped}\n", ("warning",)))
+        # Соседние строки с одинаковым тегом вставляются одним куском
+        chunk, chunk_tag = [], None
+        for message, tag in batch:
+            if chunk and tag != chunk_tag:
+                args.extend(("".join(chunk), (chunk_tag,) if chunk_tag else ()))
+                chunk = []
+            chunk.append(message + "\n")
+            chunk_tag = tag
+        if chunk:
+            args.extend(("".join(chunk), (chunk_tag,) if chunk_tag else ()))
+        self.widget.insert(tk.END, *args)
+
+        # Считаем строки текста, а не сообщения: удаление ниже идёт по строкам виджета
+        self._lines += sum(message.count("\n") + 1 for message, _ in batch) + (1 if dropped else 0)
+        if self._lines > self.max_lines:
+            excess = self._lines - self.max_lines
+            self.widget.delete("1.0", f"{excess + 1}.0")
+            self._lines = self.max_lines
+        if at_bottom:
+            self.widget.see(tk.END)
@@ -0,0 +1,135 @@
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import List, NamedTuple, Optional, Set
+
+from config import Config
+from tracing import TRACER
+
+LEVELS = "VDIWEF"
+
+THREADTIME_RE = re.compile(
+    r'^(\d\d-\d\d)\s+(\d\d:\d\d:\d\d\.\d+)\s+(\d+)\s+(\d+)\s+([VDIWEFS])\s+(.*?)\s*: ?(.*)$'
+)
+
+
+class LogcatEntry(NamedTuple):
+    time: str
+    pid: int
+    tid: int
+    level: str
+    tag: str
+    message: str
+    raw: str
+
+
+def parse_threadtime(line: str) -> Optional[LogcatEntry]:
+    match = THREADTIME_RE.match(line)
+    if not match:
+        return None
+    date, clock, pid, tid, level, tag, message = match.groups()
+    return LogcatEntry(f"{date} {clock}", int(pid), int(tid), level, tag, message, line)
+
+
+class LogcatFilter:
+    def __init__(self, min_level: str = "V", tags: str = "", pid: str = ""):
+        self.min_index = LEVELS.index(min_level) if min_level in LEVELS else 0
+        self.include: Set[str] = set()
+        self.exclude: Set[str] = set()
+        for tag in (t.strip() for t in tags.split(",")):
+            if tag.startswith("-") and len(tag) > 1:
+                self.exclude.add(tag[1:])
+            elif tag:
+                self.include.add(tag)
+        self.pid = int(pid) if pid.strip().isdigit() else None
+
+    def matches(self, entry: LogcatEntry) -> bool:
+        if entry.level in LEVELS and LEVELS.index(entry.level) < self.min_index:
+            return False
+        if self.pid is not None and entry.pid != self.pid:
+            return False
+        if self.include and entry.tag not in self.include:
+            return False
+        return entry.tag not in self.exclude
+
+
+class LogcatStream:
+    """Чтение `adb logcat -v threadtime` в фоне в кольцевой буфер фиксированного размера."""
+
+    def __init__(self, serial: str, max_entries: int = Config.LOGCAT_MAX_ENTRIES):
+        self.serial = serial
+        self.buffer = deque(maxlen=max_entries)
+        self._new: List[LogcatEntry] = []
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self.received = 0
+
+    @property
+    def running(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self):
+        if self.running:
+            return
+        args = ["-s", self.serial, "logcat", "-v", "threadtime", "-T", "500"]
+        started = time.perf_counter()
+        try:
+            self._proc = subprocess.Popen(
+                ["adb", *args],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding='utf-8',
+                errors='replace'
+            )
+        except OSError:
+            if TRACER.enabled:
+                TRACER.record(args, started, None, op="logcat")
+            raise
+        threading.Thread(target=self._read, args=(self._proc, args, started), daemon=True).start()
+
+    def stop(self):
+        if self.running:
+            self._proc.terminate()
+        self._proc = None
+
+    def clear(self):
+        with self._lock:
+            self.buffer.clear()
+            self._new.clear()
+
+    def take_new(self) -> List[LogcatEntry]:
+        with self._lock:
+            new, self._new = self._new, []
+        return new
+
+    def snapshot(self) -> List[LogcatEntry]:
+        with self._lock:
+            return list(self.buffer)
+
+    def search(self, pattern: str, flt: Optional[LogcatFilter] = None) -> List[LogcatEntry]:
+        regex = re.compile(pattern, re.IGNORECASE)
+        return [e for e in self.snapshot()
+                if (flt is None or flt.matches(e)) and regex.search(e.raw)]
+
+    def _read(self, proc: subprocess.Popen, args: List[str], started: float):
+        received = 0
+        for line in proc.stdout:
+            received += len(line)
+            entry = parse_threadtime(line.rstrip("\n"))
+            if entry is None:
+                continue
+            with self._lock:
+                self.buffer.append(entry)
+                self._new.append(entry)
+                if len(self._new) > self.buffer.maxlen:
+                    del self._new[:len(self._new) - self.buffer.maxlen]
+                self.received += 1
+        proc.wait()
+        if TRACER.enabled:
+            # Остановка из окна — штатное завершение, а не ошибка
+            returncode = proc.returncode if self._proc is proc else 0
+            TRACER.record(args, started, returncode, bytes_out=received, op="logcat")
@@ -0,0 +1,172 @@
+import re
+import tkinter as tk
+from tkinter import ttk
+from typing import List
+
+from config import Config
+from logcat import LEVELS, LogcatEntry, LogcatFilter, LogcatStream
+
+LEVEL_COLORS = {"V": "gray", "D": "blue", "I": "green", "W": "orange", "E": "red", "F": "red"}
+POLL_MS = 100
+
+
+class LogcatWindow:
+    def __init__(self, parent, serial: str):
+        self.parent = parent
+        self.stream = LogcatStream(serial)
+        self.filter = LogcatFilter()
+        self.paused = False
+        self.search_mode = False
+        self._visible = 0
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Logcat — {serial}")
+        self.window.geometry("1000x600")
+        self.window.protocol("WM_DELETE_WINDOW", self._close)
+
+        self._setup_ui()
+        self.stream.start()
+        self.window.after(POLL_MS, self._poll)
+
+    def _setup_ui(self):
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+
+        ttk.Label(controls, text="Уровень:").pack(side=tk.LEFT)
+        self.level = ttk.Combobox(controls, values=list(LEVELS), state="readonly", width=3)
+        self.level.current(0)
+        self.level.pack(side=tk.LEFT, padx=(2, 8))
+        self.level.bind("<<ComboboxSelected>>", lambda e: self._apply_filter())
+
+        ttk.Label(controls, text="Теги:").pack(side=tk.LEFT)
+        self.tags = ttk.Entry(controls, width=22)
+        self.tags.pack(side=tk.LEFT, padx=(2, 8))
+        self.tags.bind("<Return>", lambda e: self._apply_filter())
+
+        ttk.Label(controls, text="PID:").pack(side=tk.LEFT)
+        self.pid = ttk.Entry(controls, width=7)
+        self.pid.pack(side=tk.LEFT, padx=(2, 8))
+        self.pid.bind("<Return>", lambda e: self._apply_filter())
+
+        ttk.Button(controls, text="Применить", command=self._apply_filter).pack(side=tk.LEFT)
+
+        self.pause_button = ttk.Button(controls, text="⏸ Пауза", command=self._toggle_pause)
+        self.pause_button.pack(side=tk.RIGHT, padx=2)
+        ttk.Button(controls, text="🗑️ Очистить", command=self._clear).pack(side=tk.RIGHT, padx=2)
+
+        search_frame = ttk.Frame(self.window, padding=(5, 0, 5, 5))
+        search_frame.pack(fill=tk.X)
+        ttk.Label(search_frame, text="Поиск (regex):").pack(side=tk.LEFT)
+        self.search = ttk.Entry(search_frame)
+        self.search.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search.bind("<Return>", lambda e: self._run_search())
+        ttk.Button(search_frame, text="🔍 Найти", command=self._run_search).pack(side=tk.LEFT, padx=2)
+        ttk.Button(search_frame, text="✖ Сброс", command=self._reset_search).pack(side=tk.LEFT, padx=2)
+
+        text_frame = ttk.Frame(self.window)
+        text_frame.pack(fill=tk.BOTH, expand=True)
+        scrollbar = ttk.Scrollbar(text_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(text_frame, wrap=tk.NONE, yscrollcommand=scrollbar.set, font=("Monospace", 9))
+        self.text.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.text.yview)
+        for level, color in LEVEL_COLORS.items():
+            self.text.tag_configure(level, foreground=color)
+        self.text.tag_configure("match", background="yellow")
+
+        self.status = ttk.Label(self.window, text="", padding="2")
+        self.status.pack(fill=tk.X)
+
+    def _poll(self):
+        if not self.window.winfo_exists():
+            return
+        new = self.stream.take_new()
+        if new and not self.paused and not self.search_mode:
+            self._append([e for e in new if self.filter.matches(e)])
+        state = "идёт" if self.stream.running else "остановлен"
+        self.status.config(text=f"Logcat {state} | получено: {self.stream.received} | "
+                                f"в буфере: {len(self.stream.buffer)} | показано: {self._visible}")
+        self.window.after(POLL_MS, self._poll)
+
+    def _append(self, entries: List[LogcatEntry]):
+        if not entries:
+            return
+        # При всплеске в виджет попадает только хвост, остальное остаётся в буфере для поиска
+        entries = entries[-Config.LOGCAT_VISIBLE_LINES:]
+        at_bottom = self.text.yview()[1] >= 0.999
+        args = []
+        chunk, chunk_level = [], None
+        for entry in entries:
+            if chunk and entry.level != chunk_level:
+                args.extend(("".join(chunk), (chunk_level,)))
+                chunk = []
+            chunk.append(entry.raw + "\n")
+            chunk_level = entry.level
+        args.extend(("".join(chunk), (chunk_level,)))
+        self.text.insert(tk.END, *args)
+
+        self._visible += len(entries)
+        if self._visible > Config.LOGCAT_VISIBLE_LINES:
+            excess = self._visible - Config.LOGCAT_VISIBLE_LINES
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self._visible = Config.LOGCAT_VISIBLE_LINES
+        if at_bottom:
+            self.text.see(tk.END)
+
+    def _render(self, entries: List[LogcatEntry]):
+        self.text.delete("1.0", tk.END)
+        self._visible = 0
+        self._append(entries)
+        self.text.see(tk.END)
+
+    def _apply_filter(self):
+        self.filter = LogcatFilter(self.level.get(), self.tags.get(), self.pid.get())
+        if self.search_mode:
+            self._run_search()
+        else:
+            self._render([e for e in self.stream.snapshot() if self.filter.matches(e)])
+
+    def _run_search(self):
+        pattern = self.search.get()
+        if not pattern:
+            self._reset_search()
+            return
+        try:
+            results = self.stream.search(pattern, self.filter)
+        except re.error as e:
+            self.status.config(text=f"Ошибка в регулярном выражении: {e}")
+            return
+        self.search_mode = True
+        self._render(results)
+        self._highlight(pattern)
+
+    def _highlight(self, pattern: str):
+        count = tk.IntVar()
+        start = "1.0"
+        while True:
+            pos = self.text.search(pattern, start, tk.END, regexp=True, nocase=True, count=count)
+            if not pos or not count.get():
+                break
+            end = f"{pos}+{count.get()}c"
+            self.text.tag_add("match", pos, end)
+            start = end
+
+    def _reset_search(self):
+        self.search_mode = False
+        self.search.delete(0, tk.END)
+        self._apply_filter()
+
+    def _toggle_pause(self):
+        self.paused = not self.paused
+        self.pause_button.config(text="▶ Продолжить" if self.paused else "⏸ Пауза")
+        if not self.paused:
+            self._apply_filter()
+
+    def _clear(self):
+        self.stream.clear()
+        self.text.delete("1.0", tk.END)
+        self._visible = 0
+
+    def _close(self):
+        self.stream.stop()
+        self.window.destroy()
@@ -1,44 +1,93 @@
+import time
+
+_STARTED = time.perf_counter()
+
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import shutil
 import webbrowser
 import subprocess
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-
-import requests
+from dataclasses import replace
 
 from config import Config
 from models import DeviceInfo, FileInfo
-from adb_helper import ADBHelper
+from adb_helper import ADBHelper, CommandHandle
+from apk_extract import ApkExtractor
+from capture import ScreenCapture
+from capture_window import CaptureWindow
+from connection_manager import ConnectionManager
+from connection_window import ConnectionWindow
+from dedupe import DuplicateFinder
+from dedupe_window import DedupeWindow
+from diagnostics_window import DiagnosticsWindow
+from device_store import DeviceStore
 from file_tree_view import FileTreeView
 from info_window import InfoWindow
-from utils import normalize_android_path, format_size
+from job_queue import BULK, INTERACTIVE, NORMAL, CancelToken, Job, JobQueue
+from jobs_window import JobsWindow
+from log_sink import LogSink
+from logcat_window import LogcatWindow
+from packages_window import PackagesWindow
+from prefetch import COMMON_FOLDERS, ListingPrefetcher
+from preview_window import PreviewWindow
+from scrcpy_supervisor import ScrcpySupervisor
+from scrcpy_window import ScrcpyWindow
+from progress import ProgressModel, ProgressPanel, ProgressTask
+from telemetry import TelemetrySampler
+from telemetry_window import TelemetryWindow
+from thumbnails import ThumbnailCache, ThumbnailLoader, has_thumbnail
+from tracing import TRACER
+from transfer import TransferEngine, TransferJob
+from utils import StartupTimer, normalize_android_path, format_size
 
 
 class ADBFileManager:
     def __init__(self, root):
+        self.startup = StartupTimer(_STARTED)
         self.root = root
         self.root.title("ADB File Manager")
         self.root.geometry(Config.WINDOW_SIZE)
 
         self.adb = ADBHelper()
+        self.adb.store = DeviceStore()
+        self.adb.on_root_lost = lambda serial: self.root.after(0, lambda: self._on_root_lost(serial))
+        self.connections = ConnectionManager()
+        self.transfers = TransferEngine(self.adb, self.connections)
+        self.jobs = JobQueue()
+        self.prefetcher = ListingPrefetcher(self.adb, self.jobs)
+        self.telemetry = TelemetrySampler(self.connections.client)
+        self.capture = ScreenCapture(self.connections.client)
+        self.scrcpy = ScrcpySupervisor(self.connections.client)
+        self.scrcpy.on_event = lambda serial, message: self.root.after(
+            0, lambda: self.log(f"🖥️ Scrcpy {serial}: {message}", "info"))
+        self._listing_job: Optional[Job] = None
+        self._info_job: Optional[Job] = None
         self.current_android_path = Config.ANDROID_HOME
         self.current_local_path = str(Path.home())
         self.device_info = DeviceInfo()
-
-        if not self.adb.check_adb():
-            messagebox.showerror("Ошибка", Config.Messages.NO_ADB)
-            self.root.quit()
-            return
+        self.android_clipboard: Optional[Tuple[str, List[str]]] = None
+        self.running_commands: List[CommandHandle] = []
+        self.android_items: Dict[str, FileInfo] = {}
+        self.thumbnail_loader = ThumbnailLoader(self.adb)
+        self.duplicate_finder = DuplicateFinder(self.adb, self.adb.store)
+        self._hovered_item = ""
+        self._thumbnail_view_state = None
 
         self._setup_ui()
+        self.startup.mark("интерфейс")
+        # Окно показываем сразу, adb и устройства опрашиваются в фоне
+        self.root.after_idle(lambda: self.startup.mark("окно"))
         self._connect_device()
-        self._check_for_updates()
+        self.root.after(3000, self._check_for_updates)
         self._start_device_info_updater()
+        self.telemetry.start()
+        self.root.after(Config.PREFETCH_IDLE_MS, self._prefetch_tick)
 
     def _setup_ui(self):
         top_frame = ttk.Frame(self.root, padding="10")
@@ -49,7 +98,7 @@ class ADBFileManager:
 
         self.device_info_label = ttk.Label(
             info_frame,
-            text="Устройство: не подключено",
+            text="📱 Поиск устройств...",
             wraplength=800
         )
         self.device_info_label.pack(side=tk.LEFT, padx=5)
@@ -60,6 +109,49 @@ class ADBFileManager:
             command=self._show_info_window
         ).pack(side=tk.RIGHT, padx=5)
 
+        ttk.Button(
+            info_frame,
+            text="📈 Телеметрия",
+            command=lambda: TelemetryWindow(self.root, self.telemetry)
+        ).pack(side=tk.RIGHT, padx=5)
+
+        ttk.Button(
+            info_frame,
+            text="📊 Диагностика",
+            command=lambda: DiagnosticsWindow(self.root, TRACER)
+        ).pack(side=tk.RIGHT, padx=5)
+
+        ttk.Button(
+            info_frame,
+            text="📋 Задачи",
+            command=lambda: JobsWindow(self.root, self.jobs)
+        ).pack(side=tk.RIGHT, padx=5)
+
+        ttk.Button(
+            info_frame,
+            text="📷 Экран",
+            command=lambda: CaptureWindow(self.root, self.capture, self.adb.device, self.jobs,
+                                          self.log, self.progress)
+        ).pack(side=tk.RIGHT, padx=5)
+
+        ttk.Button(
+            info_frame,
+            text="📦 Приложения",
+            command=self._show_packages_window
+        ).pack(side=tk.RIGHT, padx=5)
+
+        ttk.Button(
+            info_frame,
+            text="🐞 Logcat",
+            command=self._show_logcat_window
+        ).pack(side=tk.RIGHT, padx=5)
+
+        ttk.Button(
+            info_frame,
+            text="📶 Wi-Fi",
+            command=self._show_connection_window
+        ).pack(side=tk.RIGHT, padx=5)
+
         ttk.Button(
             info_frame,
             text="🖥️ Scrcpy",
@@ -99,8 +191,39 @@ class ADBFileManager:
             self._show_android_context_menu
         )
         self.android_view.path_label.config(text=self.current_android_path)
+        self.android_view.tree.bind("<Control-c>", lambda e: self._android_copy(cut=False))
+        self.android_view.tree.bind("<Control-x>", lambda e: self._android_copy(cut=True))
+        self.android_view.tree.bind("<Control-v>", lambda e: self._android_paste())
+        self.android_view.tree.bind("<<TreeviewOpen>>", self._on_android_expand)
+        self.android_view.tree.bind("<<TreeviewSelect>>", lambda e: self._prefetch_item(self.android_view.tree.focus()))
+        self.android_view.tree.bind("<Motion>", self._on_android_hover)
+
+        self.root_mode_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.android_view.header,
+            text="# Root",
+            variable=self.root_mode_var,
+            command=self._toggle_root_mode
+        ).pack(side=tk.RIGHT)
 
-        self._setup_progress_bar(main_frame)
+        self.tree_mode_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.android_view.header,
+            text="🌲 Дерево",
+            variable=self.tree_mode_var,
+            command=self._load_android_files
+        ).pack(side=tk.RIGHT)
+
+        self.thumbnails_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            self.android_view.header,
+            text="🖼️ Миниатюры",
+            variable=self.thumbnails_var,
+            command=self._toggle_thumbnails
+        ).pack(side=tk.RIGHT)
+
+        self.progress = ProgressModel()
+        self.progress_panel = ProgressPanel(main_frame, self.progress)
 
         bottom_frame = ttk.Frame(self.root, padding="10")
         bottom_frame.pack(fill=tk.BOTH, expand=True)
@@ -118,6 +241,14 @@ class ADBFileManager:
         self.adb_command.bind("<FocusIn>", self._on_adb_command_focus_in)
         self.adb_command.bind("<FocusOut>", self._on_adb_command_focus_out)
 
+        self.stop_command_button = ttk.Button(
+            cmd_input_frame,
+            text="⏹ Стоп",
+            command=self._stop_adb_commands,
+            state="disabled"
+        )
+        self.stop_command_button.pack(side=tk.RIGHT, padx=(5, 0))
+
         ttk.Button(
             cmd_input_frame,
             text="Выполнить",
@@ -128,19 +259,6 @@ class ADBFileManager:
 
         self._load_local_files()
 
-    def _setup_progress_bar(self, parent):
-        self.progress_frame = ttk.Frame(parent)
-        self.progress_frame.pack(fill=tk.X, pady=(10, 0))
-
-        self.progress_var = tk.DoubleVar()
-        self.progress_bar = ttk.Progressbar(
-            self.progress_frame,
-            variable=self.progress_var,
-            maximum=100,
-            length=Config.PROGRESS_LENGTH
-        )
-        self.progress_label = ttk.Label(self.progress_frame, text="")
-
     def _setup_log(self, parent):
         log_frame = ttk.LabelFrame(parent, text="Лог операций", padding="5")
         log_frame.pack(fill=tk.BOTH, expand=True)
@@ -188,32 +306,72 @@ class ADBFileManager:
         self.log_text.tag_configure("command", foreground="purple")
 
         self.log_text.bind("<Button-3>", self._show_log_context_menu)
+        self.log_sink = LogSink(self.root, self.log_text)
 
     def _connect_device(self):
+        threading.Thread(target=self._discover_devices_thread, daemon=True).start()
+
+    def _discover_devices_thread(self):
+        if not self.adb.check_adb():
+            self.root.after(0, self._on_adb_missing)
+            return
+        self.startup.mark("adb")
         try:
             devices = self.adb.get_devices()
-            if not devices:
-                messagebox.showwarning("Внимание", Config.Messages.NO_DEVICE)
-                return
+        except Exception as e:
+            self.root.after(0, lambda: self.log(f"✗ Ошибка при подключении: {e}", "error"))
+            return
+        self.startup.mark("устройства")
+        self.root.after(0, lambda: self._on_devices_discovered(devices))
+
+    def _on_adb_missing(self):
+        messagebox.showerror("Ошибка", Config.Messages.NO_ADB)
+        self.root.quit()
+
+    def _on_devices_discovered(self, devices: List[str]):
+        if not devices:
+            self.device_info_label.config(text="Устройство: не подключено")
+            self._report_startup()
+            messagebox.showwarning("Внимание", Config.Messages.NO_DEVICE)
+            return
 
-            if len(devices) == 1:
-                self.adb.device = devices[0]
-            else:
-                self._show_device_selection_dialog(devices)
+        if len(devices) == 1:
+            self.adb.device = devices[0]
+        else:
+            self.device_info_label.config(text="Устройство: не выбрано")
+            self._report_startup()
+            self._show_device_selection_dialog(devices)
 
-            if self.adb.device:
-                self._update_device_info()
-                self.log("✓ Подключено к устройству", "success")
-                self._load_android_files()
+        if self.adb.device:
+            self._update_device_info()
+            self.log("✓ Подключено к устройству", "success")
+            self._load_android_files()
+            threading.Thread(target=self._measure_link, args=(self.adb.device,), daemon=True).start()
 
-        except Exception as e:
-            self.log(f"✗ Ошибка при подключении: {e}", "error")
+    def _report_startup(self):
+        if self.startup.reported:
+            return
+        self.startup.reported = True
+        self.log(f"⏱ Запуск: {self.startup.report()}", "info")
+        if os.environ.get("ADB_FM_STARTUP_REPORT"):
+            print(f"startup: {self.startup.report()}")
 
     def _update_device_info(self):
         if not self.adb.device:
             return
 
-        self.device_info = self.adb.get_device_info()
+        def fetch(token: CancelToken, adb: ADBHelper):
+            info = adb.get_device_info()
+            self.root.after(0, lambda: self._show_device_info(info))
+
+        self._info_job = self._submit("Информация об устройстве", fetch)
+
+    def _show_device_info(self, info: DeviceInfo):
+        if info.serial != self.adb.device:
+            return
+        self.device_info = info
+        self.startup.mark("инфо")
+        self._report_startup()
 
         if self.device_info.battery_status == "зарядка":
             battery_icon = "⚡"
@@ -247,7 +405,8 @@ class ADBFileManager:
 
     def _start_device_info_updater(self):
         def update():
-            if self.adb.device:
+            # Пока прошлый запрос ещё в очереди или выполняется, новый не ставим
+            if self.adb.device and not (self._info_job and self._info_job.active):
                 self._update_device_info()
             self.root.after(30000, update)
 
@@ -265,17 +424,56 @@ class ADBFileManager:
         listbox = tk.Listbox(dialog)
         listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
 
+        states = {}
         for dev in devices:
-            model = self.adb.get_device_model(dev)
-            listbox.insert(tk.END, f"{model} ({dev})")
+            model = self.adb.cached_device_model(dev)
+            listbox.insert(tk.END, f"{model} ({dev})" if model else f"⏳ {dev}")
+
+        def set_row(index: int, text: str):
+            if not dialog.winfo_exists():
+                return
+            selected = listbox.curselection()
+            listbox.delete(index)
+            listbox.insert(index, text)
+            if index in selected:
+                listbox.selection_set(index)
+
+        def resolve():
+            # Один `adb devices -l` отдаёт состояние и модель сразу для всех устройств
+            for serial, state, model in self.adb.get_device_states():
+                states[serial] = state
+            pending = []
+            for index, dev in enumerate(devices):
+                # Пустой ответ — сбой самого запроса: состояние неизвестно, модель спрашиваем у устройства
+                state = states.get(dev, "offline") if states else "device"
+                if state != "device":
+                    self.root.after(0, lambda i=index, d=dev, st=state: set_row(i, f"⚠ {d} ({st})"))
+                elif self.adb.cached_device_model(dev):
+                    self.root.after(0, lambda i=index, d=dev: set_row(
+                        i, f"{self.adb.cached_device_model(d)} ({d})"))
+                else:
+                    pending.append((index, dev))
+            if not pending:
+                return
+            with ThreadPoolExecutor(max_workers=min(8, len(pending))) as pool:
+                futures = {pool.submit(self.adb.get_device_model, dev): (index, dev) for index, dev in pending}
+                for future in as_completed(futures):
+                    index, dev = futures[future]
+                    self.root.after(0, lambda i=index, d=dev, m=future.result(): set_row(i, f"{m} ({d})"))
+
+        threading.Thread(target=resolve, daemon=True).start()
 
         def select():
             selection = listbox.curselection()
             if selection:
+                if states.get(devices[selection[0]], "device") != "device":
+                    messagebox.showwarning("Внимание", "Устройство недоступно (не авторизовано или загружается)")
+                    return
                 self.adb.device = devices[selection[0]]
                 dialog.destroy()
                 self._update_device_info()
                 self._load_android_files()
+                threading.Thread(target=self._measure_link, args=(self.adb.device,), daemon=True).start()
 
         ttk.Button(dialog, text="Выбрать", command=select).pack(pady=10)
 
@@ -322,25 +520,60 @@ class ADBFileManager:
         except Exception as e:
             self.log(f"✗ Ошибка при загрузке локальных файлов: {e}", "error")
 
-    def _load_android_files(self):
+    def _submit(self, title: str, func, priority: int = NORMAL) -> Job:
+        """func(token, adb): adb привязан к устройству, выбранному в момент постановки в очередь."""
+        serial = self.adb.device
+        adb = self.adb.for_device(serial)
+        return self.jobs.submit(serial, title, lambda token: func(token, adb), priority)
+
+    def _load_android_files(self, prefetched: bool = False):
+        """prefetched=True при переходе по папкам: можно взять свежий предзагруженный список.
+        Обновление после операций с файлами всегда идёт на устройство."""
         if not self.adb.device:
             return
-        threading.Thread(target=self._load_android_files_thread, daemon=True).start()
+        self.root_mode_var.set(self.adb.root_mode)
+        # Подпапки прошлого вида больше не нужны; общие папки остаются в очереди
+        self.prefetcher.reset(self.adb.device, keep=tuple(self._common_folders()))
+        if prefetched:
+            files = self.prefetcher.take(self.adb.device, self.current_android_path)
+            if files is not None:
+                self._update_android_tree(files)
+                self._want_common_folders()
+                return
+        else:
+            self.prefetcher.invalidate(self.adb.device)
+        # Устаревший запрос списка, который ещё не начался, больше не нужен
+        if self._listing_job and not self._listing_job.started:
+            self.jobs.cancel(self._listing_job)
+        current_path = self.current_android_path
+        self._listing_job = self._submit(
+            f"Список {current_path}",
+            lambda token, adb: self._load_android_files_thread(adb, current_path),
+            INTERACTIVE
+        )
+        self._want_common_folders()
 
-    def _load_android_files_thread(self):
+    def _load_android_files_thread(self, adb: ADBHelper, current_path: str):
         try:
-            current_path = self.current_android_path
+            serial = adb.device
             self.root.after(0, lambda: self.log(f"📂 Загрузка файлов из {current_path}...", "info"))
 
-            if not self.adb.check_directory_access(current_path):
+            if not adb.check_directory_access(current_path):
                 self.root.after(0, lambda: self.log(f"⚠ Нет доступа к {current_path}", "warning"))
                 self.root.after(0, lambda: self._update_android_tree([]))
                 return
 
-            files = self.adb.list_files(current_path)
+            # Сначала показываем сохранённый список, затем обновляем его с устройства
+            cached = adb.cached_listing(current_path)
+            if cached:
+                self.root.after(0, lambda: self._update_android_tree(cached))
+
+            files = adb.list_files(current_path)
             files = [f for f in files if f.name and f.name.strip()]
+            self.prefetcher.store(serial, current_path, files)
 
-            self.root.after(0, lambda: self._update_android_tree(files))
+            if not cached or self._listing_changed(cached, files):
+                self.root.after(0, lambda: self._update_android_tree(files))
 
             if not files:
                 self.root.after(0, lambda: self.log("⚠ Папка пуста или нет доступа", "warning"))
@@ -353,14 +586,25 @@ class ADBFileManager:
             self.root.after(0, lambda: self.log(f"✗ Ошибка при загрузке Android файлов: {e}", "error"))
             self.root.after(0, lambda: self._update_android_tree([]))
 
+    @staticmethod
+    def _listing_changed(old: List[FileInfo], new: List[FileInfo]) -> bool:
+        def key(f: FileInfo):
+            return f.name, f.is_dir, f.size_bytes, f.modified
+        return sorted(map(key, old)) != sorted(map(key, new))
+
     def _update_android_tree(self, files: List[FileInfo]):
         self.android_view.clear()
         files.sort(key=lambda x: (not x.is_dir, x.name.lower()))
 
+        self.android_items = {}
         for file_info in files:
             if not file_info.name:
                 continue
-            self.android_view.add_file(file_info, file_info.name)
+            item = self.android_view.add_file(file_info, file_info.name)
+            self.android_items[item] = file_info
+            if file_info.is_dir and self.tree_mode_var.get():
+                self.android_view.add_placeholder(item)
+        self._thumbnail_view_state = None
 
         display_path = self.current_android_path
         if len(display_path) > 50:
@@ -369,6 +613,52 @@ class ADBFileManager:
                 display_path = f".../{'/'.join(parts[-3:])}"
         self.android_view.path_label.config(text=display_path)
 
+    def _toggle_thumbnails(self):
+        enabled = self.thumbnails_var.get()
+        if enabled and not self.thumbnail_loader.available():
+            self.thumbnails_var.set(False)
+            messagebox.showwarning("Миниатюры", "Для миниатюр нужен пакет Pillow (python-pillow)")
+            return
+        self.android_view.set_thumbnail_mode(enabled, Config.THUMBNAIL_SIZE)
+        if enabled:
+            self._thumbnail_view_state = None
+            self._poll_visible_thumbnails()
+        else:
+            self.thumbnail_loader.set_wanted(set())
+            self._load_android_files()
+
+    def _poll_visible_thumbnails(self):
+        if not self.thumbnails_var.get():
+            return
+        # Запрашиваем только видимые строки и только когда прокрутка/размер изменились
+        state = (self.android_view.tree.yview(), self.android_view.tree.winfo_height(), len(self.android_items))
+        if state != self._thumbnail_view_state:
+            self._thumbnail_view_state = state
+            self._request_visible_thumbnails()
+        self.root.after(200, self._poll_visible_thumbnails)
+
+    def _request_visible_thumbnails(self):
+        if not self.adb.device:
+            return
+        current = self.current_android_path.rstrip('/')
+        requests_to_send = []
+        for item in self.android_view.visible_items():
+            file_info = self.android_items.get(item)
+            if not file_info or file_info.is_dir or not has_thumbnail(file_info.name):
+                continue
+            if self.android_view.tree.item(item, "image"):
+                continue
+            path = f"{current}/{file_info.name}"
+            key = ThumbnailCache.key(self.adb.device, path, file_info.size_bytes, file_info.modified)
+            requests_to_send.append((key, path, file_info.size_bytes, item))
+
+        self.thumbnail_loader.set_wanted({key for key, _, _, _ in requests_to_send})
+        for key, path, size_bytes, item in requests_to_send:
+            self.thumbnail_loader.request(
+                key, path, size_bytes,
+                lambda _, data, i=item: self.root.after(0, lambda: self.android_view.set_item_image(i, data))
+            )
+
     def _on_local_double_click(self, event):
         if event == "up":
             self._local_navigate_up()
@@ -395,7 +685,7 @@ class ADBFileManager:
                 current = self.current_android_path.rstrip('/')
                 new_path = f"/{folder_name}" if current == "/" else f"{current}/{folder_name}"
                 self.current_android_path = normalize_android_path(new_path)
-                self._load_android_files()
+                self._load_android_files(prefetched=True)
 
     def _local_navigate_up(self):
         parent = os.path.dirname(self.current_local_path)
@@ -408,6 +698,10 @@ class ADBFileManager:
     def _android_navigate_up(self):
         current = self.current_android_path.rstrip('/')
         parent = os.path.dirname(current)
+        if self.adb.root_mode:
+            self.current_android_path = parent or "/"
+            self._load_android_files(prefetched=True)
+            return
         if not parent or parent == current:
             parent = "/storage/emulated/0"
 
@@ -421,12 +715,113 @@ class ADBFileManager:
         else:
             self.current_android_path = parent
 
-        self._load_android_files()
+        self._load_android_files(prefetched=True)
 
     def _android_go_home(self):
         self.current_android_path = Config.ANDROID_HOME
+        self._load_android_files(prefetched=True)
+
+    def _toggle_root_mode(self):
+        if not self.adb.device:
+            self.root_mode_var.set(False)
+            return
+        if not self.root_mode_var.get():
+            self.adb.disable_root()
+            self.prefetcher.invalidate(self.adb.device)
+            if not self.current_android_path.startswith("/storage/emulated/"):
+                self.current_android_path = Config.ANDROID_HOME
+            self.log("Root-режим выключен", "info")
+            self._load_android_files()
+            return
+
+        def enable(token: CancelToken, adb: ADBHelper):
+            granted = adb.enable_root()
+            self.root.after(0, lambda: self._on_root_mode(granted))
+
+        self.log("⏳ Запрос root-доступа (подтвердите на устройстве)...", "info")
+        self._submit("Root-доступ", enable, INTERACTIVE)
+
+    def _on_root_mode(self, granted: bool):
+        self.root_mode_var.set(granted)
+        if granted:
+            self.log("✓ Root-режим включён: доступны /data и корень файловой системы", "success")
+            self.prefetcher.invalidate(self.adb.device)
+            self._load_android_files()
+        else:
+            self.log("✗ Root-доступ не получен: su не найден или запрос отклонён", "error")
+
+    def _on_root_lost(self, serial: str):
+        self.log(f"⚠ Root-доступ на {serial} больше не выдаётся, root-режим выключен", "warning")
+        self.prefetcher.invalidate(serial)
+        if serial != self.adb.device:
+            return
+        self.root_mode_var.set(False)
+        if not self.current_android_path.startswith("/storage/emulated/"):
+            self.current_android_path = Config.ANDROID_HOME
         self._load_android_files()
 
+    def _android_item_path(self, item: str) -> Optional[str]:
+        tags = self.android_view.tree.item(item, "tags") if item else ()
+        if len(tags) < 2 or tags[0] != "dir":
+            return None
+        current = self.current_android_path.rstrip('/')
+        return normalize_android_path(f"{current}/{tags[1]}")
+
+    def _on_android_expand(self, event):
+        item = self.android_view.tree.focus()
+        path = self._android_item_path(item)
+        if not path or not self.android_view.is_unloaded(item):
+            return
+        serial = self.adb.device
+        relative = self.android_view.tree.item(item, "tags")[1]
+        files = self.prefetcher.take(serial, path)
+        if files is not None:
+            self._fill_android_folder(item, relative, files)
+            return
+
+        def load(token: CancelToken, adb: ADBHelper):
+            listed = [f for f in adb.list_files(path) if f.name and f.name.strip()]
+            self.prefetcher.store(serial, path, listed)
+            self.root.after(0, lambda: self._fill_android_folder(item, relative, listed))
+
+        self._submit(f"Список {path}", load, INTERACTIVE)
+
+    def _fill_android_folder(self, item: str, relative: str, files: List[FileInfo]):
+        if not self.android_view.tree.exists(item):
+            return
+        self.android_view.clear_children(item)
+        files.sort(key=lambda x: (not x.is_dir, x.name.lower()))
+        for file_info in files:
+            child = self.android_view.add_file(file_info, f"{relative}/{file_info.name}", parent=item)
+            # Вложенные элементы хранят путь относительно текущей папки, как и их теги
+            self.android_items[child] = replace(file_info, name=f"{relative}/{file_info.name}")
+            if file_info.is_dir:
+                self.android_view.add_placeholder(child)
+        if not files:
+            self.android_view.tree.item(item, open=False)
+
+    def _on_android_hover(self, event):
+        item = self.android_view.tree.identify_row(event.y)
+        if item != self._hovered_item:
+            self._hovered_item = item
+            self._prefetch_item(item)
+
+    def _prefetch_item(self, item: str):
+        path = self._android_item_path(item)
+        if path:
+            self.prefetcher.want(self.adb.device, [path], urgent=True)
+
+    def _want_common_folders(self):
+        self.prefetcher.want(self.adb.device, self._common_folders())
+
+    @staticmethod
+    def _common_folders() -> List[str]:
+        return [f"{Config.ANDROID_HOME}/{name}" for name in COMMON_FOLDERS]
+
+    def _prefetch_tick(self):
+        self.prefetcher.tick(self.adb.device)
+        self.root.after(Config.PREFETCH_IDLE_MS, self._prefetch_tick)
+
     def _show_local_context_menu(self, event):
         item = self.local_view.tree.identify_row(event.y)
         if not item:
@@ -483,15 +878,28 @@ class ADBFileManager:
             menu.add_command(label="📂 Открыть папку", command=lambda: self._on_android_double_click(None))
             menu.add_command(label="📥 Скачать папку", command=self._pull_files)
         else:
+            menu.add_command(label="👁 Просмотр", command=lambda: self._preview_android_file(name))
             menu.add_command(label="📥 Скачать файл", command=self._pull_files)
             if name.lower().endswith('.apk'):
                 menu.add_command(label="📱 Установить APK", command=lambda: self._install_apk_from_device(name))
 
         menu.add_command(label="✏️ Переименовать", command=self._rename_android_item)
         menu.add_separator()
+        menu.add_command(label="📋 Копировать", command=lambda: self._android_copy(cut=False))
+        menu.add_command(label="✂️ Вырезать", command=lambda: self._android_copy(cut=True))
+        menu.add_command(
+            label="📌 Вставить",
+            command=self._android_paste,
+            state="normal" if self.android_clipboard else "disabled"
+        )
+        menu.add_separator()
         menu.add_command(label="🗑️ Удалить", command=self._delete_android_files)
         menu.add_separator()
         menu.add_command(label="📁 Создать папку здесь", command=self._create_android_folder)
+        menu.add_command(
+            label="🔍 Дубликаты с компьютером",
+            command=lambda: self._find_duplicates(name if tag == "dir" else None)
+        )
         menu.add_command(label="🔄 Обновить", command=self._load_android_files)
 
         menu.post(event.x_root, event.y_root)
@@ -505,23 +913,27 @@ class ADBFileManager:
             messagebox.showinfo("Информация", "Выберите файлы для отправки")
             return
         if messagebox.askyesno("Подтверждение", f"Отправить {len(files)} файл(ов)?"):
-            threading.Thread(target=self._send_files_thread, args=(files,), daemon=True).start()
+            remote_dir = self.current_android_path
+            self._submit(f"Отправка {len(files)} файл(ов)",
+                         lambda token, adb: self._send_files_thread(adb, files, remote_dir, token), BULK)
+
+    def _send_files_thread(self, adb: ADBHelper, files: List[str], remote_dir: str, token: CancelToken):
+        jobs = [TransferJob("push", file, remote_dir) for file in files]
+        task = self.progress.start("Отправка файлов...", len(jobs))
+
+        def on_done(job: TransferJob):
+            task.advance()
+            basename = os.path.basename(job.source)
+            if job.success:
+                self.root.after(0, lambda f=basename: self.log(f"✓ {f} отправлен", "success"))
+            else:
+                self.root.after(0, lambda f=basename: self.log(f"✗ Ошибка при отправке {f}", "error"))
 
-    def _send_files_thread(self, files: List[str]):
-        self._show_progress(True, "Отправка файлов...")
-        for i, file in enumerate(files):
-            try:
-                success = self.adb.push_file(file, self.current_android_path)
-                basename = os.path.basename(file)
-                if success:
-                    self.root.after(0, lambda f=basename: self.log(f"✓ {f} отправлен", "success"))
-                else:
-                    self.root.after(0, lambda f=basename: self.log(f"✗ Ошибка при отправке {f}", "error"))
-                self._update_progress((i + 1) / len(files) * 100)
-            except Exception as e:
-                self.root.after(0, lambda f=basename, err=e: self.log(f"✗ Ошибка при отправке {f}: {err}", "error"))
-        self._show_progress(False)
-        self.root.after(500, self._load_android_files)
+        try:
+            self.transfers.run(jobs, on_done, token, adb)
+        finally:
+            task.finish()
+            self.root.after(500, self._load_android_files)
 
     def _pull_files(self):
         if not self.adb.device:
@@ -532,23 +944,118 @@ class ADBFileManager:
             messagebox.showinfo("Информация", "Выберите файлы для скачивания")
             return
         if messagebox.askyesno("Подтверждение", f"Скачать {len(files)} файл(ов)?"):
-            threading.Thread(target=self._pull_files_thread, args=(files,), daemon=True).start()
+            remote_dir = self.current_android_path.rstrip('/')
+            local_dir = self.current_local_path
+            self._submit(f"Скачивание {len(files)} файл(ов)",
+                         lambda token, adb: self._pull_files_thread(adb, files, remote_dir, local_dir, token), BULK)
+
+    def _pull_files_thread(self, adb: ADBHelper, files: List[str], remote_dir: str, local_dir: str,
+                           token: CancelToken):
+        jobs = [TransferJob("pull", f"{remote_dir}/{file}", local_dir) for file in files]
+        task = self.progress.start("Скачивание файлов...", len(jobs))
+
+        def on_done(job: TransferJob):
+            task.advance()
+            name = os.path.basename(job.source)
+            if job.success:
+                self.root.after(0, lambda f=name: self.log(f"✓ {f} скачан", "success"))
+            else:
+                self.root.after(0, lambda f=name: self.log(f"✗ Ошибка при скачивании {f}", "error"))
 
-    def _pull_files_thread(self, files: List[str]):
-        self._show_progress(True, "Скачивание файлов...")
-        for i, file in enumerate(files):
-            try:
-                remote_path = f"{self.current_android_path.rstrip('/')}/{file}"
-                success = self.adb.pull_file(remote_path, self.current_local_path)
-                if success:
-                    self.root.after(0, lambda f=file: self.log(f"✓ {f} скачан", "success"))
-                else:
-                    self.root.after(0, lambda f=file: self.log(f"✗ Ошибка при скачивании {f}", "error"))
-                self._update_progress((i + 1) / len(files) * 100)
-            except Exception as e:
-                self.root.after(0, lambda f=file, err=e: self.log(f"✗ Ошибка при скачивании {f}: {err}", "error"))
-        self._show_progress(False)
-        self.root.after(500, self._load_local_files)
+        try:
+            self.transfers.run(jobs, on_done, token, adb)
+        finally:
+            task.finish()
+            self.root.after(500, self._load_local_files)
+
+    def _find_duplicates(self, folder: Optional[str] = None):
+        if not self.adb.device:
+            return
+        remote_root = self.current_android_path.rstrip('/')
+        if folder:
+            remote_root = f"{remote_root}/{folder}"
+        DedupeWindow(self.root, self.duplicate_finder, remote_root, self.current_local_path, self.log)
+
+    def _preview_android_file(self, name: str):
+        if not self.adb.device:
+            return
+        PreviewWindow(self.root, self.adb, f"{self.current_android_path.rstrip('/')}/{name}")
+
+    def _android_copy(self, cut: bool):
+        if not self.adb.device:
+            return
+        names = [name for tag, name in self.android_view.get_selection() if tag != "parent"]
+        if not names:
+            return
+        current = self.current_android_path.rstrip('/')
+        paths = [f"{current}/{name}" for name in names]
+        self.android_clipboard = ("cut" if cut else "copy", paths)
+        action = "вырезано" if cut else "скопировано"
+        self.log(f"📋 {len(paths)} объект(ов) {action} в буфер", "info")
+
+    def _android_paste(self):
+        if not self.adb.device or not self.android_clipboard:
+            return
+        mode, sources = self.android_clipboard
+        target_dir = self.current_android_path.rstrip('/') or "/"
+        for source in sources:
+            if target_dir == source or target_dir.startswith(source + "/"):
+                messagebox.showerror("Ошибка", f"Нельзя вставить папку в саму себя:\n{source}")
+                return
+        action = "Перемещение" if mode == "cut" else "Копирование"
+        self._submit(f"{action} {len(sources)} объект(ов) в {target_dir}",
+                     lambda token, adb: self._android_paste_thread(adb, sources, target_dir, mode == "cut", token),
+                     BULK)
+
+    def _android_paste_thread(self, adb: ADBHelper, sources: List[str], target_dir: str, move: bool,
+                              token: CancelToken):
+        action = "Перемещение" if move else "Копирование"
+        task = self.progress.start(f"{action} на устройстве...")
+        try:
+            # Вырезанное остаётся в буфере, пока всё не перемещено: после сбоя вставку можно повторить
+            if self._paste_sources(adb, sources, target_dir, move, token, task) and move:
+                self.root.after(0, lambda: self._clear_cut_clipboard(sources))
+        finally:
+            task.finish()
+            self.root.after(500, self._load_android_files)
+
+    def _clear_cut_clipboard(self, sources: List[str]):
+        if self.android_clipboard == ("cut", sources):
+            self.android_clipboard = None
+
+    def _paste_sources(self, adb: ADBHelper, sources: List[str], target_dir: str, move: bool,
+                       token: CancelToken, task: ProgressTask) -> bool:
+        """True, если все объекты обработаны успешно."""
+        complete = True
+        total = max(adb.get_remote_size(sources), 1)
+        task.set_total(total)
+        done = 0
+        for source in sources:
+            token.checkpoint()
+            name = os.path.basename(source)
+            target = f"{target_dir.rstrip('/')}/{name}"
+            if os.path.dirname(source) == target_dir:
+                if move:
+                    continue
+                base, ext = os.path.splitext(name)
+                target = f"{target_dir.rstrip('/')}/{base} (копия){ext}"
+            if adb.remote_exists(target):
+                self.root.after(0, lambda f=name: self.log(f"⚠ {f} уже существует, пропущен", "warning"))
+                complete = False
+                continue
+
+            def progress(copied: int, offset=done):
+                task.set(offset + copied)
+
+            success = adb.copy_on_device(source, target, move=move, on_progress=progress)
+            done += adb.get_remote_size([target]) if success and len(sources) > 1 else 0
+            if success:
+                verb = "перемещён" if move else "скопирован"
+                self.root.after(0, lambda f=name, v=verb: self.log(f"✓ {f} {v}", "success"))
+            else:
+                complete = False
+                self.root.after(0, lambda f=name: self.log(f"✗ Ошибка при обработке {f}", "error"))
+        return complete
 
     def _delete_local_files(self):
         files = [path for _, path in self.local_view.get_selection() if path != "parent"]
@@ -573,13 +1080,17 @@ class ADBFileManager:
         if not files:
             return
         if messagebox.askyesno("Подтверждение", f"Удалить {len(files)} файл(ов)?\n{Config.Messages.CONFIRM_DELETE}"):
-            threading.Thread(target=self._delete_android_files_thread, args=(files,), daemon=True).start()
+            remote_dir = self.current_android_path.rstrip('/')
+            self._submit(f"Удаление {len(files)} объект(ов)",
+                         lambda token, adb: self._delete_android_files_thread(adb, files, remote_dir, token))
 
-    def _delete_android_files_thread(self, files: List[str]):
+    def _delete_android_files_thread(self, adb: ADBHelper, files: List[str], remote_dir: str, token: CancelToken):
         for file in files:
+            if not token.proceed():
+                break
             try:
-                remote_path = f"{self.current_android_path.rstrip('/')}/{file}"
-                success = self.adb.delete_file(remote_path)
+                remote_path = f"{remote_dir}/{file}"
+                success = adb.delete_file(remote_path)
                 if success:
                     self.root.after(0, lambda f=file: self.log(f"✓ {f} удалён", "success"))
                 else:
@@ -676,18 +1187,18 @@ class ADBFileManager:
                 return
             new_full_path = f"{current_path}/{new_name}"
 
-            def rename_thread():
-                self._show_progress(True, "Переименование...")
-                success = self.adb.rename_file(old_full_path, new_full_path)
+            def rename_thread(token: CancelToken, adb: ADBHelper):
+                task = self.progress.start("Переименование...", 0)
+                success = adb.rename_file(old_full_path, new_full_path)
                 if success:
                     self.root.after(0, lambda: self.log(f"✓ Переименовано: {old_name} -> {new_name}", "success"))
                     self.root.after(500, self._load_android_files)
                 else:
                     self.root.after(0, lambda: self.log(f"✗ Ошибка при переименовании", "error"))
-                self._show_progress(False)
-                dialog.destroy()
+                task.finish()
 
-            threading.Thread(target=rename_thread, daemon=True).start()
+            dialog.destroy()
+            self._submit(f"Переименование {old_name}", rename_thread, INTERACTIVE)
 
         ttk.Button(dialog, text="Переименовать", command=rename).pack(pady=10)
         dialog.bind('<Return>', lambda e: rename())
@@ -720,7 +1231,9 @@ class ADBFileManager:
             name = folder_name.get().strip()
             if name:
                 dialog.destroy()
-                threading.Thread(target=self._create_folder_thread, args=(name,), daemon=True).start()
+                remote_dir = self.current_android_path.rstrip('/')
+                self._submit(f"Создание папки {name}",
+                             lambda token, adb: self._create_folder_thread(adb, remote_dir, name), INTERACTIVE)
             else:
                 messagebox.showwarning("Предупреждение", "Введите имя папки")
 
@@ -731,9 +1244,9 @@ class ADBFileManager:
         y = self.root.winfo_y() + (self.root.winfo_height() - dialog.winfo_height()) // 2
         dialog.geometry(f"+{x}+{y}")
 
-    def _create_folder_thread(self, folder_name: str):
-        folder_path = f"{self.current_android_path.rstrip('/')}/{folder_name}"
-        success = self.adb.create_folder(folder_path)
+    def _create_folder_thread(self, adb: ADBHelper, remote_dir: str, folder_name: str):
+        folder_path = f"{remote_dir}/{folder_name}"
+        success = adb.create_folder(folder_path)
         if success:
             self.root.after(0, lambda: self.log(f"✓ Папка {folder_name} создана", "success"))
             self.root.after(500, self._load_android_files)
@@ -745,7 +1258,8 @@ class ADBFileManager:
             messagebox.showerror("Ошибка", Config.Messages.NO_DEVICE)
             return
         if messagebox.askyesno("Подтверждение", f"Установить {os.path.basename(apk_path)}?"):
-            threading.Thread(target=self._install_apks_thread, args=([apk_path],), daemon=True).start()
+            self._submit(f"Установка {os.path.basename(apk_path)}",
+                         lambda token, adb: self._install_apks_thread(adb, [apk_path], token), BULK)
 
     def _install_apk_from_device(self, apk_name: str):
         if not self.adb.device:
@@ -755,20 +1269,21 @@ class ADBFileManager:
         local_temp = os.path.join(self.current_local_path, f"temp_{apk_name}")
 
         if messagebox.askyesno("Подтверждение", f"Скачать и установить {apk_name}?"):
-            threading.Thread(target=self._install_from_device_thread, args=(remote_path, local_temp, apk_name), daemon=True).start()
+            self._submit(f"Установка {apk_name}",
+                         lambda token, adb: self._install_from_device_thread(adb, remote_path, local_temp, apk_name),
+                         BULK)
 
-    def _install_from_device_thread(self, remote_path: str, local_temp: str, apk_name: str):
+    def _install_from_device_thread(self, adb: ADBHelper, remote_path: str, local_temp: str, apk_name: str):
+        task = self.progress.start(f"Скачивание {apk_name}...", 2)
         try:
-            self._show_progress(True, f"Скачивание {apk_name}...")
-            if not self.adb.pull_file(remote_path, local_temp):
+            if not adb.pull_file(remote_path, local_temp):
                 self.root.after(0, lambda: self.log(f"✗ Ошибка при скачивании {apk_name}", "error"))
-                self._show_progress(False)
                 return
 
-            self._update_progress(50)
-            self._show_progress(True, f"Установка {apk_name}...")
+            task.advance()
+            task.set_text(f"Установка {apk_name}...")
 
-            success, message = self.adb.install_apk(local_temp)
+            success, message = adb.install_apk(local_temp)
             if success:
                 self.root.after(0, lambda: self.log(f"✓ {apk_name} установлен", "success"))
             else:
@@ -779,35 +1294,33 @@ class ADBFileManager:
             except:
                 pass
 
-            self._show_progress(False)
-
         except Exception as e:
             self.root.after(0, lambda: self.log(f"✗ Ошибка при установке {apk_name}: {e}", "error"))
-            self._show_progress(False)
+        finally:
+            task.finish()
 
-    def _install_apks_thread(self, apk_files: List[str]):
+    def _install_apks_thread(self, adb: ADBHelper, apk_files: List[str], token: CancelToken):
         total = len(apk_files)
+        task = self.progress.start("Установка...", total)
         for i, apk_file in enumerate(apk_files):
+            if not token.proceed():
+                break
             try:
-                self._show_progress(True, f"Установка {os.path.basename(apk_file)} ({i+1}/{total})")
+                task.set_text(f"Установка {os.path.basename(apk_file)} ({i+1}/{total})")
                 if not apk_file.lower().endswith('.apk'):
                     self.root.after(0, lambda f=apk_file: self.log(f"✗ {os.path.basename(f)} не является APK", "error"))
                     continue
-                success, message = self.adb.install_apk(apk_file)
+                success, message = adb.install_apk(apk_file)
                 if success:
                     self.root.after(0, lambda f=apk_file: self.log(f"✓ {os.path.basename(f)} установлен", "success"))
                 else:
                     self.root.after(0, lambda f=apk_file, m=message: self.log(f"✗ Ошибка при установке {os.path.basename(f)}: {m}", "error"))
-                self._update_progress((i + 1) / total * 100)
+                task.advance()
             except Exception as e:
                 self.root.after(0, lambda f=apk_file, err=e: self.log(f"✗ Ошибка при установке {os.path.basename(f)}: {err}", "error"))
-        self._show_progress(False)
+        task.finish()
 
     def _show_scrcpy_dialog(self):
-        if not self.adb.device:
-            messagebox.showerror("Ошибка", Config.Messages.NO_DEVICE)
-            return
-
         try:
             subprocess.run(["scrcpy", "--version"], capture_output=True, check=True, timeout=5)
         except (subprocess.SubprocessError, FileNotFoundError):
@@ -819,96 +1332,7 @@ class ADBFileManager:
                 webbrowser.open("https://github.com/Genymobile/scrcpy/releases")
             return
 
-        dialog = tk.Toplevel(self.root)
-        dialog.title("Настройки scrcpy")
-        dialog.geometry("450x500")
-        dialog.transient(self.root)
-        dialog.grab_set()
-
-        main_frame = ttk.Frame(dialog, padding="10")
-        main_frame.pack(fill=tk.BOTH, expand=True)
-
-        audio_frame = ttk.LabelFrame(main_frame, text="Настройки звука", padding="10")
-        audio_frame.pack(fill=tk.X, pady=(0, 10))
-
-        ttk.Label(audio_frame, text="Источник звука:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        audio_source = ttk.Combobox(audio_frame, values=["playback (системный)", "none (без звука)"],
-                                     state="readonly", width=25)
-        audio_source.grid(row=0, column=1, padx=5, pady=2)
-        audio_source.current(0)
-
-        ttk.Label(audio_frame, text="Кодек:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        audio_codec = ttk.Combobox(audio_frame, values=["aac", "opus", "raw"],
-                                    state="readonly", width=25)
-        audio_codec.grid(row=1, column=1, padx=5, pady=2)
-        audio_codec.current(0)
-
-        ttk.Label(audio_frame, text="Битрейт:").grid(row=2, column=0, sticky=tk.W, pady=2)
-        audio_bitrate = ttk.Combobox(audio_frame, values=["64K", "128K", "192K", "256K"],
-                                      state="readonly", width=25)
-        audio_bitrate.grid(row=2, column=1, padx=5, pady=2)
-        audio_bitrate.current(1)
-
-        video_frame = ttk.LabelFrame(main_frame, text="Настройки видео", padding="10")
-        video_frame.pack(fill=tk.X, pady=(0, 10))
-
-        ttk.Label(video_frame, text="Макс. разрешение:").grid(row=0, column=0, sticky=tk.W, pady=2)
-        max_size = ttk.Combobox(video_frame, values=["1024", "1280", "1920", "2560", "оригинал"],
-                                 state="readonly", width=25)
-        max_size.grid(row=0, column=1, padx=5, pady=2)
-        max_size.current(2)
-
-        ttk.Label(video_frame, text="Битрейт видео:").grid(row=1, column=0, sticky=tk.W, pady=2)
-        video_bitrate = ttk.Combobox(video_frame, values=["2M", "4M", "8M", "16M", "32M"],
-                                      state="readonly", width=25)
-        video_bitrate.grid(row=1, column=1, padx=5, pady=2)
-        video_bitrate.current(2)
-
-        options_frame = ttk.LabelFrame(main_frame, text="Дополнительно", padding="10")
-        options_frame.pack(fill=tk.X, pady=(0, 10))
-
-        stay_awake = tk.BooleanVar(value=True)
-        ttk.Checkbutton(options_frame, text="Не выключать экран", variable=stay_awake).pack(anchor=tk.W, pady=2)
-
-        turn_screen_off = tk.BooleanVar(value=True)
-        ttk.Checkbutton(options_frame, text="Выключить экран телефона", variable=turn_screen_off).pack(anchor=tk.W, pady=2)
-
-        button_frame = ttk.Frame(main_frame)
-        button_frame.pack(fill=tk.X, pady=(10, 0))
-
-        def launch():
-            device_serial = self.adb.device
-            params = ["scrcpy", "-s", device_serial]
-
-            source = audio_source.get().split()[0]
-            if source != "none":
-                params.extend(["--audio-source", source])
-                params.extend(["--audio-codec", audio_codec.get()])
-                params.extend(["--audio-bit-rate", audio_bitrate.get()])
-
-            if max_size.get() != "оригинал":
-                params.extend(["--max-size", max_size.get()])
-            params.extend(["--video-bit-rate", video_bitrate.get()])
-
-            if stay_awake.get():
-                params.append("--stay-awake")
-            if turn_screen_off.get():
-                params.append("--turn-screen-off")
-
-            dialog.destroy()
-            try:
-                subprocess.Popen(params)
-                self.log(f"✓ Scrcpy запущен для устройства {device_serial}", "success")
-            except Exception as e:
-                self.log(f"✗ Ошибка при запуске scrcpy: {e}", "error")
-
-        ttk.Button(button_frame, text="Запустить", command=launch, width=15).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="Отмена", command=dialog.destroy, width=15).pack(side=tk.LEFT, padx=5)
-
-        dialog.update_idletasks()
-        x = self.root.winfo_x() + (self.root.winfo_width() - dialog.winfo_width()) // 2
-        y = self.root.winfo_y() + (self.root.winfo_height() - dialog.winfo_height()) // 2
-        dialog.geometry(f"+{x}+{y}")
+        ScrcpyWindow(self.root, self.scrcpy, self.adb.device, self.log)
 
     def _check_for_updates(self):
         threading.Thread(target=self._check_updates_thread, daemon=True).start()
@@ -916,6 +1340,7 @@ class ADBFileManager:
     def _check_updates_thread(self):
         try:
             self.root.after(0, lambda: self.log("🔍 Проверка обновлений...", "info"))
+            import requests
             response = requests.get(
                 f"https://api.github.com/repos/{Config.GITHUB_REPO}/releases/latest",
                 timeout=5
@@ -1016,19 +1441,40 @@ class ADBFileManager:
 
         self.log(f"> adb -s {self.adb.device} {command}", "command")
 
-        def run():
-            stdout, stderr = self.adb.run_command(command)
-            self.root.after(0, lambda: self._show_command_result(stdout, stderr))
+        def on_line(line: str, is_error: bool):
+            if is_error:
+                self.log(f"✗ {line}", "error")
+            elif line.strip():
+                self.log(f"  {line}")
 
-        threading.Thread(target=run, daemon=True).start()
+        def on_exit(handle: CommandHandle, returncode: int):
+            self.root.after(0, lambda: self._on_adb_command_finished(handle, returncode))
 
-    def _show_command_result(self, stdout: str, stderr: str):
-        if stdout:
-            for line in stdout.split('\n'):
-                if line.strip():
-                    self.log(f"  {line}")
-        if stderr:
-            self.log(f"✗ {stderr}", "error")
+        try:
+            handle = self.adb.start_command(command, on_line, on_exit)
+        except ValueError as e:
+            self.log(f"✗ Ошибка разбора команды: {e}", "error")
+            return
+        except OSError as e:
+            self.log(f"✗ Не удалось запустить adb: {e}", "error")
+            return
+        if handle:
+            self.running_commands.append(handle)
+            self.stop_command_button.config(state="normal")
+
+    def _on_adb_command_finished(self, handle: CommandHandle, returncode: int):
+        if handle in self.running_commands:
+            self.running_commands.remove(handle)
+        if handle.cancelled:
+            self.log("⚠ Команда остановлена", "warning")
+        elif returncode != 0:
+            self.log(f"✗ Команда завершилась с кодом {returncode}", "error")
+        if not self.running_commands:
+            self.stop_command_button.config(state="disabled")
+
+    def _stop_adb_commands(self):
+        for handle in list(self.running_commands):
+            handle.cancel()
 
     def log(self, message: str, tag: str = None):
         if tag is None:
@@ -1040,19 +1486,13 @@ class ADBFileManager:
                 tag = "warning"
             elif message.startswith('>'):
                 tag = "command"
-            elif message.startswith('📂') or message.startswith('🔍') or message.startswith('📊'):
+            elif message.startswith(('📂', '🔍', '📊', '⏱')):
                 tag = "info"
 
-        if tag:
-            self.log_text.insert(tk.END, message + "\n", tag)
-        else:
-            self.log_text.insert(tk.END, message + "\n")
-
-        self.log_text.see(tk.END)
-        self.log_text.update_idletasks()
+        self.log_sink.write(message, tag)
 
     def clear_log(self):
-        self.log_text.delete(1.0, tk.END)
+        self.log_sink.clear()
 
     def copy_log_to_clipboard(self):
         log_content = self.log_text.get(1.0, tk.END)
@@ -1092,23 +1532,44 @@ class ADBFileManager:
         except tk.TclError:
             pass
 
-    def _show_progress(self, show: bool = True, text: str = ""):
-        if show:
-            self.progress_label.config(text=text)
-            self.progress_label.pack(side=tk.LEFT, padx=(0, 10))
-            self.progress_bar.pack(side=tk.LEFT)
-            self.progress_var.set(0)
-        else:
-            self.progress_label.pack_forget()
-            self.progress_bar.pack_forget()
-
-    def _update_progress(self, value: float):
-        self.progress_var.set(value)
-        self.root.update_idletasks()
-
     def _show_info_window(self):
         InfoWindow(self.root)
 
+    def _show_packages_window(self):
+        if not self.adb.device:
+            messagebox.showerror("Ошибка", Config.Messages.NO_DEVICE)
+            return
+        adb = self.adb.for_device(self.adb.device)
+        PackagesWindow(self.root, adb, self.jobs, self.log, ApkExtractor(adb, self.transfers), self.progress)
+
+    def _show_logcat_window(self):
+        if not self.adb.device:
+            messagebox.showerror("Ошибка", Config.Messages.NO_DEVICE)
+            return
+        LogcatWindow(self.root, self.adb.device)
+
+    def _show_connection_window(self):
+        ConnectionWindow(self.root, self.connections, self.log, self._on_wireless_connected)
+
+    def _on_wireless_connected(self, address: str):
+        if not self.adb.device:
+            self.adb.device = address
+            self._update_device_info()
+            self._load_android_files()
+        threading.Thread(target=self._measure_link, args=(address,), daemon=True).start()
+
+    def _measure_link(self, serial: str):
+        profile = self.connections.measure(serial)
+        if not profile.measured:
+            return
+        if serial == self.adb.device:
+            self.adb.apply_link_profile(profile)
+        self.root.after(0, lambda: self.log(
+            f"📊 {serial}: {profile.throughput / 1024 / 1024:.1f} МБ/с, "
+            f"задержка {profile.latency_ms:.0f} мс, потоков {profile.concurrency}",
+            "info"
+        ))
+
 
 def main():
     root = tk.Tk()
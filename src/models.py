@@ -9,6 +9,7 @@ class FileInfo:
     permissions: str = ""
     modified: str = ""
     is_dir: bool = False
+    size_bytes: int = 0
 
     @property
     def display_name(self) -> str:
@@ -30,4 +31,49 @@ class DeviceInfo:
     used_storage: str = ""
     free_storage: str = ""
     android_version: str = ""
-    serial: str = ""
\ No newline at end of file
+    serial: str = ""
+
+
+@dataclass
+class SavedDevice:
+    address: str
+    name: str = ""
+    last_connected: float = 0.0
+
+
+@dataclass
+class LinkProfile:
+    serial: str
+    transport: str = "usb"
+    latency_ms: float = 0.0
+    throughput: float = 0.0
+    measured: bool = False
+
+    @property
+    def concurrency(self) -> int:
+        """Число параллельных передач для планировщика."""
+        if self.measured and self.throughput < 1024 * 1024:
+            return 1
+        if self.transport == "tcp":
+            # Высокая задержка по Wi-Fi скрывается парой потоков, больше забивает канал
+            return 2 if self.latency_ms < 50 else 3
+        return 4
+
+    @property
+    def chunk_size(self) -> int:
+        if not self.measured:
+            return 64 * 1024 if self.transport == "tcp" else 1024 * 1024
+        # Около 50 мс данных в одном блоке, в пределах 64 КБ..1 МБ
+        return int(min(max(self.throughput * 0.05, 64 * 1024), 1024 * 1024))
+
+
+@dataclass
+class ScrcpyProfile:
+    serial: str
+    audio_source: str = "playback"
+    audio_codec: str = "aac"
+    audio_bitrate: str = "128K"
+    max_size: str = "1920"
+    video_bitrate: str = "8M"
+    stay_awake: bool = True
+    turn_screen_off: bool = True
@@ -0,0 +1,159 @@
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, List
+
+SEPARATOR = "@@packages@@"
+# Всё о пакетах за один вызов adb: пути и uid, отключённые, системные, версии и размеры
+LIST_COMMAND = (
+    f"pm list packages -f -U; echo {SEPARATOR}; "
+    f"pm list packages -d; echo {SEPARATOR}; "
+    f"pm list packages -s; echo {SEPARATOR}; "
+    f"dumpsys package packages; echo {SEPARATOR}; "
+    "dumpsys diskstats"
+)
+ACTIONS = {
+    "uninstall": "pm uninstall",
+    "clear": "pm clear",
+    "disable": "pm disable-user --user 0",
+    "enable": "pm enable",
+}
+# pm запускает отдельную JVM, поэтому параллельно держим лишь несколько
+ACTION_PARALLELISM = 4
+
+PACKAGE_BLOCK_RE = re.compile(r'^\s*Package \[([^\]]+)\]')
+VERSION_CODE_RE = re.compile(r'versionCode=(\d+)')
+# Имена пакетов не требуют экранирования; всё прочее в shell не передаём
+PACKAGE_NAME_RE = re.compile(r'^[A-Za-z0-9_.]+$')
+
+
+@dataclass
+class PackageInfo:
+    name: str
+    apk_path: str = ""
+    uid: str = ""
+    version_name: str = ""
+    version_code: str = ""
+    system: bool = False
+    enabled: bool = True
+    code_size: int = 0
+    data_size: int = 0
+    cache_size: int = 0
+
+
+def _package_names(text: str) -> List[str]:
+    return [line[len("package:"):].strip() for line in text.split("\n") if line.startswith("package:")]
+
+
+def parse_pm_list(text: str) -> Dict[str, PackageInfo]:
+    packages = {}
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line.startswith("package:"):
+            continue
+        entry, _, uid = line[len("package:"):].partition(" uid:")
+        # Путь к APK сам может содержать '=', имя пакета — всегда после последнего
+        path, _, name = entry.rpartition("=")
+        if name:
+            packages[name] = PackageInfo(name=name, apk_path=path, uid=uid.strip())
+    return packages
+
+
+def apply_dumpsys_package(text: str, packages: Dict[str, PackageInfo]):
+    current = None
+    for line in text.split("\n"):
+        if line.startswith("Hidden system packages"):
+            # Дальше идут заводские версии обновлённых системных пакетов
+            break
+        match = PACKAGE_BLOCK_RE.match(line)
+        if match:
+            current = packages.get(match.group(1))
+            continue
+        if current is None:
+            continue
+        stripped = line.strip()
+        if stripped.startswith("versionCode="):
+            code = VERSION_CODE_RE.match(stripped)
+            if code:
+                current.version_code = code.group(1)
+        elif stripped.startswith("versionName="):
+            current.version_name = stripped[len("versionName="):]
+
+
+def apply_diskstats(text: str, packages: Dict[str, PackageInfo]):
+    fields = {}
+    for line in text.split("\n"):
+        key, sep, value = line.partition(": ")
+        if sep and key in ("Package Names", "App Sizes", "App Data Sizes", "Cache Sizes"):
+            try:
+                fields[key] = json.loads(value)
+            except ValueError:
+                continue
+    names = fields.get("Package Names", [])
+    for index, name in enumerate(names):
+        package = packages.get(name)
+        if package is None:
+            continue
+        for key, attr in (("App Sizes", "code_size"), ("App Data Sizes", "data_size"), ("Cache Sizes", "cache_size")):
+            values = fields.get(key, [])
+            if index < len(values):
+                setattr(package, attr, int(values[index]))
+
+
+def parse_packages(output: str) -> List[PackageInfo]:
+    parts = output.split(SEPARATOR)
+    parts += [""] * (5 - len(parts))
+    packages = parse_pm_list(parts[0])
+    for name in _package_names(parts[1]):
+        if name in packages:
+            packages[name].enabled = False
+    for name in _package_names(parts[2]):
+        if name in packages:
+            packages[name].system = True
+    apply_dumpsys_package(parts[3], packages)
+    apply_diskstats(parts[4], packages)
+    return sorted(packages.values(), key=lambda p: p.name)
+
+
+def action_script(action: str, names: List[str]) -> str:
+    """Одна shell-команда на весь список: pm запускаются группами по ACTION_PARALLELISM."""
+    command = ACTIONS[action]
+    names = [name for name in names if PACKAGE_NAME_RE.match(name)]
+    groups = []
+    for i in range(0, len(names), ACTION_PARALLELISM):
+        jobs = [f'(echo "@@{name} $({command} {name} 2>&1 | tr "\\n" " ")") &'
+                for name in names[i:i + ACTION_PARALLELISM]]
+        groups.append(" ".join(jobs) + " wait")
+    return "; ".join(groups)
+
+
+def parse_action_output(output: str, names: List[str]) -> Dict[str, str]:
+    results = {name: "" for name in names}
+    for line in output.split("\n"):
+        if line.startswith("@@"):
+            name, _, message = line[2:].partition(" ")
+            if name in results:
+                results[name] = message.strip()
+    return results
+
+
+def action_succeeded(message: str) -> bool:
+    return "Success" in message or "new state" in message
+
+
+def path_script(names: List[str]) -> str:
+    """pm path для всех пакетов одним вызовом; вывод каждого предваряется @@имя."""
+    names = [name for name in names if PACKAGE_NAME_RE.match(name)]
+    return "; ".join(f"echo @@{name}; pm path {name}" for name in names)
+
+
+def parse_path_output(output: str) -> Dict[str, List[str]]:
+    paths: Dict[str, List[str]] = {}
+    current = None
+    for line in output.split("\n"):
+        line = line.strip()
+        if line.startswith("@@"):
+            current = paths.setdefault(line[2:], [])
+        elif current is not None and line.startswith("package:"):
+            current.append(line[len("package:"):])
+    return paths
@@ -0,0 +1,176 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from typing import Callable, Dict, List
+
+from apk_extract import ApkExtractor, ExtractReport
+from job_queue import BULK, INTERACTIVE, NORMAL, JobQueue
+from packages import PackageInfo, action_succeeded
+from progress import ProgressModel
+from transfer import TransferJob
+from utils import format_size
+
+ACTION_TITLES = {
+    "uninstall": ("Удалить", "удалён"),
+    "clear": ("Очистить данные", "очищен"),
+    "disable": ("Отключить", "отключён"),
+    "enable": ("Включить", "включён"),
+}
+
+
+class PackagesWindow:
+    def __init__(self, parent, adb, jobs: JobQueue, log: Callable,
+                 extractor: ApkExtractor, progress: ProgressModel):
+        self.parent = parent
+        self.adb = adb
+        self.serial = adb.device
+        self.jobs = jobs
+        self.log = log
+        self.extractor = extractor
+        self.progress = progress
+        self.packages: Dict[str, PackageInfo] = {}
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Приложения — {self.serial}")
+        self.window.geometry("1100x600")
+
+        self._setup_ui()
+        self._reload()
+
+    def _setup_ui(self):
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+        ttk.Label(controls, text="Фильтр:").pack(side=tk.LEFT)
+        self.filter = ttk.Entry(controls, width=25)
+        self.filter.pack(side=tk.LEFT, padx=(2, 8))
+        self.filter.bind("<KeyRelease>", lambda e: self._render())
+        self.show_system = tk.BooleanVar(value=False)
+        ttk.Checkbutton(controls, text="Системные", variable=self.show_system,
+                        command=self._render).pack(side=tk.LEFT)
+        ttk.Button(controls, text="🔄 Обновить", command=self._reload).pack(side=tk.LEFT, padx=8)
+
+        self.actions = ttk.Frame(controls)
+        self.actions.pack(side=tk.RIGHT)
+        ttk.Button(self.actions, text="💾 Извлечь APK", command=self._extract).pack(side=tk.LEFT, padx=2)
+        for action, (title, _) in ACTION_TITLES.items():
+            ttk.Button(self.actions, text=title,
+                       command=lambda a=action: self._run_action(a)).pack(side=tk.LEFT, padx=2)
+
+        frame = ttk.Frame(self.window)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5)
+        scrollbar = ttk.Scrollbar(frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        columns = ("version", "code", "data", "cache", "state", "path")
+        self.tree = ttk.Treeview(frame, columns=columns, selectmode="extended", yscrollcommand=scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree.yview)
+        self.tree.heading("#0", text="Пакет")
+        for column, title, width, anchor in (("version", "Версия", 120, "w"), ("code", "Код", 80, "e"),
+                                             ("data", "Данные", 80, "e"), ("cache", "Кэш", 80, "e"),
+                                             ("state", "Состояние", 100, "w"), ("path", "Путь", 300, "w")):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=width, anchor=anchor)
+        self.tree.column("#0", width=260)
+
+        self.status = ttk.Label(self.window, text="", padding="2")
+        self.status.pack(fill=tk.X)
+
+    def _reload(self):
+        self.status.config(text="Загрузка списка приложений...")
+
+        def load(token):
+            packages = self.adb.list_packages()
+            self.parent.after(0, lambda: self._on_loaded(packages))
+
+        self.jobs.submit(self.serial, "Список приложений", load, INTERACTIVE)
+
+    def _on_loaded(self, packages: List[PackageInfo]):
+        if not self.window.winfo_exists():
+            return
+        self.packages = {p.name: p for p in packages}
+        self._render()
+
+    def _render(self):
+        self.tree.delete(*self.tree.get_children())
+        needle = self.filter.get().strip().lower()
+        shown = 0
+        for package in self.packages.values():
+            if package.system and not self.show_system.get():
+                continue
+            if needle and needle not in package.name.lower():
+                continue
+            state = []
+            if package.system:
+                state.append("системное")
+            if not package.enabled:
+                state.append("отключено")
+            version = package.version_name
+            if package.version_code:
+                version = f"{version} ({package.version_code})"
+            self.tree.insert("", tk.END, iid=package.name, text=package.name, values=(
+                version,
+                format_size(package.code_size),
+                format_size(package.data_size),
+                format_size(package.cache_size),
+                ", ".join(state),
+                package.apk_path
+            ))
+            shown += 1
+        self.status.config(text=f"Показано: {shown} из {len(self.packages)}")
+
+    def selected_packages(self) -> List[str]:
+        return list(self.tree.selection())
+
+    def _run_action(self, action: str):
+        names = self.selected_packages()
+        if not names:
+            messagebox.showinfo("Информация", "Выберите приложения", parent=self.window)
+            return
+        title, done = ACTION_TITLES[action]
+        if not messagebox.askyesno("Подтверждение", f"{title}: {len(names)} приложени(й)?", parent=self.window):
+            return
+
+        def run(token):
+            results = self.adb.package_action(action, names)
+            self.parent.after(0, lambda: self._on_action_done(done, results))
+
+        self.jobs.submit(self.serial, f"{title}: {len(names)} приложени(й)", run, NORMAL)
+
+    def _on_action_done(self, done: str, results: Dict[str, str]):
+        for name, message in results.items():
+            if action_succeeded(message):
+                self.log(f"✓ {name} {done}", "success")
+            else:
+                self.log(f"✗ {name}: {message or 'нет ответа'}", "error")
+        if self.window.winfo_exists():
+            self._reload()
+
+    def _extract(self):
+        names = self.selected_packages()
+        if not names:
+            messagebox.showinfo("Информация", "Выберите приложения", parent=self.window)
+            return
+        destination = filedialog.askdirectory(parent=self.window, title="Папка для APK")
+        if not destination:
+            return
+
+        def run(token):
+            task = self.progress.start(f"Извлечение APK ({len(names)})...", 0)
+
+            def on_done(job: TransferJob):
+                task.advance()
+                if not job.success:
+                    self.parent.after(0, lambda p=job.source: self.log(f"✗ Ошибка при скачивании {p}", "error"))
+
+            try:
+                report = self.extractor.extract(names, destination, token, on_done, on_planned=task.set_total)
+            finally:
+                task.finish()
+            self.parent.after(0, lambda: self._on_extracted(report))
+
+        self.jobs.submit(self.serial, f"Извлечение APK: {len(names)} приложени(й)", run, BULK)
+
+    def _on_extracted(self, report: ExtractReport):
+        self.log(f"✓ APK извлечены: {len(report.pulled)}, уже были: {len(report.skipped)}, "
+                 f"ошибки: {len(report.failed)}", "success" if not report.failed else "warning")
+        for name in report.missing:
+            self.log(f"⚠ {name}: пути APK не найдены", "warning")
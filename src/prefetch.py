@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from config import Config
+from job_queue import BULK, CancelToken, Job, JobQueue
+from models import FileInfo
+
+COMMON_FOLDERS = ("DCIM", "Download", "Pictures")
+
+
+class ListingPrefetcher:
+    """Списки папок, загруженные заранее, пока устройство простаивает.
+
+    Предзагрузка идёт фоновой задачей и уступает устройство любой другой задаче;
+    число вызовов ограничено бюджетом в минуту.
+    """
+
+    def __init__(self, adb, jobs: JobQueue,
+                 per_minute: int = Config.PREFETCH_PER_MINUTE,
+                 fresh_seconds: float = Config.PREFETCH_FRESH_SECONDS):
+        self.adb = adb
+        self.jobs = jobs
+        self.per_minute = per_minute
+        self.fresh_seconds = fresh_seconds
+        self._listings: "OrderedDict[Tuple[str, str], Tuple[float, List[FileInfo]]]" = OrderedDict()
+        # Очередь папок по устройствам; сбрасывается при каждом переходе в другую папку
+        self._wanted: Dict[str, List[str]] = {}
+        self._spent: Deque[float] = deque()
+        self._job: Optional[Job] = None
+        self._last_foreground = 0.0
+        self._lock = threading.Lock()
+
+    def want(self, serial: Optional[str], paths: List[str], urgent: bool = False):
+        """Добавить папки в очередь; urgent — выделенная или наведённая папка, идёт первой."""
+        if not serial:
+            return
+        with self._lock:
+            wanted = self._wanted.setdefault(serial, [])
+            for path in reversed(paths) if urgent else paths:
+                if path in wanted:
+                    if not urgent:
+                        continue
+                    wanted.remove(path)
+                if urgent:
+                    wanted.insert(0, path)
+                else:
+                    wanted.append(path)
+
+    def reset(self, serial: Optional[str], keep: Tuple[str, ...] = ()):
+        """Забыть папки, запрошенные для прошлого вида; keep остаются в очереди."""
+        with self._lock:
+            wanted = [path for path in self._wanted.get(serial, []) if path in keep]
+            if wanted:
+                self._wanted[serial] = wanted
+            else:
+                self._wanted.pop(serial, None)
+
+    def take(self, serial: str, path: str) -> Optional[List[FileInfo]]:
+        with self._lock:
+            entry = self._listings.get((serial, path))
+            if entry is None or time.monotonic() - entry[0] > self.fresh_seconds:
+                return None
+            return list(entry[1])
+
+    def store(self, serial: str, path: str, files: List[FileInfo], foreground: bool = True):
+        with self._lock:
+            key = (serial, path)
+            self._listings[key] = (time.monotonic(), list(files))
+            self._listings.move_to_end(key)
+            while len(self._listings) > Config.PREFETCH_MAX_LISTINGS:
+                self._listings.popitem(last=False)
+            if foreground:
+                self._last_foreground = time.monotonic()
+
+    def invalidate(self, serial: str):
+        with self._lock:
+            for key in [key for key in self._listings if key[0] == serial]:
+                del self._listings[key]
+
+    def tick(self, serial: Optional[str]):
+        """Вызывается по таймеру GUI: запускает предзагрузку, если устройство простаивает."""
+        if not serial:
+            return
+        with self._lock:
+            if not self._wanted.get(serial) or (self._job and self._job.active):
+                return
+            if time.monotonic() - self._last_foreground < Config.PREFETCH_IDLE_MS / 1000:
+                return
+            if not self._budget_left():
+                return
+        if not self._device_idle(serial):
+            return
+        self._job = self.jobs.submit(serial, "Предзагрузка папок", lambda token: self._run(serial, token), BULK)
+
+    def _budget_left(self) -> int:
+        now = time.monotonic()
+        while self._spent and now - self._spent[0] > 60:
+            self._spent.popleft()
+        return self.per_minute - len(self._spent)
+
+    def _device_idle(self, serial: str, own: Optional[CancelToken] = None) -> bool:
+        return not any(job.active and job.serial == serial and job.token is not own for job in self.jobs.jobs())
+
+    def _run(self, serial: str, token: CancelToken):
+        adb = self.adb.for_device(serial)
+        while token.proceed() and self.adb.device == serial and self._device_idle(serial, token):
+            with self._lock:
+                wanted = self._wanted.get(serial)
+                if not wanted or not self._budget_left():
+                    return
+                path = wanted.pop(0)
+                entry = self._listings.get((serial, path))
+                if entry and time.monotonic() - entry[0] <= self.fresh_seconds:
+                    continue
+                self._spent.append(time.monotonic())
+            files = [f for f in adb.list_files(path) if f.name and f.name.strip()]
+            self.store(serial, path, files, foreground=False)
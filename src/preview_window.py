@@ -0,0 +1,181 @@
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from config import Config
+from thumbnails import IMAGE_EXTENSIONS, make_thumbnail
+from utils import format_size
+
+HEX_WIDTH = 16
+PREVIEW_IMAGE_SIZE = 480
+
+
+def looks_binary(data: bytes) -> bool:
+    return b"\x00" in data[:4096]
+
+
+def hex_dump(data: bytes, offset: int) -> str:
+    lines = []
+    for i in range(0, len(data), HEX_WIDTH):
+        chunk = data[i:i + HEX_WIDTH]
+        hex_part = " ".join(f"{b:02x}" for b in chunk)
+        text_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        lines.append(f"{offset + i:010x}  {hex_part:<{HEX_WIDTH * 3}} {text_part}")
+    return "\n".join(lines)
+
+
+class PreviewWindow:
+    """Быстрый просмотр файла на устройстве: читаются только нужные страницы."""
+
+    def __init__(self, parent, adb, remote_path: str):
+        self.adb = adb
+        self.remote_path = remote_path
+        self.page_size = Config.PREVIEW_PAGE_SIZE
+        self.size = -1
+        self.offset = 0
+        self._pages = {}
+        self._image = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(f"Просмотр — {os.path.basename(remote_path)}")
+        self.window.geometry("900x600")
+
+        self.mode = tk.StringVar(value="text")
+        self._setup_ui()
+        threading.Thread(target=self._open, daemon=True).start()
+
+    def _setup_ui(self):
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+
+        ttk.Button(controls, text="⏮", width=3, command=lambda: self._go(0)).pack(side=tk.LEFT)
+        ttk.Button(controls, text="◀", width=3,
+                   command=lambda: self._go(self.offset - self.page_size)).pack(side=tk.LEFT)
+        ttk.Button(controls, text="▶", width=3,
+                   command=lambda: self._go(self.offset + self.page_size)).pack(side=tk.LEFT)
+        ttk.Button(controls, text="⏭", width=3, command=self._go_end).pack(side=tk.LEFT)
+
+        ttk.Label(controls, text="Смещение:").pack(side=tk.LEFT, padx=(10, 2))
+        self.offset_entry = ttk.Entry(controls, width=14)
+        self.offset_entry.pack(side=tk.LEFT)
+        self.offset_entry.bind("<Return>", lambda e: self._go_entry())
+        ttk.Button(controls, text="Перейти", command=self._go_entry).pack(side=tk.LEFT, padx=2)
+
+        ttk.Radiobutton(controls, text="Текст", value="text", variable=self.mode,
+                        command=self._render_current).pack(side=tk.RIGHT)
+        ttk.Radiobutton(controls, text="HEX", value="hex", variable=self.mode,
+                        command=self._render_current).pack(side=tk.RIGHT)
+        self.image_radio = ttk.Radiobutton(controls, text="Изображение", value="image", variable=self.mode,
+                                           command=self._render_current)
+
+        body = ttk.Frame(self.window)
+        body.pack(fill=tk.BOTH, expand=True)
+        scrollbar = ttk.Scrollbar(body)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(body, wrap=tk.NONE, yscrollcommand=scrollbar.set, font=("Monospace", 9))
+        self.text.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.text.yview)
+        self.image_label = ttk.Label(body, anchor=tk.CENTER)
+
+        self.status = ttk.Label(self.window, text="Загрузка...", padding="2")
+        self.status.pack(fill=tk.X)
+
+    def _open(self):
+        self.size = self.adb.get_file_size(self.remote_path)
+        data = self._read(0)
+        is_image = os.path.splitext(self.remote_path)[1].lower() in IMAGE_EXTENSIONS
+        self.window.after(0, lambda: self._on_opened(data, is_image))
+
+    def _on_opened(self, data: bytes, is_image: bool):
+        if not self.window.winfo_exists():
+            return
+        if is_image:
+            self.image_radio.pack(side=tk.RIGHT)
+            self.mode.set("image")
+        elif looks_binary(data):
+            self.mode.set("hex")
+        self._render_current()
+
+    def _read(self, offset: int) -> bytes:
+        if offset not in self._pages:
+            if offset == 0:
+                self._pages[0] = self.adb.read_head(self.remote_path, self.page_size)
+            elif self.size > 0 and offset + self.page_size >= self.size:
+                self._pages[offset] = self.adb.read_tail(self.remote_path, self.size - offset)
+            else:
+                self._pages[offset] = self.adb.read_range(self.remote_path, offset, self.page_size)
+        return self._pages[offset]
+
+    def _go(self, offset: int):
+        if self.size >= 0:
+            offset = min(offset, max(self.size - 1, 0))
+        offset = max(offset - offset % HEX_WIDTH, 0)
+        self.offset = offset
+        if self.mode.get() == "image":
+            self.mode.set("hex")
+        self._render_current()
+
+    def _go_end(self):
+        if self.size > 0:
+            self._go(max(self.size - self.page_size, 0))
+
+    def _go_entry(self):
+        value = self.offset_entry.get().strip().lower()
+        try:
+            offset = int(value, 16) if value.startswith("0x") else int(value)
+        except ValueError:
+            return
+        self._go(offset)
+
+    def _render_current(self):
+        offset, mode = self.offset, self.mode.get()
+        self.status.config(text="Загрузка...")
+
+        def worker():
+            if mode == "image":
+                payload = self._load_image()
+            else:
+                payload = self._read(offset)
+            self.window.after(0, lambda: self._show(offset, mode, payload))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _load_image(self) -> bytes:
+        if not 0 < self.size <= Config.PREVIEW_IMAGE_LIMIT:
+            return b""
+        data = self.adb.read_file(self.remote_path)
+        image = make_thumbnail(data, PREVIEW_IMAGE_SIZE)
+        if not image and os.path.splitext(self.remote_path)[1].lower() in ('.png', '.gif'):
+            # Tk сам понимает PNG и GIF, Pillow для них не обязателен
+            return data
+        return image
+
+    def _show(self, offset: int, mode: str, payload: bytes):
+        if not self.window.winfo_exists() or offset != self.offset or mode != self.mode.get():
+            return
+        total = format_size(self.size) if self.size >= 0 else "?"
+        if mode == "image":
+            self.text.pack_forget()
+            self.image_label.pack(fill=tk.BOTH, expand=True)
+            if payload:
+                self._image = tk.PhotoImage(data=payload)
+                self.image_label.config(image=self._image, text="")
+            else:
+                self.image_label.config(image="", text="Не удалось показать изображение (нужен Pillow или файл слишком велик)")
+            self.status.config(text=f"Размер: {total}")
+            return
+
+        self.image_label.pack_forget()
+        self.text.pack(fill=tk.BOTH, expand=True)
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        if mode == "hex":
+            self.text.insert(tk.END, hex_dump(payload, offset))
+        else:
+            self.text.insert(tk.END, payload.decode("utf-8", errors="replace"))
+        self.text.config(state=tk.DISABLED)
+        self.offset_entry.delete(0, tk.END)
+        self.offset_entry.insert(0, str(offset))
+        end = offset + len(payload)
+        self.status.config(text=f"Байты {offset}–{end} из {total} (прочитано {format_size(len(payload))})")
@@ -0,0 +1,111 @@
+import itertools
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List, Tuple
+
+from config import Config
+
+
+class ProgressTask:
+    """Счётчики одной операции.
+
+    Пишет только поток, выполняющий операцию, GUI их лишь читает, поэтому
+    блокировки не нужны: присваивание атрибута атомарно.
+    """
+
+    def __init__(self, task_id: int, text: str, total: float):
+        self.id = task_id
+        self.text = text
+        self.total = total
+        self.done = 0.0
+        self.finished = False
+
+    def set_text(self, text: str):
+        self.text = text
+
+    def set_total(self, total: float):
+        self.total = total
+
+    def set(self, done: float):
+        self.done = done
+
+    def advance(self, amount: float = 1):
+        self.done += amount
+
+    def finish(self):
+        self.finished = True
+
+    @property
+    def percent(self) -> float:
+        if self.total <= 0:
+            return 0.0
+        return min(self.done / self.total * 100, 100.0)
+
+
+class ProgressModel:
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._tasks: Dict[int, ProgressTask] = {}
+
+    def start(self, text: str, total: float = 100) -> ProgressTask:
+        """total = 0 — операция без известного объёма (неопределённый индикатор)."""
+        task = ProgressTask(next(self._ids), text, total)
+        self._tasks[task.id] = task
+        return task
+
+    def snapshot(self) -> List[ProgressTask]:
+        return list(self._tasks.values())
+
+    def discard(self, task_id: int):
+        self._tasks.pop(task_id, None)
+
+
+class ProgressPanel:
+    """Полосы прогресса всех текущих операций; модель опрашивается с фиксированной частотой."""
+
+    def __init__(self, parent: tk.Widget, model: ProgressModel, interval_ms: int = Config.PROGRESS_POLL_MS):
+        self.model = model
+        self.interval_ms = interval_ms
+        self.frame = ttk.Frame(parent)
+        self.frame.pack(fill=tk.X, pady=(10, 0))
+        self._rows: Dict[int, Tuple[ttk.Frame, ttk.Label, ttk.Progressbar]] = {}
+        self.frame.after(self.interval_ms, self._poll)
+
+    def _poll(self):
+        try:
+            self._render()
+        finally:
+            self.frame.after(self.interval_ms, self._poll)
+
+    def _render(self):
+        seen = set()
+        for task in self.model.snapshot():
+            if task.finished:
+                self.model.discard(task.id)
+                continue
+            seen.add(task.id)
+            row = self._rows.get(task.id) or self._add_row(task)
+            _, label, bar = row
+            if label.cget("text") != task.text:
+                label.config(text=task.text)
+            if task.total > 0:
+                if str(bar.cget("mode")) != "determinate":
+                    bar.stop()
+                    bar.config(mode="determinate")
+                bar["value"] = task.percent
+        for task_id in list(self._rows):
+            if task_id not in seen:
+                self._rows.pop(task_id)[0].destroy()
+
+    def _add_row(self, task: ProgressTask):
+        row = ttk.Frame(self.frame)
+        row.pack(fill=tk.X, pady=1)
+        label = ttk.Label(row, text=task.text)
+        label.pack(side=tk.LEFT, padx=(0, 10))
+        bar = ttk.Progressbar(row, maximum=100, length=Config.PROGRESS_LENGTH)
+        bar.pack(side=tk.LEFT)
+        if task.total <= 0:
+            bar.config(mode="indeterminate")
+            bar.start(15)
+        self._rows[task.id] = (row, label, bar)
+        return self._rows[task.id]
@@ -0,0 +1,278 @@
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import Callable, Dict, List, Optional
+
+from adb_client import AdbServerClient, AdbServerError
+from config import Config
+from models import ScrcpyProfile
+from tracing import TRACER
+
+SUPERVISOR_POLL = 1.0
+MAX_RESTARTS = 5
+# Сколько ждать возвращения устройства, прежде чем перестать перезапускать сессию
+RECONNECT_TIMEOUT = 120
+# Чем больше окон открыто, тем ниже потолок разрешения и битрейта: (от N сессий, max-size, битрейт)
+RESOURCE_STEPS = (
+    (6, 800, "2M"),
+    (4, 1024, "4M"),
+    (2, 1600, "6M"),
+)
+FPS_RE = re.compile(r'(\d+(?:\.\d+)?) fps')
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def parse_rate(value: str) -> int:
+    """'8M' -> 8000000, как это понимает scrcpy."""
+    value = value.strip().upper()
+    multiplier = {"K": 1000, "M": 1000 * 1000}.get(value[-1:], 1)
+    digits = value.rstrip("KM")
+    return int(float(digits) * multiplier) if digits else 0
+
+
+def effective_profile(profile: ScrcpyProfile, sessions: int) -> ScrcpyProfile:
+    """Профиль с учётом числа одновременных сессий: значения только понижаются."""
+    for threshold, max_size, bitrate in RESOURCE_STEPS:
+        if sessions >= threshold:
+            size = int(profile.max_size) if profile.max_size.isdigit() else 0
+            if not size or size > max_size:
+                profile = replace(profile, max_size=str(max_size))
+            if parse_rate(profile.video_bitrate) > parse_rate(bitrate):
+                profile = replace(profile, video_bitrate=bitrate)
+            break
+    return profile
+
+
+def build_command(profile: ScrcpyProfile) -> List[str]:
+    params = ["scrcpy", "-s", profile.serial, "--print-fps"]
+    if profile.audio_source != "none":
+        params.extend(["--audio-source", profile.audio_source])
+        params.extend(["--audio-codec", profile.audio_codec])
+        params.extend(["--audio-bit-rate", profile.audio_bitrate])
+    else:
+        params.append("--no-audio")
+    if profile.max_size.isdigit():
+        params.extend(["--max-size", profile.max_size])
+    params.extend(["--video-bit-rate", profile.video_bitrate])
+    if profile.stay_awake:
+        params.append("--stay-awake")
+    if profile.turn_screen_off:
+        params.append("--turn-screen-off")
+    return params
+
+
+@dataclass
+class ScrcpySession:
+    serial: str
+    profile: ScrcpyProfile
+    proc: Optional[subprocess.Popen] = None
+    started: float = 0.0
+    restarts: int = 0
+    fps: Optional[float] = None
+    cpu_percent: Optional[float] = None
+    state: str = "запуск"
+    lost_since: float = 0.0
+    stopping: bool = False
+    _cpu_ticks: int = field(default=0, repr=False)
+    _cpu_checked: float = field(default=0.0, repr=False)
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.proc.pid if self.proc else None
+
+    @property
+    def bitrate(self) -> int:
+        return parse_rate(self.profile.video_bitrate)
+
+
+class ScrcpySupervisor:
+    """Один процесс scrcpy на устройство: профили, перезапуск после отключения, учёт нагрузки."""
+
+    def __init__(self, client: Optional[AdbServerClient] = None, storage_path: Optional[str] = None):
+        self.client = client or AdbServerClient()
+        self.storage_path = storage_path or os.path.join(Config.CONFIG_DIR, "scrcpy_profiles.json")
+        self.profiles: Dict[str, ScrcpyProfile] = self._load()
+        self.sessions: Dict[str, ScrcpySession] = {}
+        self.on_event: Optional[Callable[[str, str], None]] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def profile_for(self, serial: str) -> ScrcpyProfile:
+        return self.profiles.get(serial) or ScrcpyProfile(serial=serial)
+
+    def save_profile(self, profile: ScrcpyProfile):
+        with self._lock:
+            self.profiles[profile.serial] = profile
+            self._save()
+
+    def start(self, serials: List[str]) -> List[str]:
+        """Запускает scrcpy для устройств без активной сессии; возвращает ошибки запуска."""
+        errors = []
+        with self._lock:
+            for serial in serials:
+                if serial in self.sessions:
+                    continue
+                session = ScrcpySession(serial=serial, profile=self.profile_for(serial))
+                self.sessions[serial] = session
+            total = len(self.sessions)
+            for serial in serials:
+                session = self.sessions[serial]
+                if session.proc is None:
+                    error = self._spawn(session, total)
+                    if error:
+                        self.sessions.pop(serial)
+                        errors.append(f"{serial}: {error}")
+            self._ensure_monitor()
+        return errors
+
+    def stop(self, serial: str):
+        with self._lock:
+            session = self.sessions.get(serial)
+            if session:
+                session.stopping = True
+        if session and session.proc and session.proc.poll() is None:
+            session.proc.terminate()
+
+    def stop_all(self):
+        for serial in list(self.sessions):
+            self.stop(serial)
+
+    def snapshot(self) -> List[ScrcpySession]:
+        with self._lock:
+            return [replace(session) for session in self.sessions.values()]
+
+    def _spawn(self, session: ScrcpySession, total: int) -> str:
+        session.profile = effective_profile(self.profile_for(session.serial), total)
+        command = build_command(session.profile)
+        started = time.perf_counter()
+        try:
+            session.proc = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="ignore",
+                bufsize=1
+            )
+        except OSError as e:
+            if TRACER.enabled:
+                TRACER.record(command[1:], started, None, op="scrcpy")
+            return str(e)
+        session.started = time.time()
+        session.state = "работает"
+        session.fps = None
+        session.cpu_percent = None
+        session._cpu_ticks = 0
+        session._cpu_checked = 0.0
+        threading.Thread(target=self._read_output, args=(session, session.proc, command, started),
+                         daemon=True).start()
+        return ""
+
+    @staticmethod
+    def _read_output(session: ScrcpySession, proc: subprocess.Popen, command: List[str], started: float):
+        for line in proc.stdout:
+            match = FPS_RE.search(line)
+            if match:
+                session.fps = float(match.group(1))
+        proc.stdout.close()
+        proc.wait()
+        if TRACER.enabled:
+            # Без имени программы, как у adb: устройство трассировщик берёт из "-s serial"; остановка — не ошибка
+            returncode = 0 if session.stopping else proc.returncode
+            TRACER.record(command[1:], started, returncode, op="scrcpy")
+
+    def _ensure_monitor(self):
+        # Вызывается под self._lock: монитор сбрасывает _thread под ним же перед выходом
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def _monitor(self):
+        while True:
+            time.sleep(SUPERVISOR_POLL)
+            with self._lock:
+                if not self.sessions:
+                    self._thread = None
+                    return
+                online = None
+                for serial, session in list(self.sessions.items()):
+                    returncode = session.proc.poll() if session.proc else None
+                    if session.proc and returncode is None:
+                        self._measure_cpu(session)
+                        # Сессия, проработавшая дольше RECONNECT_TIMEOUT, снова получает все перезапуски
+                        if session.restarts and time.time() - session.started > RECONNECT_TIMEOUT:
+                            session.restarts = 0
+                        continue
+                    if session.stopping or returncode == 0:
+                        # Окно закрыли или сессию остановили из панели
+                        self.sessions.pop(serial)
+                        self._emit(serial, "остановлен")
+                        continue
+                    if online is None:
+                        online = self._online()
+                    self._recover(session, returncode, serial in online)
+
+    def _recover(self, session: ScrcpySession, returncode: Optional[int], online: bool):
+        if session.proc is not None:
+            session.proc = None
+            session.lost_since = time.time()
+            session.state = "ожидание устройства"
+            self._emit(session.serial, f"завершился с кодом {returncode}")
+        if session.restarts >= MAX_RESTARTS or time.time() - session.lost_since > RECONNECT_TIMEOUT:
+            self.sessions.pop(session.serial)
+            self._emit(session.serial, "перезапуски исчерпаны")
+            return
+        if not online:
+            return
+        session.restarts += 1
+        error = self._spawn(session, len(self.sessions))
+        self._emit(session.serial, f"перезапущен ({session.restarts})" if not error else error)
+
+    def _online(self) -> set:
+        try:
+            return {serial for serial, state in self.client.devices() if state == "device"}
+        except (OSError, AdbServerError):
+            return set()
+
+    @staticmethod
+    def _measure_cpu(session: ScrcpySession):
+        # Только Linux: utime + stime из /proc/<pid>/stat
+        try:
+            with open(f"/proc/{session.pid}/stat", encoding="ascii") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            ticks = int(fields[11]) + int(fields[12])
+        except (OSError, IndexError, ValueError):
+            return
+        now = time.monotonic()
+        if session._cpu_checked:
+            elapsed = now - session._cpu_checked
+            if elapsed > 0:
+                session.cpu_percent = (ticks - session._cpu_ticks) / CLOCK_TICKS / elapsed * 100
+        session._cpu_ticks = ticks
+        session._cpu_checked = now
+
+    def _emit(self, serial: str, message: str):
+        if self.on_event:
+            self.on_event(serial, message)
+
+    def _load(self) -> Dict[str, ScrcpyProfile]:
+        try:
+            with open(self.storage_path, encoding="utf-8") as f:
+                return {item["serial"]: ScrcpyProfile(**item) for item in json.load(f)}
+        except (OSError, ValueError, TypeError, KeyError):
+            return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
+            with open(self.storage_path, "w", encoding="utf-8") as f:
+                json.dump([asdict(p) for p in self.profiles.values()], f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"Ошибка сохранения профилей scrcpy: {e}")
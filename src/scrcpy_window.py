@@ -0,0 +1,180 @@
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List
+
+from adb_client import AdbServerError
+from models import ScrcpyProfile
+from scrcpy_supervisor import ScrcpySupervisor
+
+REFRESH_MS = 1000
+ORIGINAL_SIZE = "оригинал"
+AUDIO_SOURCES = {"playback": "playback (системный)", "none": "none (без звука)"}
+
+
+class ScrcpyWindow:
+    def __init__(self, parent, supervisor: ScrcpySupervisor, current: str, log: Callable):
+        self.parent = parent
+        self.supervisor = supervisor
+        self.current = current
+        self.log = log
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Scrcpy")
+        self.window.geometry("760x560")
+
+        self._setup_ui()
+        self._load_devices()
+        self._refresh()
+
+    def _setup_ui(self):
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        top = ttk.Frame(main_frame)
+        top.pack(fill=tk.X)
+
+        devices_frame = ttk.LabelFrame(top, text="Устройства", padding="5")
+        devices_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        self.devices = tk.Listbox(devices_frame, selectmode=tk.EXTENDED, height=9, exportselection=False)
+        self.devices.pack(fill=tk.BOTH, expand=True)
+        self.devices.bind("<<ListboxSelect>>", lambda e: self._show_profile())
+        ttk.Button(devices_frame, text="🔄 Обновить", command=self._load_devices).pack(fill=tk.X, pady=(5, 0))
+
+        profile_frame = ttk.LabelFrame(top, text="Профиль устройства", padding="5")
+        profile_frame.pack(side=tk.LEFT, fill=tk.BOTH)
+        rows = (
+            ("audio_source", "Источник звука:", list(AUDIO_SOURCES.values())),
+            ("audio_codec", "Кодек звука:", ["aac", "opus", "raw"]),
+            ("audio_bitrate", "Битрейт звука:", ["64K", "128K", "192K", "256K"]),
+            ("max_size", "Макс. разрешение:", ["1024", "1280", "1920", "2560", ORIGINAL_SIZE]),
+            ("video_bitrate", "Битрейт видео:", ["2M", "4M", "8M", "16M", "32M"]),
+        )
+        self.fields = {}
+        for row, (name, title, values) in enumerate(rows):
+            ttk.Label(profile_frame, text=title).grid(row=row, column=0, sticky=tk.W, pady=2)
+            combo = ttk.Combobox(profile_frame, values=values, state="readonly", width=22)
+            combo.grid(row=row, column=1, padx=5, pady=2)
+            self.fields[name] = combo
+        self.stay_awake = tk.BooleanVar(value=True)
+        ttk.Checkbutton(profile_frame, text="Не выключать экран",
+                        variable=self.stay_awake).grid(row=len(rows), column=0, columnspan=2, sticky=tk.W)
+        self.turn_screen_off = tk.BooleanVar(value=True)
+        ttk.Checkbutton(profile_frame, text="Выключить экран телефона",
+                        variable=self.turn_screen_off).grid(row=len(rows) + 1, column=0, columnspan=2, sticky=tk.W)
+
+        buttons = ttk.Frame(main_frame)
+        buttons.pack(fill=tk.X, pady=5)
+        ttk.Button(buttons, text="▶ Запустить", command=self._start).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="💾 Сохранить профиль", command=self._save_profiles).pack(side=tk.LEFT, padx=2)
+        ttk.Button(buttons, text="⏹ Остановить", command=self._stop).pack(side=tk.RIGHT, padx=2)
+        ttk.Button(buttons, text="⏹ Остановить все", command=self.supervisor.stop_all).pack(side=tk.RIGHT, padx=2)
+
+        sessions_frame = ttk.LabelFrame(main_frame, text="Сессии", padding="5")
+        sessions_frame.pack(fill=tk.BOTH, expand=True)
+        columns = ("state", "pid", "uptime", "restarts", "cpu", "fps", "video")
+        self.sessions = ttk.Treeview(sessions_frame, columns=columns, selectmode="extended", height=6)
+        self.sessions.pack(fill=tk.BOTH, expand=True)
+        self.sessions.heading("#0", text="Устройство")
+        self.sessions.column("#0", width=160)
+        for column, title, width in (("state", "Состояние", 140), ("pid", "PID", 60), ("uptime", "Время", 70),
+                                     ("restarts", "Перезапуски", 80), ("cpu", "CPU", 60), ("fps", "FPS", 50),
+                                     ("video", "Видео", 100)):
+            self.sessions.heading(column, text=title)
+            self.sessions.column(column, width=width, anchor="w")
+
+    def _load_devices(self):
+        def worker():
+            try:
+                serials = [serial for serial, state in self.supervisor.client.devices() if state == "device"]
+            except (OSError, AdbServerError):
+                serials = []
+            self.parent.after(0, lambda: self._on_devices(serials))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_devices(self, serials: List[str]):
+        if not self.window.winfo_exists():
+            return
+        self.devices.delete(0, tk.END)
+        for index, serial in enumerate(serials):
+            self.devices.insert(tk.END, serial)
+            if serial == self.current:
+                self.devices.selection_set(index)
+        if serials and not self.devices.curselection():
+            self.devices.selection_set(0)
+        self._show_profile()
+
+    def selected_devices(self) -> List[str]:
+        return [self.devices.get(index) for index in self.devices.curselection()]
+
+    def _show_profile(self):
+        devices = self.selected_devices()
+        profile = self.supervisor.profile_for(devices[0] if devices else "")
+        self.fields["audio_source"].set(AUDIO_SOURCES.get(profile.audio_source, profile.audio_source))
+        self.fields["audio_codec"].set(profile.audio_codec)
+        self.fields["audio_bitrate"].set(profile.audio_bitrate)
+        self.fields["max_size"].set(profile.max_size or ORIGINAL_SIZE)
+        self.fields["video_bitrate"].set(profile.video_bitrate)
+        self.stay_awake.set(profile.stay_awake)
+        self.turn_screen_off.set(profile.turn_screen_off)
+
+    def _profile(self, serial: str) -> ScrcpyProfile:
+        max_size = self.fields["max_size"].get()
+        return ScrcpyProfile(
+            serial=serial,
+            audio_source=self.fields["audio_source"].get().split()[0],
+            audio_codec=self.fields["audio_codec"].get(),
+            audio_bitrate=self.fields["audio_bitrate"].get(),
+            max_size="" if max_size == ORIGINAL_SIZE else max_size,
+            video_bitrate=self.fields["video_bitrate"].get(),
+            stay_awake=self.stay_awake.get(),
+            turn_screen_off=self.turn_screen_off.get()
+        )
+
+    def _save_profiles(self):
+        for serial in self.selected_devices():
+            self.supervisor.save_profile(self._profile(serial))
+
+    def _start(self):
+        devices = self.selected_devices()
+        if not devices:
+            return
+        self._save_profiles()
+        for error in self.supervisor.start(devices):
+            self.log(f"✗ Ошибка при запуске scrcpy: {error}", "error")
+        self._refresh_sessions()
+
+    def _stop(self):
+        for serial in self.sessions.selection():
+            self.supervisor.stop(serial)
+
+    def _refresh(self):
+        if not self.window.winfo_exists():
+            return
+        self._refresh_sessions()
+        self.window.after(REFRESH_MS, self._refresh)
+
+    def _refresh_sessions(self):
+        sessions = self.supervisor.snapshot()
+        known = {session.serial for session in sessions}
+        for item in self.sessions.get_children():
+            if item not in known:
+                self.sessions.delete(item)
+        now = time.time()
+        for session in sessions:
+            uptime = int(now - session.started) if session.pid else 0
+            values = (
+                session.state,
+                session.pid or "",
+                f"{uptime // 60}:{uptime % 60:02d}" if session.pid else "",
+                session.restarts,
+                f"{session.cpu_percent:.0f}%" if session.cpu_percent is not None else "—",
+                f"{session.fps:.0f}" if session.fps is not None else "—",
+                f"{session.profile.max_size or ORIGINAL_SIZE}, {session.profile.video_bitrate}"
+            )
+            if self.sessions.exists(session.serial):
+                self.sessions.item(session.serial, values=values)
+            else:
+                self.sessions.insert("", tk.END, iid=session.serial, text=session.serial, values=values)
@@ -0,0 +1,137 @@
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from typing import Callable, Optional, Tuple
+
+from tracing import TRACER
+
+
+class ShellSession:
+    """Долгоживущий `adb shell` на устройстве.
+
+    Команды пишутся в stdin одного процесса, конец вывода отмечается маркером
+    с кодом возврата, поэтому частые мелкие команды не запускают новый adb.
+    """
+
+    def __init__(self, serial: str, shell: str = "sh"):
+        self.serial = serial
+        self.shell = shell
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self):
+        self._lines = queue.Queue()
+        self._proc = subprocess.Popen(
+            ["adb", "-s", self.serial, "shell", self.shell],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding='utf-8',
+            errors='ignore',
+            bufsize=1
+        )
+        threading.Thread(target=self._pump, args=(self._proc, self._lines), daemon=True).start()
+
+    @staticmethod
+    def _pump(proc: subprocess.Popen, lines: "queue.Queue[Optional[str]]"):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def _ready(self) -> bool:
+        """Проверка после каждого (пере)запуска процесса; вызывается под self._lock."""
+        return True
+
+    def open(self) -> bool:
+        """Запускает процесс заранее; False, если сессия не прошла проверку _ready."""
+        with self._lock:
+            return self._ensure_started()
+
+    def _ensure_started(self) -> bool:
+        if self.alive:
+            return True
+        self._start()
+        if self._ready():
+            return True
+        self.close()
+        return False
+
+    def run(self, command: str, timeout: float = 10) -> Tuple[int, str]:
+        """Возвращает (код возврата, вывод); -1, если сессия умерла или не ответила вовремя."""
+        with self._lock:
+            if not self._ensure_started():
+                return -1, ""
+            return self._exchange(command, timeout)
+
+    def _exchange(self, command: str, timeout: float) -> Tuple[int, str]:
+        marker = uuid.uuid4().hex
+        started = time.perf_counter()
+        try:
+            self._proc.stdin.write(f"{command} 2>&1\nprintf '\\n{marker} %d\\n' $?\n")
+            self._proc.stdin.flush()
+        except OSError:
+            self.close()
+            return -1, ""
+
+        output = []
+        deadline = time.monotonic() + timeout
+        returncode = -1
+        while True:
+            try:
+                line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                line = None
+            if line is None:
+                # Сессия оборвалась или зависла: следующая команда поднимет новую
+                self.close()
+                break
+            if line.startswith(marker):
+                returncode = int(line.split()[1]) if line.split()[1:] else -1
+                break
+            output.append(line)
+
+        text = "".join(output)
+        if text.endswith("\n"):
+            text = text[:-1]
+        if TRACER.enabled:
+            TRACER.record(["-s", self.serial, "shell-session", command], started, returncode,
+                          bytes_out=len(text), op="shell_session")
+        return returncode, text
+
+    def close(self):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.terminate()
+        except OSError:
+            pass
+
+
+class SuSession(ShellSession):
+    """su-сессия: после каждого запуска, в том числе после обрыва, заново проверяет, что root выдан."""
+
+    def __init__(self, serial: str, grant_timeout: float):
+        super().__init__(serial, shell="su")
+        self.grant_timeout = grant_timeout
+        self.on_revoked: Optional[Callable[[], None]] = None
+
+    def _ready(self) -> bool:
+        returncode, output = self._exchange("id -u", self.grant_timeout)
+        if returncode == 0 and output.strip().split("\n")[-1:] == ["0"]:
+            return True
+        if self.on_revoked:
+            self.on_revoked()
+        return False
@@ -0,0 +1,156 @@
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from adb_client import AdbServerClient, AdbServerError
+from config import Config
+from shell_session import ShellSession
+from utils import parse_key_values
+
+METRICS = {
+    "level": ("Заряд", "%"),
+    "temperature": ("Температура", "°C"),
+    "current": ("Ток", "мА"),
+    "storage_free": ("Свободно", "ГБ"),
+}
+SEPARATOR = "@@telemetry@@"
+# Один вызов на устройство за выборку, через уже открытую shell-сессию
+SAMPLE_COMMAND = (
+    f"dumpsys battery; echo {SEPARATOR}; "
+    f"cat /sys/class/power_supply/battery/current_now 2>/dev/null; echo {SEPARATOR}; "
+    "df -k /storage/emulated/0 2>/dev/null | tail -n 1"
+)
+
+
+class RingSeries:
+    """Кольцевой буфер (время, значение) на массивах: ~12 байт на точку."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._times = array("d", [0.0] * capacity)
+        self._values = array("f", [0.0] * capacity)
+        self._next = 0
+        self._count = 0
+
+    def append(self, timestamp: float, value: float):
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def items(self) -> List[Tuple[float, float]]:
+        start = (self._next - self._count) % self.capacity
+        return [(self._times[(start + i) % self.capacity], self._values[(start + i) % self.capacity])
+                for i in range(self._count)]
+
+    def last(self) -> Optional[Tuple[float, float]]:
+        if not self._count:
+            return None
+        index = (self._next - 1) % self.capacity
+        return self._times[index], self._values[index]
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def parse_sample(output: str) -> Dict[str, float]:
+    parts = output.split(SEPARATOR)
+    sample = {}
+    battery = parse_key_values(parts[0])
+    if battery.get("level", "").isdigit():
+        sample["level"] = float(battery["level"])
+    if battery.get("temperature", "").lstrip("-").isdigit():
+        sample["temperature"] = int(battery["temperature"]) / 10
+
+    current = parts[1].strip() if len(parts) > 1 else ""
+    if current.lstrip("-").isdigit():
+        value = int(current)
+        # Большинство ядер отдают мкА, некоторые сразу мА
+        sample["current"] = value / 1000 if abs(value) > 20000 else float(value)
+
+    df = parts[2].split() if len(parts) > 2 else []
+    if len(df) >= 4 and df[3].isdigit():
+        sample["storage_free"] = int(df[3]) / (1024 * 1024)
+    return sample
+
+
+class TelemetrySampler:
+    """Один фоновый цикл опрашивает все подключённые устройства и копит историю."""
+
+    def __init__(self, client: Optional[AdbServerClient] = None,
+                 interval: float = Config.TELEMETRY_INTERVAL, capacity: int = Config.TELEMETRY_HISTORY):
+        self.client = client or AdbServerClient()
+        self.interval = interval
+        self.capacity = capacity
+        self.history: Dict[str, Dict[str, RingSeries]] = {}
+        self._sessions: Dict[str, ShellSession] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.on_sample: Optional[Callable[[str, Dict[str, float]], None]] = None
+
+    def start(self, delay: float = 5):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._loop, args=(delay,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def set_interval(self, seconds: float):
+        self.interval = max(seconds, 1)
+        self._wake.set()
+
+    def devices(self) -> List[str]:
+        with self._lock:
+            return sorted(self.history)
+
+    def series(self, serial: str, metric: str) -> List[Tuple[float, float]]:
+        with self._lock:
+            ring = self.history.get(serial, {}).get(metric)
+            return ring.items() if ring else []
+
+    def latest(self, serial: str) -> Dict[str, float]:
+        with self._lock:
+            result = {}
+            for metric, ring in self.history.get(serial, {}).items():
+                last = ring.last()
+                if last:
+                    result[metric] = last[1]
+            return result
+
+    def _loop(self, delay: float):
+        self._stopped.wait(delay)
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            self.sample_all()
+            self._wake.clear()
+            self._wake.wait(max(self.interval - (time.monotonic() - started), 0))
+        for session in self._sessions.values():
+            session.close()
+
+    def sample_all(self):
+        try:
+            serials = [serial for serial, state in self.client.devices() if state == "device"]
+        except (AdbServerError, OSError):
+            return
+        for serial in set(self._sessions) - set(serials):
+            self._sessions.pop(serial).close()
+        now = time.time()
+        for serial in serials:
+            session = self._sessions.setdefault(serial, ShellSession(serial))
+            returncode, output = session.run(SAMPLE_COMMAND)
+            if returncode < 0:
+                continue
+            sample = parse_sample(output)
+            with self._lock:
+                series = self.history.setdefault(serial, {})
+                for metric, value in sample.items():
+                    series.setdefault(metric, RingSeries(self.capacity)).append(now, value)
+            if self.on_sample:
+                self.on_sample(serial, sample)
@@ -0,0 +1,100 @@
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from telemetry import METRICS, TelemetrySampler
+
+REDRAW_MS = 2000
+CHART_PADDING = 40
+
+
+class TelemetryWindow:
+    def __init__(self, parent, sampler: TelemetrySampler):
+        self.sampler = sampler
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Телеметрия")
+        self.window.geometry("800x420")
+
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+        ttk.Label(controls, text="Устройство:").pack(side=tk.LEFT)
+        self.device = ttk.Combobox(controls, state="readonly", width=24)
+        self.device.pack(side=tk.LEFT, padx=(2, 8))
+        self.device.bind("<<ComboboxSelected>>", lambda e: self._draw())
+
+        ttk.Label(controls, text="Показатель:").pack(side=tk.LEFT)
+        self.metric_keys = list(METRICS)
+        self.metric = ttk.Combobox(controls, state="readonly", width=14,
+                                   values=[METRICS[key][0] for key in self.metric_keys])
+        self.metric.current(0)
+        self.metric.pack(side=tk.LEFT, padx=(2, 8))
+        self.metric.bind("<<ComboboxSelected>>", lambda e: self._draw())
+
+        ttk.Label(controls, text="Интервал, с:").pack(side=tk.LEFT)
+        self.interval = ttk.Spinbox(controls, from_=1, to=3600, width=6)
+        self.interval.set(int(sampler.interval))
+        self.interval.pack(side=tk.LEFT, padx=2)
+        ttk.Button(controls, text="Применить", command=self._apply_interval).pack(side=tk.LEFT)
+
+        self.canvas = tk.Canvas(self.window, background="white")
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.canvas.bind("<Configure>", lambda e: self._draw())
+
+        self.status = ttk.Label(self.window, text="", padding="2")
+        self.status.pack(fill=tk.X)
+
+        self._refresh()
+
+    def _apply_interval(self):
+        try:
+            self.sampler.set_interval(float(self.interval.get()))
+        except ValueError:
+            self.interval.set(int(self.sampler.interval))
+
+    def _refresh(self):
+        if not self.window.winfo_exists():
+            return
+        devices = self.sampler.devices()
+        if list(self.device["values"]) != devices:
+            self.device["values"] = devices
+            if devices and self.device.get() not in devices:
+                self.device.current(0)
+        self._draw()
+        self.window.after(REDRAW_MS, self._refresh)
+
+    def _draw(self):
+        self.canvas.delete("all")
+        serial = self.device.get()
+        metric = self.metric_keys[self.metric.current()]
+        title, unit = METRICS[metric]
+        points = self.sampler.series(serial, metric) if serial else []
+        if len(points) < 2:
+            self.status.config(text="Недостаточно данных: выборки появятся через интервал опроса")
+            return
+
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        t0, t1 = points[0][0], points[-1][0]
+        values = [v for _, v in points]
+        low, high = min(values), max(values)
+        if high - low < 1e-6:
+            low, high = low - 1, high + 1
+        plot_w = max(width - 2 * CHART_PADDING, 1)
+        plot_h = max(height - 2 * CHART_PADDING, 1)
+
+        coords = []
+        for t, v in points:
+            coords.append(CHART_PADDING + (t - t0) / max(t1 - t0, 1e-6) * plot_w)
+            coords.append(height - CHART_PADDING - (v - low) / (high - low) * plot_h)
+        self.canvas.create_rectangle(CHART_PADDING, CHART_PADDING, width - CHART_PADDING,
+                                     height - CHART_PADDING, outline="#ccc")
+        self.canvas.create_line(*coords, fill="blue", width=2)
+        self.canvas.create_text(CHART_PADDING - 4, CHART_PADDING, text=f"{high:.1f}", anchor="e")
+        self.canvas.create_text(CHART_PADDING - 4, height - CHART_PADDING, text=f"{low:.1f}", anchor="e")
+        self.canvas.create_text(CHART_PADDING, height - CHART_PADDING + 12,
+                                text=time.strftime("%H:%M", time.localtime(t0)), anchor="w")
+        self.canvas.create_text(width - CHART_PADDING, height - CHART_PADDING + 12,
+                                text=time.strftime("%H:%M", time.localtime(t1)), anchor="e")
+        self.status.config(text=f"{title}: {values[-1]:.1f} {unit} (мин. {min(values):.1f}, "
+                                f"макс. {max(values):.1f}, точек: {len(points)})")
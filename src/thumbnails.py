@@ -0,0 +1,184 @@
+import hashlib
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+from config import Config
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp', '.heic', '.heif'}
+VIDEO_EXTENSIONS = {'.mp4', '.mkv', '.webm', '.3gp', '.mov', '.avi', '.m4v'}
+HEAD_READ = 128 * 1024
+
+
+def has_thumbnail(name: str) -> bool:
+    ext = os.path.splitext(name)[1].lower()
+    return ext in IMAGE_EXTENSIONS or ext in VIDEO_EXTENSIONS
+
+
+def extract_exif_thumbnail(data: bytes) -> bytes:
+    """JPEG-миниатюра из EXIF (APP1), если она целиком попала в прочитанное начало файла."""
+    if not data.startswith(b"\xff\xd8"):
+        return b""
+    pos = 2
+    while pos + 4 <= len(data) and data[pos] == 0xFF:
+        marker = data[pos + 1]
+        length = int.from_bytes(data[pos + 2:pos + 4], "big")
+        if marker == 0xE1 and data[pos + 4:pos + 10] == b"Exif\x00\x00":
+            segment = data[pos + 4:pos + 2 + length]
+            start = segment.find(b"\xff\xd8", 6)
+            end = segment.find(b"\xff\xd9", start)
+            if start != -1 and end != -1:
+                return segment[start:end + 2]
+            return b""
+        if marker == 0xDA:
+            break
+        pos += 2 + length
+    return b""
+
+
+def make_thumbnail(data: bytes, size: int) -> bytes:
+    if Image is None or not data:
+        return b""
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.thumbnail((size, size))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        out = io.BytesIO()
+        image.save(out, format="PNG")
+        return out.getvalue()
+    except Exception:
+        return b""
+
+
+class ThumbnailCache:
+    """Дисковый LRU-кэш PNG-миниатюр по ключу (serial, path, size, mtime)."""
+
+    def __init__(self, directory: str = None, max_bytes: int = Config.THUMBNAIL_CACHE_BYTES):
+        self.directory = directory or os.path.join(
+            os.path.expanduser("~"), ".cache", "adb-file-manager", "thumbnails"
+        )
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total: Optional[int] = None
+
+    @staticmethod
+    def key(serial: str, path: str, size: int, mtime: str) -> str:
+        return hashlib.sha1(f"{serial}\0{path}\0{size}\0{mtime}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".png")
+
+    def get(self, key: str) -> bytes:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            return b""
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        except OSError:
+            return
+        with self._lock:
+            if self._total is None:
+                self._total = self._scan_total()
+            else:
+                self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.directory):
+            for name in filenames:
+                full = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(full)
+                except OSError:
+                    continue
+                yield full, stat.st_mtime, stat.st_size
+
+    def _scan_total(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def _evict(self):
+        # Выселяем самые давно использованные до 80% лимита
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        target = self.max_bytes * 0.8
+        for path, _, size in entries:
+            if self._total <= target:
+                break
+            try:
+                os.remove(path)
+                self._total -= size
+            except OSError:
+                continue
+
+
+class ThumbnailLoader:
+    """Фоновая загрузка миниатюр: запросы вне видимой области отбрасываются."""
+
+    def __init__(self, adb, cache: Optional[ThumbnailCache] = None, size: int = Config.THUMBNAIL_SIZE):
+        self.adb = adb
+        self.cache = cache or ThumbnailCache()
+        self.size = size
+        self._pool = ThreadPoolExecutor(max_workers=3)
+        self._wanted: Set[str] = set()
+        self._in_flight: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def available() -> bool:
+        return Image is not None
+
+    def set_wanted(self, keys: Set[str]):
+        with self._lock:
+            self._wanted = set(keys)
+
+    def request(self, key: str, path: str, size_bytes: int, on_ready: Callable[[str, bytes], None]):
+        with self._lock:
+            self._wanted.add(key)
+            if key in self._in_flight:
+                return
+            self._in_flight[key] = True
+        self._pool.submit(self._load, key, path, size_bytes, on_ready)
+
+    def _load(self, key: str, path: str, size_bytes: int, on_ready: Callable[[str, bytes], None]):
+        try:
+            with self._lock:
+                if key not in self._wanted:
+                    return
+            data = self.cache.get(key)
+            if not data:
+                data = make_thumbnail(self._fetch(path, size_bytes), self.size)
+                if data:
+                    self.cache.put(key, data)
+            if data:
+                on_ready(key, data)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def _fetch(self, path: str, size_bytes: int) -> bytes:
+        ext = os.path.splitext(path)[1].lower()
+        if ext in ('.jpg', '.jpeg'):
+            thumb = extract_exif_thumbnail(self.adb.read_head(path, HEAD_READ))
+            if thumb:
+                return thumb
+        if ext in IMAGE_EXTENSIONS and 0 < size_bytes <= Config.THUMBNAIL_FULL_READ_LIMIT:
+            return self.adb.read_file(path)
+        return self.adb.media_thumbnail(path, video=ext in VIDEO_EXTENSIONS)
@@ -0,0 +1,129 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+from config import Config
+
+# Обёртки, которые сами ничего не значат: операцией считается первый публичный метод выше них
+_WRAPPERS = {"run_adb", "record"}
+
+
+class TraceEvent(NamedTuple):
+    op: str
+    device: str
+    command: str
+    start: float
+    duration: float
+    bytes_in: int
+    bytes_out: int
+    returncode: Optional[int]
+    attempt: int
+    thread: int
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(round(q * (len(ordered) - 1)))]
+
+
+def _operation() -> str:
+    frame = sys._getframe(2)
+    fallback = ""
+    while frame is not None:
+        name = frame.f_code.co_name
+        if name not in _WRAPPERS:
+            fallback = fallback or name
+            if not name.startswith("_"):
+                return name
+        frame = frame.f_back
+    return fallback or "?"
+
+
+class CommandTracer:
+    """Журнал вызовов adb: команда, устройство, длительность, объём и код возврата.
+
+    Выключенный трассировщик сводится к проверке флага enabled перед вызовом.
+    """
+
+    def __init__(self, max_events: int = Config.TRACE_MAX_EVENTS):
+        self.enabled = bool(os.environ.get("ADB_FM_TRACE"))
+        self._events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def record(self, args: List[str], started: float, returncode: Optional[int],
+               bytes_in: int = 0, bytes_out: int = 0, attempt: int = 0, op: str = ""):
+        device = args[1] if len(args) > 1 and args[0] == "-s" else ""
+        event = TraceEvent(
+            op=op or _operation(),
+            device=device,
+            command=" ".join(str(a) for a in args),
+            start=started,
+            duration=time.perf_counter() - started,
+            bytes_in=bytes_in,
+            bytes_out=bytes_out,
+            returncode=returncode,
+            attempt=attempt,
+            thread=threading.get_ident()
+        )
+        with self._lock:
+            self._events.append(event)
+
+    def events(self) -> List[TraceEvent]:
+        with self._lock:
+            return list(self._events)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    def stats(self) -> List[Dict]:
+        by_op: Dict[str, List[TraceEvent]] = {}
+        for event in self.events():
+            by_op.setdefault(event.op, []).append(event)
+        rows = []
+        for op, events in sorted(by_op.items()):
+            durations = [e.duration for e in events]
+            rows.append({
+                "op": op,
+                "count": len(events),
+                "p50_ms": _percentile(durations, 0.5) * 1000,
+                "p95_ms": _percentile(durations, 0.95) * 1000,
+                "max_ms": max(durations) * 1000,
+                "fallbacks": sum(1 for e in events if e.attempt),
+                "errors": sum(1 for e in events if e.returncode != 0),
+                "bytes_in": sum(e.bytes_in for e in events),
+                "bytes_out": sum(e.bytes_out for e in events),
+            })
+        return rows
+
+    def export_chrome(self, path: str):
+        """Сохраняет события в формате Trace Event (chrome://tracing, Perfetto)."""
+        trace = []
+        for event in self.events():
+            trace.append({
+                "name": event.op,
+                "cat": "adb",
+                "ph": "X",
+                "ts": round((event.start - self._origin) * 1e6),
+                "dur": round(event.duration * 1e6),
+                "pid": os.getpid(),
+                "tid": event.thread,
+                "args": {
+                    "command": event.command,
+                    "device": event.device,
+                    "returncode": event.returncode,
+                    "bytes_in": event.bytes_in,
+                    "bytes_out": event.bytes_out,
+                    "attempt": event.attempt,
+                },
+            })
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+
+TRACER = CommandTracer()
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from adb_helper import ADBHelper
+from connection_manager import ConnectionManager
+from job_queue import CancelToken, JobCancelled
+
+
+@dataclass
+class TransferJob:
+    direction: str
+    source: str
+    target: str
+    success: bool = False
+
+
+class TransferEngine:
+    def __init__(self, adb: ADBHelper, connections: Optional[ConnectionManager] = None):
+        self.adb = adb
+        self.connections = connections
+
+    def concurrency(self, adb: Optional[ADBHelper] = None) -> int:
+        adb = adb or self.adb
+        if not self.connections or not adb.device:
+            return 1
+        profile = self.connections.profile_for(adb.device)
+        adb.apply_link_profile(profile)
+        return profile.concurrency
+
+    def run(self, jobs: List[TransferJob],
+            on_done: Optional[Callable[[TransferJob], None]] = None,
+            token: Optional[CancelToken] = None,
+            adb: Optional[ADBHelper] = None) -> List[TransferJob]:
+        """adb — помощник, привязанный к устройству задачи; по умолчанию текущее устройство."""
+        if not jobs:
+            return jobs
+        adb = adb or self.adb
+        workers = min(self.concurrency(adb), len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self._run_one, adb, job, token): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    job.success = future.result()
+                except JobCancelled:
+                    continue
+                except Exception:
+                    job.success = False
+                if on_done:
+                    on_done(job)
+        if token and token.cancelled:
+            raise JobCancelled()
+        return jobs
+
+    @staticmethod
+    def _run_one(adb: ADBHelper, job: TransferJob, token: Optional[CancelToken] = None) -> bool:
+        # Пауза и отмена срабатывают между файлами: начатая передача доводится до конца
+        if token:
+            token.checkpoint()
+        if job.direction == "push":
+            return adb.push_file(job.source, job.target)
+        return adb.pull_file(job.source, job.target)
@@ -1,5 +1,6 @@
 import os
-from typing import List
+import time
+from typing import Dict, List, Optional, Tuple
 
 
 def format_size(size_bytes: int) -> str:
@@ -26,4 +27,28 @@ def normalize_android_path(path: str) -> str:
     path = os.path.normpath(path).replace('\\', '/')
     if not path.startswith('/'):
         path = '/' + path
-    return path
\ No newline at end of file
+    return path
+
+
+def parse_key_values(text: str) -> Dict[str, str]:
+    """Строки вида `key: value` (dumpsys battery и т.п.) за один проход; ключи в нижнем регистре."""
+    values = {}
+    for line in text.split("\n"):
+        key, sep, value = line.partition(":")
+        if sep:
+            values.setdefault(key.strip().lower(), value.strip())
+    return values
+
+
+class StartupTimer:
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, name: str):
+        if not any(n == name for n, _ in self.marks):
+            self.marks.append((name, (time.perf_counter() - self.origin) * 1000))
+
+    def report(self) -> str:
+        return ", ".join(f"{name} {ms:.0f} мс" for name, ms in self.marks)